@@ -13,6 +13,7 @@
 # limitations under the License.
 
 """Base GCP client which uses the discovery API."""
+import contextlib
 import json
 import logging
 import os
@@ -22,6 +23,7 @@ from urlparse import urljoin
 import google_auth_httplib2
 import googleapiclient
 from googleapiclient import discovery
+from googleapiclient import errors
 from googleapiclient.http import set_user_agent
 import httplib2
 from ratelimiter import RateLimiter
@@ -63,6 +65,14 @@ REQUEST_REPLAYER = dict()
 DISCOVERY_DOCS_BASE_DIR = os.path.join(os.path.abspath(
     os.path.dirname(__file__)), 'discovery_documents')
 
+# Default maximum number of requests in one batch request, the lowest limit
+# of the APIs batched by Forseti.
+MAX_BATCH_SIZE = 100
+
+# The connection pool shared by the repositories using the default
+# credentials, None to use one connection per thread.
+_HTTP_POOL = None
+
 
 @retry(retry_on_exception=retryable_exceptions.is_retryable_exception,
        wait_exponential_multiplier=1000, wait_exponential_max=10000,
@@ -150,6 +160,60 @@ def _build_http(http=None):
     return set_user_agent(http, user_agent)
 
 
+class HttpPool(object):
+    """A bounded pool of persistent http connections shared by all threads.
+
+    Each request checks out an idle http object for its duration, so any
+    number of calling threads share at most max_connections kept alive
+    connections instead of holding one connection per thread. Requests wait
+    while all the connections are busy.
+    """
+
+    def __init__(self, max_connections):
+        """Constructor.
+
+        Args:
+            max_connections (int): The maximum number of connections.
+        """
+        self.max_connections = max_connections
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = []
+
+    @contextlib.contextmanager
+    def http(self):
+        """Check out an http object for the duration of a request.
+
+        Yields:
+            httplib2.Http: An http object not used by any other thread.
+        """
+        with self._slots:
+            try:
+                http = self._idle.pop()
+            except IndexError:
+                http = _build_http()
+            try:
+                yield http
+            finally:
+                self._idle.append(http)
+
+
+def configure_http_pool(max_connections):
+    """Share a bounded connection pool between the API requests.
+
+    Only the repositories using the default credentials, which otherwise
+    share a thread local http object, use the pool.
+
+    Args:
+        max_connections (int): The size of the pool, 0 to go back to one
+            connection per thread.
+    """
+    global _HTTP_POOL  # pylint: disable=global-statement
+    if max_connections > 0:
+        _HTTP_POOL = HttpPool(max_connections)
+    else:
+        _HTTP_POOL = None
+
+
 # pylint: disable=too-many-instance-attributes
 class BaseRepositoryClient(object):
     """Base class for API repository for a specified Cloud API."""
@@ -363,6 +427,23 @@ class GCPRepository(object):
             self._local.http = authorized_http
         return authorized_http
 
+    @contextlib.contextmanager
+    def _checkout_http(self):
+        """Get the http object of a request.
+
+        Yields:
+            google_auth_httplib2.AuthorizedHttp: A pooled connection authorized
+                by the credentials if the shared pool is configured, the http
+                object of the thread otherwise.
+        """
+        pool = _HTTP_POOL
+        if not self._use_cached_http or not pool:
+            yield self.http
+            return
+        with pool.http() as http:
+            yield google_auth_httplib2.AuthorizedHttp(self._credentials,
+                                                      http=http)
+
     def _build_request(self, verb, verb_arguments):
         """Builds HttpRequest object.
 
@@ -520,6 +601,98 @@ class GCPRepository(object):
         request = self._build_request(verb, verb_arguments)
         return self._execute(request)
 
+    def execute_batch_query(self, verb, verb_arguments_list,
+                            batch_size=None):
+        """Executes many queries (ex. getIamPolicy) in batch requests.
+
+        Every query in a batch counts as one call against the rate limiter.
+        A failed query does not fail the other queries of its batch, its error
+        is returned in place of its response.
+
+        Args:
+            verb (str): Method to execute on the component (ex. get).
+            verb_arguments_list (list): The key-value pairs to be passed to
+                _BuildRequest for each query.
+            batch_size (int): The maximum number of queries per batch request,
+                MAX_BATCH_SIZE if not set.
+
+        Returns:
+            list: A (response, exception) tuple per query, in the order of
+                verb_arguments_list. The exception is None on success.
+        """
+        batch_size = batch_size or MAX_BATCH_SIZE
+        requests = [self._build_request(verb, verb_arguments)
+                    for verb_arguments in verb_arguments_list]
+
+        if (os.environ.get(replay.RECORD_ENVIRONMENT_VAR) or
+                os.environ.get(replay.REPLAY_ENVIRONMENT_VAR)):
+            # Recordings are keyed by single requests, so do not batch them.
+            return [self._execute_or_error(request) for request in requests]
+
+        results = [None] * len(requests)
+
+        def _callback(request_id, response, exception):
+            """Store the result of one query of the batch.
+
+            Args:
+                request_id (str): The index of the query.
+                response (dict): The response of the query.
+                exception (HttpError): The error of the query, if it failed.
+            """
+            results[int(request_id)] = (response, exception)
+
+        for start in xrange(0, len(requests), batch_size):
+            chunk = requests[start:start + batch_size]
+            batch = self.gcp_service.new_batch_http_request()
+            for index, request in enumerate(chunk, start):
+                batch.add(request, callback=_callback, request_id=str(index))
+            try:
+                self._execute_batch(batch, len(chunk))
+            except (errors.HttpError, httplib2.HttpLib2Error) as e:
+                LOGGER.warn('Batch request of %s %s queries failed: %s',
+                            len(chunk), verb, e)
+                for index in xrange(start, start + len(chunk)):
+                    results[index] = (None, e)
+        return results
+
+    def _execute_or_error(self, request):
+        """Run execute, returning the error of a failed request.
+
+        Args:
+            request (object): The HttpRequest object to execute.
+
+        Returns:
+            tuple: The (response, exception) of the request, the exception is
+                None on success.
+        """
+        try:
+            return self._execute(request), None
+        except (errors.HttpError, httplib2.HttpLib2Error) as e:
+            return None, e
+
+    @retry(retry_on_exception=retryable_exceptions.is_retryable_exception,
+           wait_exponential_multiplier=1000, wait_exponential_max=10000,
+           stop_max_attempt_number=5)
+    def _execute_batch(self, batch, num_requests):
+        """Run execute on a batch request with retries and rate limiting.
+
+        Args:
+            batch (object): The BatchHttpRequest object to execute.
+            num_requests (int): The number of requests in the batch.
+        """
+        if self._rate_limiter:
+            # Each request in the batch is billed against the API quota, so
+            # count all but the last one up front and send the batch as the
+            # last call.
+            for _ in xrange(num_requests - 1):
+                with self._rate_limiter:
+                    pass
+            with self._rate_limiter, self._checkout_http() as http:
+                batch.execute(http=http)
+            return
+        with self._checkout_http() as http:
+            batch.execute(http=http)
+
     @replay.replay(REQUEST_REPLAYER)
     @replay.record(REQUEST_RECORDER)
     @retry(retry_on_exception=retryable_exceptions.is_retryable_exception,
@@ -538,10 +711,11 @@ class GCPRepository(object):
             # Since the ratelimiter library only exposes a context manager
             # interface the code has to be duplicated to handle the case where
             # no rate limiter is defined.
-            with self._rate_limiter:
-                return request.execute(http=self.http,
+            with self._rate_limiter, self._checkout_http() as http:
+                return request.execute(http=http,
                                        num_retries=self._num_retries)
-        return request.execute(http=self.http,
-                               num_retries=self._num_retries)
+        with self._checkout_http() as http:
+            return request.execute(http=http,
+                                   num_retries=self._num_retries)
 # pylint: enable=too-many-instance-attributes, too-many-arguments
 # pylint: enable=too-many-locals
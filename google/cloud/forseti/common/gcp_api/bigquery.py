@@ -210,3 +210,33 @@ class BigQueryClient(object):
             return access
         except (errors.HttpError, HttpLib2Error) as e:
             raise api_errors.ApiExecutionError(project_id, e)
+
+    def get_dataset_accesses(self, project_id, dataset_ids, batch_size=None):
+        """Return the access portion of many datasets in batch requests.
+
+        Datasets that could not be fetched in a batch are left out of the
+        results and should be fetched with get_dataset_access.
+
+        Args:
+            project_id (str): String representing the project id.
+            dataset_ids (list): The ids of the datasets in the project.
+            batch_size (int): The maximum number of datasets per batch request.
+
+        Returns:
+            dict: The access list of each fetched dataset, keyed by dataset id.
+        """
+        results = self.repository.datasets.batch_get(
+            resource=project_id, targets=dataset_ids, fields='access',
+            batch_size=batch_size)
+        accesses = {}
+        for dataset_id, (response, error) in zip(dataset_ids, results):
+            if error:
+                LOGGER.debug('Batched dataset request failed for project_id = '
+                             '%s, dataset_id = %s: %s', project_id, dataset_id,
+                             error)
+                continue
+            accesses[dataset_id] = response.get('access', [])
+        LOGGER.debug('Getting the access portion of datasets in batch requests,'
+                     ' project_id = %s, datasets = %s, fetched = %s',
+                     project_id, len(dataset_ids), len(accesses))
+        return accesses
@@ -200,6 +200,33 @@ class _IamProjectsServiceAccountsRepository(
             self, resource, fields=fields, verb=verb, include_body=include_body,
             resource_field=resource_field, **kwargs)
 
+    def batch_get_iam_policy(self, resources, fields=None,
+                             verb='getIamPolicy', include_body=False,
+                             resource_field='resource', batch_size=None,
+                             **kwargs):
+        """Get the IAM Policies of many Service Accounts in batch requests.
+
+        Args:
+            self (GCPRespository): An instance of a GCPRespository class.
+            resources (list): The ids of the resources to fetch.
+            fields (str): Fields to include in the response - partial response.
+            verb (str): The method to call on the API.
+            include_body (bool): If true, include an empty body parameter in the
+                method args.
+            resource_field (str): The parameter name of the resource field to
+                pass to the method.
+            batch_size (int): The maximum number of policies per batch request.
+            **kwargs (dict): Optional additional arguments to pass to the query.
+
+        Returns:
+            list: A (response, exception) tuple per resource, in order.
+        """
+        # The IAM getIamPolicy does not allow the 'body' argument.
+        return repository_mixins.GetIamPolicyQueryMixin.batch_get_iam_policy(
+            self, resources, fields=fields, verb=verb,
+            include_body=include_body, resource_field=resource_field,
+            batch_size=batch_size, **kwargs)
+
     @staticmethod
     def get_name(project_id):
         """Returns a formatted name field to pass in to the API.
@@ -412,6 +439,36 @@ class IAMClient(object):
             LOGGER.exception(api_exception)
             raise api_exception
 
+    def get_service_account_iam_policies(self, names, batch_size=None):
+        """Get the IAM policies of many service accounts in batch requests.
+
+        Service accounts whose policy could not be fetched in a batch are left
+        out of the results and should be fetched with
+        get_service_account_iam_policy.
+
+        Args:
+            names (list): The service account names to query, each must be in
+                the format
+                projects/{PROJECT_ID}/serviceAccounts/{SERVICE_ACCOUNT_EMAIL}
+            batch_size (int): The maximum number of policies per batch request.
+
+        Returns:
+            dict: The IAM policy of each fetched service account, keyed by name.
+        """
+        results = self.repository.projects_serviceaccounts.batch_get_iam_policy(
+            names, batch_size=batch_size)
+        policies = {}
+        for name, (response, error) in zip(names, results):
+            if error:
+                LOGGER.debug('Batched IAM policy request failed for service '
+                             'account %s: %s', name, error)
+                continue
+            policies[name] = response
+        LOGGER.debug('Getting the IAM policies of service accounts in batch'
+                     ' requests, names = %s, fetched = %s', len(names),
+                     len(policies))
+        return policies
+
     def get_service_account_keys(self, name, key_type=None):
         """Get keys associated with the given Service Account.
 
@@ -126,6 +126,45 @@ class GetQueryMixin(object):
             verb_arguments=arguments,
         )
 
+    def batch_get(self, resource, targets, fields=None, verb='get',
+                  batch_size=None, **kwargs):
+        """Get many API entities of a resource in batch requests.
+
+        Args:
+            self (GCPRespository): An instance of a GCPRespository class.
+            resource (str): The id of the resource to query.
+            targets (list): Names of the entities to fetch.
+            fields (str): Fields to include in the response - partial response.
+            verb (str): The method to call on the API.
+            batch_size (int): The maximum number of entities per batch request.
+            **kwargs (dict): Optional additional arguments to pass to the query.
+
+        Returns:
+            list: A (response, exception) tuple per target, in order.
+
+        Raises:
+            ValueError: When get_key_field or entity_field was not defined in
+                the base GCPRepository instance.
+        """
+        if not self._get_key_field or not self._entity_field:
+            raise ValueError('Repository was created without a valid '
+                             'get_key_field or entity_field argument. Cannot '
+                             'execute batch get request.')
+
+        arguments_list = []
+        for target in targets:
+            arguments = {self._get_key_field: resource,
+                         self._entity_field: target,
+                         'fields': fields}
+            if kwargs:
+                arguments.update(kwargs)
+            arguments_list.append(arguments)
+        return self.execute_batch_query(
+            verb=verb,
+            verb_arguments_list=arguments_list,
+            batch_size=batch_size,
+        )
+
 
 class GetIamPolicyQueryMixin(object):
     """Mixin that implements getIamPolicy query."""
@@ -163,6 +202,42 @@ class GetIamPolicyQueryMixin(object):
             verb_arguments=arguments,
         )
 
+    def batch_get_iam_policy(self, resources, fields=None,
+                             verb='getIamPolicy', include_body=True,
+                             resource_field='resource', batch_size=None,
+                             **kwargs):
+        """Get the IAM Policies of many resources in batch requests.
+
+        Args:
+            self (GCPRespository): An instance of a GCPRespository class.
+            resources (list): The ids of the resources to fetch.
+            fields (str): Fields to include in the response - partial response.
+            verb (str): The method to call on the API.
+            include_body (bool): If true, include an empty body parameter in the
+                method args.
+            resource_field (str): The parameter name of the resource field to
+                pass to the method.
+            batch_size (int): The maximum number of policies per batch request.
+            **kwargs (dict): Optional additional arguments to pass to the query.
+
+        Returns:
+            list: A (response, exception) tuple per resource, in order.
+        """
+        arguments_list = []
+        for resource in resources:
+            arguments = {resource_field: resource,
+                         'fields': fields}
+            if include_body:
+                arguments['body'] = {}
+            if kwargs:
+                arguments.update(kwargs)
+            arguments_list.append(arguments)
+        return self.execute_batch_query(
+            verb=verb,
+            verb_arguments_list=arguments_list,
+            batch_size=batch_size,
+        )
+
 
 class OrgPolicyQueryMixin(object):
     """Mixin that implements getOrgPolicy and listOrgPolicies query."""
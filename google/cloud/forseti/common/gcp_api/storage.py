@@ -31,6 +31,9 @@ LOGGER = logger.get_logger(__name__)
 
 GCS_SCHEME = 'gs'
 
+# Size of the chunks of streamed downloads, bounds the memory used.
+DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
 
 def get_bucket_and_path_from(full_path):
     """Get the bucket and object path.
@@ -212,6 +215,23 @@ class _StorageBucketsRepository(
         return repository_mixins.GetIamPolicyQueryMixin.get_iam_policy(
             self, bucket, fields=fields, include_body=False,
             resource_field='bucket', **kwargs)
+
+    def batch_get_iam_policy(self, buckets, fields=None, batch_size=None,
+                             **kwargs):
+        """Get the IAM Policies of many Buckets in batch requests.
+
+        Args:
+            buckets (list): The ids of the buckets to fetch.
+            fields (str): Fields to include in the response - partial response.
+            batch_size (int): The maximum number of policies per batch request.
+            **kwargs (dict): Optional additional arguments to pass to the query.
+
+        Returns:
+            list: A (response, exception) tuple per bucket, in order.
+        """
+        return repository_mixins.GetIamPolicyQueryMixin.batch_get_iam_policy(
+            self, buckets, fields=fields, include_body=False,
+            resource_field='bucket', batch_size=batch_size, **kwargs)
     # pylint: enable=arguments-differ
 
 
@@ -337,6 +357,38 @@ class _StorageObjectsRepository(
                 num_retries=self._num_retries)
         return progress.total_size
 
+    def download_chunks(self, bucket, object_name,
+                        chunksize=DOWNLOAD_CHUNK_SIZE):
+        """Download an object from a bucket in chunks.
+
+        Args:
+            bucket (str): The name of the bucket to read from.
+            object_name (str): The name of the object to read.
+            chunksize (int): The size in bytes of each downloaded chunk.
+
+        Yields:
+            str: The next chunk of the contents of the object.
+        """
+        verb_arguments = {
+            'bucket': bucket,
+            'object': object_name}
+
+        media_request = self._build_request('get_media', verb_arguments)
+        media_request.http = self.http
+
+        out_stream = StringIO.StringIO()
+        try:
+            downloader = http.MediaIoBaseDownload(out_stream, media_request,
+                                                  chunksize=chunksize)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk(num_retries=self._num_retries)
+                yield out_stream.getvalue()
+                out_stream.seek(0)
+                out_stream.truncate()
+        finally:
+            out_stream.close()
+
     def upload(self, bucket, object_name, file_content):
         """Upload an object to a bucket.
 
@@ -573,6 +625,34 @@ class StorageClient(object):
             LOGGER.exception(api_exception)
             raise api_exception
 
+    def get_bucket_iam_policies(self, buckets, batch_size=None):
+        """Gets the IAM policies of many buckets in batch requests.
+
+        Buckets whose policy could not be fetched in a batch, such as
+        requester pays buckets, are left out of the results and should be
+        fetched with get_bucket_iam_policy.
+
+        Args:
+            buckets (list): The buckets to fetch the policies for.
+            batch_size (int): The maximum number of policies per batch request.
+
+        Returns:
+            dict: The IAM policy of each fetched bucket, keyed by bucket.
+        """
+        results = self.repository.buckets.batch_get_iam_policy(
+            buckets, batch_size=batch_size)
+        policies = {}
+        for bucket, (response, error) in zip(buckets, results):
+            if error:
+                LOGGER.debug('Batched IAM policy request failed for bucket '
+                             '%s: %s', bucket, error)
+                continue
+            policies[bucket] = response
+        LOGGER.debug('Getting the IAM policies of buckets in batch requests,'
+                     ' buckets = %s, fetched = %s', len(buckets),
+                     len(policies))
+        return policies
+
     def get_default_object_acls(self, bucket, user_project=None):
         """Gets acls for GCS bucket.
 
@@ -736,3 +816,27 @@ class StorageClient(object):
                 'objectIamPolicy', e, 'bucket', bucket)
             LOGGER.exception(api_exception)
             raise api_exception
+
+    def download_chunks(self, full_bucket_path,
+                        chunksize=DOWNLOAD_CHUNK_SIZE):
+        """Streams a file from GCS without a local copy.
+
+        Args:
+            full_bucket_path (str): The full path of the bucket object.
+            chunksize (int): The size in bytes of each downloaded chunk.
+
+        Yields:
+            str: The next chunk of the contents of the object.
+
+        Raises:
+            HttpError: HttpError is raised if the call to the GCP storage API
+                fails
+        """
+        bucket, object_name = get_bucket_and_path_from(full_bucket_path)
+        try:
+            for chunk in self.repository.objects.download_chunks(
+                    bucket, object_name, chunksize):
+                yield chunk
+        except errors.HttpError:
+            LOGGER.exception('Unable to download file.')
+            raise
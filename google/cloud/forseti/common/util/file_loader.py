@@ -69,6 +69,30 @@ def copy_file_from_gcs(file_path, output_path=None, storage_client=None):
     return output_path
 
 
+def stream_file_from_gcs(file_path, storage_client=None):
+    """Stream the lines of a text file in GCS without a local copy.
+
+     Args:
+        file_path (str): The full GCS path to the file.
+        storage_client (storage.StorageClient): The Storage API Client to use
+            for downloading the file using the API.
+
+     Yields:
+        str: The next line of the file, including the line separator.
+    """
+    if not storage_client:
+        storage_client = storage.StorageClient()
+
+    partial_line = ''
+    for chunk in storage_client.download_chunks(full_bucket_path=file_path):
+        lines = (partial_line + chunk).split('\n')
+        partial_line = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    if partial_line:
+        yield partial_line
+
+
 def _get_filetype_parser(file_path, parser_type):
     """Return a parser function for parsing the file.
 
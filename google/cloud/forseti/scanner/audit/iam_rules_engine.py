@@ -19,7 +19,9 @@ stored locally or in GCS) and compares a policy against the RuleBook to
 determine whether there are violations.
 """
 
+import collections
 import itertools
+import re
 import threading
 
 from google.cloud.forseti.common.gcp_type import errors as resource_errors
@@ -28,6 +30,7 @@ from google.cloud.forseti.common.gcp_type import resource as resource_mod
 from google.cloud.forseti.common.gcp_type import resource_util
 from google.cloud.forseti.common.util import logger
 from google.cloud.forseti.common.util import relationship
+from google.cloud.forseti.common.util.regular_exp import escape_and_globify
 from google.cloud.forseti.scanner.audit import base_rules_engine as bre
 from google.cloud.forseti.scanner.audit import rules as scanner_rules
 from google.cloud.forseti.scanner.audit import errors as audit_errors
@@ -37,7 +40,8 @@ LOGGER = logger.get_logger(__name__)
 VIOLATION_TYPE = 'IAM_POLICY_VIOLATION'
 
 
-def _check_whitelist_members(rule_members=None, policy_members=None):
+def _check_whitelist_members(rule_members=None, policy_members=None,
+                             member_index=None):
     """Whitelist: Check that policy members ARE in rule members.
 
     If a policy member is NOT found in the rule members, add it to
@@ -46,10 +50,16 @@ def _check_whitelist_members(rule_members=None, policy_members=None):
     Args:
         rule_members (list): IamPolicyMembers allowed in the rule.
         policy_members (list): IamPolicyMembers in the policy.
+        member_index (_MemberIndex): If set, the index of the rule members
+            used instead of matching every rule member.
 
     Return:
         list: Policy members NOT found in the whitelist (rule members).
     """
+    if member_index is not None:
+        return [policy_member for policy_member in policy_members
+                if not member_index.matches(policy_member)]
+
     violating_members = []
     for policy_member in policy_members:
         # check if policy_member is found in rule_members
@@ -58,7 +68,8 @@ def _check_whitelist_members(rule_members=None, policy_members=None):
     return violating_members
 
 
-def _check_blacklist_members(rule_members=None, policy_members=None):
+def _check_blacklist_members(rule_members=None, policy_members=None,
+                             member_index=None):
     """Blacklist: Check that policy members ARE NOT in rule members.
 
     If a policy member is found in the rule members, add it to the
@@ -67,10 +78,16 @@ def _check_blacklist_members(rule_members=None, policy_members=None):
     Args:
         rule_members (list): IamPolicyMembers allowed in the rule.
         policy_members (list): IamPolicyMembers in the policy.
+        member_index (_MemberIndex): If set, the index of the rule members
+            used to skip the policy members matching no rule member.
 
     Return:
         list: Policy members found in the blacklist (rule members).
     """
+    if member_index is not None:
+        policy_members = [policy_member for policy_member in policy_members
+                          if member_index.matches(policy_member)]
+
     violating_members = [
         policy_member
         for policy_member in policy_members
@@ -103,6 +120,125 @@ def _check_required_members(rule_members=None, policy_members=None):
     return violating_members
 
 
+class _MemberIndex(object):
+    """Rule members bucketed to match a policy member in constant time.
+
+    Gives the same result as matching the policy member against every rule
+    member with IamPolicyMember.matches.
+    """
+
+    ALL_MEMBER_TYPES = frozenset([iam_policy.IamPolicyMember.ALL_USERS,
+                                  iam_policy.IamPolicyMember.ALL_AUTH_USERS])
+
+    def __init__(self, rule_members):
+        """Initialize.
+
+        Args:
+            rule_members (list): IamPolicyMembers of a rule binding.
+        """
+        self.all_member_types = set()
+        self.domains = set()
+        # Lower cased names without glob, by member type.
+        self.exact_names = collections.defaultdict(set)
+        # One alternation of the name globs, by member type.
+        self.name_patterns = {}
+
+        globs = collections.defaultdict(list)
+        for rule_member in rule_members:
+            if rule_member.type in self.ALL_MEMBER_TYPES:
+                self.all_member_types.add(rule_member.type)
+                continue
+            if not rule_member.name:
+                continue
+            if rule_member.type == 'domain':
+                self.domains.add(rule_member.name)
+            if '*' in rule_member.name:
+                globs[rule_member.type].append(
+                    escape_and_globify(rule_member.name))
+            else:
+                self.exact_names[rule_member.type].add(
+                    rule_member.name.lower())
+
+        for member_type, patterns in globs.iteritems():
+            self.name_patterns[member_type] = re.compile(
+                '|'.join('(?:{})'.format(pattern) for pattern in patterns),
+                flags=re.IGNORECASE)
+
+    def matches(self, policy_member):
+        """Determine if a policy member matches any of the rule members.
+
+        Args:
+            policy_member (object): The IamPolicyMember or member string.
+
+        Returns:
+            bool: True if a rule member matches the policy member.
+        """
+        if not isinstance(policy_member, iam_policy.IamPolicyMember):
+            policy_member = iam_policy.IamPolicyMember.create_from(
+                policy_member)
+
+        if policy_member.type in self.all_member_types:
+            return True
+        if policy_member.name is None:
+            return False
+
+        if (policy_member.name.lower() in
+                self.exact_names.get(policy_member.type, ())):
+            return True
+
+        name_pattern = self.name_patterns.get(policy_member.type)
+        if name_pattern and name_pattern.match(policy_member.name):
+            return True
+
+        # A domain rule member matches the users of the domain.
+        if (policy_member.type == 'user' and self.domains and
+                '@' in policy_member.name):
+            _, domain = policy_member.name.rsplit('@', 1)
+            return domain in self.domains
+
+        return False
+
+
+class _RuleIndex(object):
+    """The bindings of a rule, bucketed by role.
+
+    Exact role names are looked up in a dict, only the role globs are
+    matched against the policy binding role.
+    """
+
+    def __init__(self, rule):
+        """Initialize.
+
+        Args:
+            rule (Rule): The rule to index.
+        """
+        self.exact_roles = collections.defaultdict(list)
+        self.role_globs = []
+        for position, rule_binding in enumerate(rule.bindings):
+            entry = (position, rule_binding, _MemberIndex(rule_binding.members))
+            if '*' in rule_binding.role_name:
+                self.role_globs.append(entry)
+            else:
+                self.exact_roles[rule_binding.role_name.lower()].append(entry)
+
+    def bindings_for_role(self, role_name):
+        """Get the rule bindings whose role pattern matches a role.
+
+        Args:
+            role_name (str): The role of a policy binding.
+
+        Returns:
+            list: The (IamPolicyBinding, _MemberIndex) of the matching rule
+                bindings, in rule order.
+        """
+        entries = list(self.exact_roles.get(role_name.lower(), []))
+        entries.extend(entry for entry in self.role_globs
+                       if entry[1].role_pattern.match(role_name))
+        entries.sort(key=lambda entry: entry[0])
+        return [(rule_binding, member_index)
+                for _, rule_binding, member_index in entries]
+
+
 class IamRulesEngine(bre.BaseRulesEngine):
     """Rules engine for org resources."""
 
@@ -503,6 +639,8 @@ class ResourceRules(object):
             scanner_rules.RuleMode.BLACKLIST: _check_blacklist_members,
             scanner_rules.RuleMode.REQUIRED: _check_required_members,
         }
+        # _RuleIndex of the whitelist and blacklist rules, built on first use.
+        self._rule_indexes = {}
 
     def __eq__(self, other):
         """Equals
@@ -633,17 +771,17 @@ class ResourceRules(object):
         Yields:
             iterable: A generator of RuleViolations.
         """
+        rule_index = self._get_rule_index(rule)
         for policy_binding in policy_bindings:
-            for rule_binding in rule.bindings:
-                # If the rule's role pattern matches the policy binding's
-                # role pattern, then check the members to see whether they
-                # match, according to the rule mode.
-                violating_members = None
-                if rule_binding.role_pattern.match(policy_binding.role_name):
-                    violating_members = (self._dispatch_rule_mode_check(
-                        mode=rule.mode,
-                        rule_members=rule_binding.members,
-                        policy_members=policy_binding.members))
+            # Check the members of the rule bindings whose role pattern
+            # matches the policy binding's role, according to the rule mode.
+            for rule_binding, member_index in rule_index.bindings_for_role(
+                    policy_binding.role_name):
+                violating_members = (self._dispatch_rule_mode_check(
+                    mode=rule.mode,
+                    rule_members=rule_binding.members,
+                    policy_members=policy_binding.members,
+                    member_index=member_index))
                 if violating_members:
                     yield scanner_rules.RuleViolation(
                         resource_type=resource.type,
@@ -656,18 +794,40 @@ class ResourceRules(object):
                         members=tuple(violating_members),
                         resource_data=resource.data)
 
+    def _get_rule_index(self, rule):
+        """Get the index of a rule, building it the first time.
+
+        Args:
+            rule (Rule): The rule.
+
+        Returns:
+            _RuleIndex: The index of the rule bindings.
+        """
+        rule_index = self._rule_indexes.get(rule)
+        if rule_index is None:
+            rule_index = _RuleIndex(rule)
+            self._rule_indexes[rule] = rule_index
+        return rule_index
+
     def _dispatch_rule_mode_check(self, mode, rule_members=None,
-                                  policy_members=None):
+                                  policy_members=None, member_index=None):
         """Determine which rule mode method to execute for rule audit.
 
         Args:
             mode (str): The rule mode.
             rule_members (list): The rule binding members.
             policy_members (list): The policy binding members.
+            member_index (_MemberIndex): The index of the rule binding
+                members, only for the whitelist and blacklist modes.
 
         Returns:
             list: The result of calling the dispatched method.
         """
+        if member_index is None:
+            return self._rule_mode_methods[mode](
+                rule_members=rule_members,
+                policy_members=policy_members)
         return self._rule_mode_methods[mode](
             rule_members=rule_members,
-            policy_members=policy_members)
+            policy_members=policy_members,
+            member_index=member_index)
@@ -27,6 +27,10 @@ from google.cloud.forseti.scanner.audit import errors as audit_errors
 
 LOGGER = logger.get_logger(__name__)
 
+# Parsed (major, minor) parts of the node pool versions, the same versions
+# are checked against every version rule of every cluster.
+_PARSED_VERSIONS = {}
+
 
 class KeVersionRulesEngine(bre.BaseRulesEngine):
     """Rules engine for KE Version scanner."""
@@ -339,9 +343,7 @@ class VersionRule(object):
             bool: True if version is allowed, else False
         """
         LOGGER.debug('Checking version %s.', version)
-        parts = version.split('.')
-        major = parse_version('.'.join(parts[0:2]))
-        minor = parse_version('.'.join(parts[2:]))
+        major, minor = _parse_version_parts(version)
 
         if self._minor:
             if major != self._major:
@@ -564,3 +566,21 @@ RuleViolation = namedtuple('RuleViolation',
                             'violation_reason', 'project_id',
                             'cluster_name', 'node_pool_name',
                             'resource_data', 'resource_name'])
+
+
+def _parse_version_parts(version):
+    """Parse the major and minor parts of a Kubernetes version, cached.
+
+    Args:
+        version (str): A version string. e.g. '1.6.11.gke.1'
+
+    Returns:
+        tuple: The parsed major ('1.6') and minor ('11.gke.1') versions.
+    """
+    parsed = _PARSED_VERSIONS.get(version)
+    if parsed is None:
+        parts = version.split('.')
+        parsed = (parse_version('.'.join(parts[0:2])),
+                  parse_version('.'.join(parts[2:])))
+        _PARSED_VERSIONS[version] = parsed
+    return parsed
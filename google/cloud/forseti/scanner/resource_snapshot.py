@@ -0,0 +1,158 @@
+# Copyright 2018 The Forseti Security Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model resources shared by the scanners of a scan run."""
+
+from collections import defaultdict
+import json
+import threading
+
+from google.cloud.forseti.common.util import logger
+
+LOGGER = logger.get_logger(__name__)
+
+
+class SnapshotResource(object):
+    """Read-only copy of a model resource.
+
+    Has the attributes of the model Resource used by the scanners. The
+    parent is a copy without data and without parent.
+    """
+
+    __slots__ = ('type_name', 'name', 'type', 'full_name', 'data', 'parent',
+                 '_parsed_data')
+
+    def __init__(self, resource, parent=None):
+        """Initialize.
+
+        Args:
+            resource (Resource): The model resource to copy.
+            parent (SnapshotResource): The copy of the parent resource.
+        """
+        self.type_name = resource.type_name
+        self.name = resource.name
+        self.type = resource.type
+        self.full_name = resource.full_name
+        self.data = resource.data
+        self.parent = parent
+        self._parsed_data = None
+
+    @property
+    def parsed_data(self):
+        """The resource data parsed from json, shared by all scanners.
+
+        Returns:
+            object: The parsed data, it must not be modified.
+        """
+        if self._parsed_data is None:
+            self._parsed_data = json.loads(self.data)
+        return self._parsed_data
+
+
+def load_data(resource):
+    """Parse the json data of a model or snapshot resource.
+
+    Args:
+        resource (object): A Resource or a SnapshotResource.
+
+    Returns:
+        object: The parsed data. For a SnapshotResource it is shared and must
+            not be modified.
+    """
+    if isinstance(resource, SnapshotResource):
+        return resource.parsed_data
+    return json.loads(resource.data)
+
+
+class ResourceSnapshot(object):
+    """Loads each resource type of a model once for all the scanners."""
+
+    def __init__(self, model_manager, model_name):
+        """Initialize.
+
+        Args:
+            model_manager (ModelManager): The model manager.
+            model_name (str): The name of the model to scan.
+        """
+        self.model_manager = model_manager
+        self.model_name = model_name
+        self.resources_by_type = {}
+        self.resources_by_parent = {}
+        self.parents = {}
+        self.lock = threading.Lock()
+        self.type_locks = defaultdict(threading.Lock)
+
+    def _load(self, resource_type):
+        """Load the resources of a type, if not loaded yet.
+
+        Args:
+            resource_type (str): The resource type.
+        """
+        with self.lock:
+            type_lock = self.type_locks[resource_type]
+        with type_lock:
+            if resource_type in self.resources_by_type:
+                return
+
+            resources = []
+            by_parent = defaultdict(list)
+            scoped_session, data_access = self.model_manager.get(
+                self.model_name)
+            with scoped_session as session:
+                for resource in data_access.scanner_iter(session,
+                                                         resource_type):
+                    parent = self._parent(resource.parent)
+                    snapshot_resource = SnapshotResource(resource, parent)
+                    resources.append(snapshot_resource)
+                    if parent:
+                        by_parent[parent.type_name].append(snapshot_resource)
+
+            LOGGER.debug('Loaded %s %s resources in the snapshot.',
+                         len(resources), resource_type)
+            self.resources_by_parent[resource_type] = dict(by_parent)
+            self.resources_by_type[resource_type] = resources
+
+    def _parent(self, parent):
+        """Get the shared copy of a parent resource.
+
+        Args:
+            parent (Resource): The model parent resource, can be None.
+
+        Returns:
+            SnapshotResource: The copy of the parent, without data.
+        """
+        if parent is None:
+            return None
+        with self.lock:
+            if parent.type_name not in self.parents:
+                snapshot_parent = SnapshotResource(parent)
+                snapshot_parent.data = None
+                self.parents[parent.type_name] = snapshot_parent
+            return self.parents[parent.type_name]
+
+    def resources(self, resource_type, parent_type_name=None):
+        """Get the resources of a type, like ModelAccess.scanner_iter.
+
+        Args:
+            resource_type (str): The resource type.
+            parent_type_name (str): If set, only the resources with this
+                parent.
+
+        Returns:
+            list: The SnapshotResources, they must not be modified.
+        """
+        self._load(resource_type)
+        if parent_type_name:
+            return self.resources_by_parent[resource_type].get(
+                parent_type_name, [])
+        return self.resources_by_type[resource_type]
@@ -13,8 +13,14 @@
 # limitations under the License.
 """GCP Resource scanner."""
 
+import json
+from multiprocessing.pool import ThreadPool
+import resource
+import time
+
 from google.cloud.forseti.common.util import logger
 from google.cloud.forseti.common.util.index_state import IndexState
+from google.cloud.forseti.scanner import resource_snapshot
 from google.cloud.forseti.scanner import scanner_builder
 from google.cloud.forseti.services.scanner import dao as scanner_dao
 
@@ -53,7 +59,7 @@ def _error_message(failed):
 
 
 def mark_scanner_index_complete(
-        session, scanner_index_id, succeeded, failed):
+        session, scanner_index_id, succeeded, failed, scanner_stats=None):
     """Mark the current 'scanner_index' row as complete.
 
     Args:
@@ -61,6 +67,8 @@ def mark_scanner_index_complete(
         scanner_index_id (str): id of the `ScannerIndex` row to mark
         succeeded (list): names of scanners that ran successfully
         failed (list): names of scanners that failed
+        scanner_stats (dict): if set, the run statistics by scanner name,
+            stored as json in the message of the row
     """
     scanner_index = (
         session.query(scanner_dao.ScannerIndex)
@@ -73,10 +81,50 @@ def mark_scanner_index_complete(
         scanner_index.complete(IndexState.FAILURE)
     if failed:
         scanner_index.set_error(session, _error_message(failed))
+    if scanner_stats:
+        scanner_index.message = json.dumps(
+            {'scanner_stats': scanner_stats}, sort_keys=True)
     session.add(scanner_index)
     session.flush()
 
 
+def _run_scanner(scanner, progress_queue, violation_access):
+    """Run a scanner and measure it.
+
+    Args:
+        scanner (BaseScanner): The scanner to run.
+        progress_queue (Queue): The progress queue.
+        violation_access (ViolationAccess): The violations of the scan run.
+
+    Returns:
+        tuple: The scanner name, whether it succeeded, and a dict of its
+            wall time in seconds and of the peak resident memory in KB of
+            the server process when it completed.
+    """
+    scanner_name = scanner.__class__.__name__
+    start = time.time()
+    try:
+        scanner.run()
+        progress_queue.put('Running {}...'.format(scanner_name))
+        succeeded = True
+    except Exception:  # pylint: disable=broad-except
+        log_message = 'Error running scanner: {}'.format(scanner_name)
+        progress_queue.put(log_message)
+        LOGGER.exception(log_message)
+        succeeded = False
+    with violation_access.lock:
+        violation_access.session.flush()
+
+    stats = {
+        'wall_time_seconds': round(time.time() - start, 3),
+        'peak_memory_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    LOGGER.info('Scanner %s ran in %s seconds, peak memory %s KB',
+                scanner_name, stats['wall_time_seconds'],
+                stats['peak_memory_kb'])
+    return scanner_name, succeeded, stats
+
+
 def run(model_name=None, progress_queue=None, service_config=None):
     """Run the scanners.
 
@@ -104,26 +152,43 @@ def run(model_name=None, progress_queue=None, service_config=None):
             global_configs, scanner_configs, service_config, model_name,
             None).build()
 
+        if scanner_configs.get('share_model_snapshot', False):
+            snapshot = resource_snapshot.ResourceSnapshot(
+                service_config.model_manager, model_name)
+            for scanner in runnable_scanners:
+                scanner.resource_snapshot = snapshot
+
+        violation_access = service_config.violation_access
+        parallel_scanners = min(scanner_configs.get('parallel_scanners', 1),
+                                len(runnable_scanners))
+        if parallel_scanners > 1:
+            LOGGER.info('Running %s scanners concurrently.', parallel_scanners)
+            pool = ThreadPool(parallel_scanners)
+            try:
+                results = pool.map(
+                    lambda scanner: _run_scanner(
+                        scanner, progress_queue, violation_access),
+                    runnable_scanners)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [
+                _run_scanner(scanner, progress_queue, violation_access)
+                for scanner in runnable_scanners]
+
         succeeded = []
         failed = []
-        for scanner in runnable_scanners:
-            try:
-                scanner.run()
-                progress_queue.put('Running {}...'.format(
-                    scanner.__class__.__name__))
-            except Exception:  # pylint: disable=broad-except
-                log_message = 'Error running scanner: {}'.format(
-                    scanner.__class__.__name__)
-                progress_queue.put(log_message)
-                LOGGER.exception(log_message)
-                failed.append(scanner.__class__.__name__)
+        scanner_stats = {}
+        for scanner_name, scanner_succeeded, stats in results:
+            if scanner_succeeded:
+                succeeded.append(scanner_name)
             else:
-                succeeded.append(scanner.__class__.__name__)
-            session.flush()
-        # pylint: enable=bare-except
+                failed.append(scanner_name)
+            scanner_stats[scanner_name] = stats
         log_message = 'Scan completed!'
         mark_scanner_index_complete(
-            session, scanner_index_id, succeeded, failed)
+            session, scanner_index_id, succeeded, failed, scanner_stats)
         progress_queue.put(log_message)
         progress_queue.put(None)
         LOGGER.info(log_message)
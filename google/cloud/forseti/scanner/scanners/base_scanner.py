@@ -50,12 +50,43 @@ class BaseScanner(object):
         self.model_name = model_name
         self.snapshot_timestamp = snapshot_timestamp
         self.rules = rules
+        # Set by the scanner run to share the model resources between the
+        # scanners, see resource_snapshot.ResourceSnapshot.
+        self.resource_snapshot = None
 
     @abc.abstractmethod
     def run(self):
         """Runs the pipeline."""
         pass
 
+    def _iter_resources(self, resource_type, parent_type_name=None):
+        """Iterate over the model resources of a type.
+
+        The resources come from the resource snapshot of the scan run when
+        there is one, they are then shared with the other scanners and must
+        not be modified. Use resource_snapshot.load_data to parse their data.
+
+        Args:
+            resource_type (str): type of the resources
+            parent_type_name (str): if set, type_name of the parent of the
+                resources
+
+        Yields:
+            object: The Resources or SnapshotResources.
+        """
+        if self.resource_snapshot is not None:
+            for resource in self.resource_snapshot.resources(
+                    resource_type, parent_type_name):
+                yield resource
+            return
+
+        model_manager = self.service_config.model_manager
+        scoped_session, data_access = model_manager.get(self.model_name)
+        with scoped_session as session:
+            for resource in data_access.scanner_iter(
+                    session, resource_type, parent_type_name=parent_type_name):
+                yield resource
+
     def _upload_csv(self, output_path, now_utc, csv_name):
         """Upload CSV to Cloud Storage.
 
@@ -111,7 +142,8 @@ class BaseScanner(object):
             model_description.get('source_info').get('inventory_index_id'))
 
         violation_access = self.service_config.violation_access
-        scanner_index_id = scanner_dao.get_latest_scanner_index_id(
-            violation_access.session, inventory_index_id,
-            index_state=IndexState.RUNNING)
-        violation_access.create(violations, scanner_index_id)
+        with violation_access.lock:
+            scanner_index_id = scanner_dao.get_latest_scanner_index_id(
+                violation_access.session, inventory_index_id,
+                index_state=IndexState.RUNNING)
+            violation_access.create(violations, scanner_index_id)
@@ -16,6 +16,7 @@
 
 from google.cloud.forseti.common.gcp_type.instance import Instance
 from google.cloud.forseti.common.util import logger
+from google.cloud.forseti.scanner import resource_snapshot
 from google.cloud.forseti.scanner.audit import blacklist_rules_engine
 from google.cloud.forseti.scanner.scanners import base_scanner
 
@@ -91,18 +92,13 @@ class BlacklistScanner(base_scanner.BaseScanner):
                    InstanceNetworksInterface objects.
         """
 
-        model_manager = self.service_config.model_manager
-        scoped_session, data_access = model_manager.get(self.model_name)
-        with scoped_session as session:
-            network_interfaces = []
-
-            for instance_from_data_model in data_access.scanner_iter(
-                    session, 'instance'):
-                instance = Instance.from_json(
-                    instance_from_data_model.full_name,
-                    instance_from_data_model.data,
-                    instance_from_data_model.parent.name)
-                network_interfaces.append(instance.create_network_interfaces())
+        network_interfaces = []
+        for instance_from_data_model in self._iter_resources('instance'):
+            instance = Instance.from_dict(
+                instance_from_data_model.full_name,
+                resource_snapshot.load_data(instance_from_data_model),
+                instance_from_data_model.parent.name)
+            network_interfaces.append(instance.create_network_interfaces())
 
         if not network_interfaces:
             LOGGER.warn('No VM network interfaces found. Exiting.')
@@ -14,12 +14,12 @@
 """Scanner for the firewall rule engine."""
 
 from collections import defaultdict
-import json
 
 from google.cloud.forseti.common.gcp_type import firewall_rule
 from google.cloud.forseti.common.gcp_type import resource as resource_type
 from google.cloud.forseti.common.gcp_type import resource_util
 from google.cloud.forseti.common.util import logger
+from google.cloud.forseti.scanner import resource_snapshot
 from google.cloud.forseti.scanner.audit import firewall_rules_engine
 from google.cloud.forseti.scanner.scanners import base_scanner
 
@@ -123,24 +123,20 @@ class FirewallPolicyScanner(base_scanner.BaseScanner):
             dict: Dict of resource to resource count.
         """
 
-        model_manager = self.service_config.model_manager
-        scoped_session, data_access = model_manager.get(self.model_name)
         project_policies = defaultdict(list)
         count = -1
-        with scoped_session as session:
-
-            for cnt, i in enumerate(data_access.scanner_iter(
-                    session, 'firewall')):
-                count = cnt
-                firewall_data_for_scanner = json.loads(i.data)
-                firewall_data_for_scanner['project_id'] = i.parent.name
-                firewall_data_for_scanner['full_name'] = i.full_name
-
-                project_policies[i.parent.name].append(
-                    firewall_rule.FirewallRule.from_dict(
-                        firewall_dict=firewall_data_for_scanner,
-                        project_id=i.parent.name,
-                        validate=True))
+        for cnt, i in enumerate(self._iter_resources('firewall')):
+            count = cnt
+            # Copy the data, it can be shared with other scanners.
+            firewall_data_for_scanner = dict(resource_snapshot.load_data(i))
+            firewall_data_for_scanner['project_id'] = i.parent.name
+            firewall_data_for_scanner['full_name'] = i.full_name
+
+            project_policies[i.parent.name].append(
+                firewall_rule.FirewallRule.from_dict(
+                    firewall_dict=firewall_data_for_scanner,
+                    project_id=i.parent.name,
+                    validate=True))
 
         if count < 0:
             LOGGER.warn('No firewall policies found. Exiting.')
@@ -29,6 +29,7 @@ from google.cloud.forseti.common.gcp_type import (
 from google.cloud.forseti.common.gcp_type import network as network_type
 from google.cloud.forseti.common.gcp_type.resource import ResourceType
 from google.cloud.forseti.common.util import logger
+from google.cloud.forseti.scanner import resource_snapshot
 from google.cloud.forseti.scanner.audit import iap_rules_engine
 from google.cloud.forseti.scanner.scanners import base_scanner
 
@@ -395,8 +396,6 @@ class IapScanner(base_scanner.BaseScanner):
             rules_file_path=self.rules,
             snapshot_timestamp=self.snapshot_timestamp)
         self.rules_engine.build_rule_book(self.global_configs)
-        self.scoped_session, self.data_access = (
-            service_config.model_manager.get(model_name))
 
     @staticmethod
     def _flatten_violations(violations):
@@ -447,155 +446,127 @@ class IapScanner(base_scanner.BaseScanner):
         all_violations = self._flatten_violations(all_violations)
         self._output_results_to_db(all_violations)
 
-    def _get_backend_services(self, parent_type_name):
-        """Retrieves backend services.
+    def _get_resources_by_project(self, resource_type, create):
+        """Retrieves all the resources of a type with a single query.
 
         Args:
-            parent_type_name (str): The parent resource type and name to pull.
+            resource_type (str): The resource type to pull.
+            create (function): Creates the gcp type from the resource and its
+                parsed data.
 
         Returns:
-            list: BackendService
+            dict: The created resources in lists keyed by the type_name of
+                their parent project.
         """
-        backend_services = []
-        with self.scoped_session as session:
-            for backend_service in self.data_access.scanner_iter(
-                    session, 'backendservice',
-                    parent_type_name=parent_type_name):
-                backend_services.append(
-                    backend_service_type.BackendService.from_json(
-                        full_name=backend_service.full_name,
-                        project_id=backend_service.parent.name,
-                        json_string=backend_service.data))
-        return backend_services
-
-    def _get_firewall_rules(self, parent_type_name):
-        """Retrieves firewall rules.
+        resources_by_project = collections.defaultdict(list)
+        for resource in self._iter_resources(resource_type):
+            resources_by_project[resource.parent.type_name].append(
+                create(resource, resource_snapshot.load_data(resource)))
+        return resources_by_project
 
-        Args:
-            parent_type_name (str): The parent resource type and name to pull.
+    def _get_backend_services(self):
+        """Retrieves backend services.
 
         Returns:
-            list: FirewallRule
+            dict: BackendService lists keyed by project type_name.
         """
-        firewall_rules = []
-        with self.scoped_session as session:
-            for firewall_rule in self.data_access.scanner_iter(
-                    session, 'firewall', parent_type_name=parent_type_name):
-                firewall_rules.append(
-                    firewall_rule_type.FirewallRule.from_json(
-                        project_id=firewall_rule.parent.name,
-                        json_string=firewall_rule.data))
-        return firewall_rules
-
-    def _get_instances(self, parent_type_name):
-        """Retrieves instances.
+        return self._get_resources_by_project(
+            'backendservice',
+            lambda resource, data: (
+                backend_service_type.BackendService.from_dict(
+                    full_name=resource.full_name,
+                    project_id=resource.parent.name,
+                    backend_service=data)))
+
+    def _get_firewall_rules(self):
+        """Retrieves firewall rules.
 
-        Args:
-            parent_type_name (str): The parent resource type and name to pull.
+        Returns:
+            dict: FirewallRule lists keyed by project type_name.
+        """
+        return self._get_resources_by_project(
+            'firewall',
+            lambda resource, data: firewall_rule_type.FirewallRule.from_dict(
+                data, project_id=resource.parent.name, validate=True))
+
+    def _get_instances(self):
+        """Retrieves instances.
 
         Returns:
-            list: Instance
+            dict: Instance lists keyed by project type_name.
         """
-        instances = []
-        with self.scoped_session as session:
-            for instance in self.data_access.scanner_iter(
-                    session, 'instance', parent_type_name=parent_type_name):
-                instances.append(
-                    instance_type.Instance.from_json(
-                        full_name='',
-                        project_id=instance.parent.name,
-                        json_string=instance.data))
-        return instances
-
-    def _get_instance_groups(self, parent_type_name):
-        """Retrieves instance groups.
+        return self._get_resources_by_project(
+            'instance',
+            lambda resource, data: instance_type.Instance.from_dict(
+                full_name='', project_id=resource.parent.name,
+                instance=data))
 
-        Args:
-            parent_type_name (str): The parent resource type and name to pull.
+    def _get_instance_groups(self):
+        """Retrieves instance groups.
 
         Returns:
-            list: InstanceGroup
+            dict: InstanceGroup lists keyed by project type_name.
         """
-        instance_groups = []
-        with self.scoped_session as session:
-            for instance_group in self.data_access.scanner_iter(
-                    session, 'instancegroup',
-                    parent_type_name=parent_type_name):
-                instance_groups.append(
-                    instance_group_type.InstanceGroup.from_json(
-                        project_id=instance_group.parent.name,
-                        json_string=instance_group.data))
-        return instance_groups
-
-    def _get_instance_group_managers(self, parent_type_name):
-        """Retrieves instance group managers.
+        return self._get_resources_by_project(
+            'instancegroup',
+            lambda resource, data: instance_group_type.InstanceGroup.from_dict(
+                data, project_id=resource.parent.name))
 
-        Args:
-            parent_type_name (str): The parent resource type and name to pull.
+    def _get_instance_group_managers(self):
+        """Retrieves instance group managers.
 
         Returns:
-            list: InstanceGroupManager
+            dict: InstanceGroupManager lists keyed by project type_name.
         """
-        instance_group_managers = []
-        with self.scoped_session as session:
-            for instance_group_manager in self.data_access.scanner_iter(
-                    session, 'instancegroupmanager',
-                    parent_type_name=parent_type_name):
-                instance_group_managers.append(
-                    instance_group_manager_type.InstanceGroupManager.from_json(
-                        project_id=instance_group_manager.parent.name,
-                        json_string=instance_group_manager.data))
-        return instance_group_managers
-
-    def _get_instance_templates(self, parent_type_name):
-        """Retrieves instance templates.
+        return self._get_resources_by_project(
+            'instancegroupmanager',
+            lambda resource, data: (
+                instance_group_manager_type.InstanceGroupManager.from_dict(
+                    data, project_id=resource.parent.name)))
 
-        Args:
-            parent_type_name (str): The parent resource type and name to pull.
+    def _get_instance_templates(self):
+        """Retrieves instance templates.
 
         Returns:
-            list: InstanceTemplate
+            dict: InstanceTemplate lists keyed by project type_name.
         """
-        instance_templates = []
-        with self.scoped_session as session:
-            for instance_template in self.data_access.scanner_iter(
-                    session, 'instancetemplate',
-                    parent_type_name=parent_type_name):
-                instance_templates.append(
-                    instance_template_type.InstanceTemplate.from_json(
-                        project_id=instance_template.parent.name,
-                        json_string=instance_template.data))
-        return instance_templates
+        return self._get_resources_by_project(
+            'instancetemplate',
+            lambda resource, data: (
+                instance_template_type.InstanceTemplate.from_dict(
+                    data, project_id=resource.parent.name)))
 
     def _retrieve(self):
         """Retrieves the data for the scanner.
 
+        Each resource type is pulled once for the whole model and split by
+        project, instead of querying every type for every project.
+
         Yields:
             list: A list of IAP Resources for a project, to pass to the rules
                 engine
             dict: A dict of resource counts for the project.
         """
-        projects = []
-        with self.scoped_session as session:
-            for project in self.data_access.scanner_iter(session, 'project'):
-                projects.append(project)
+        projects = list(self._iter_resources('project'))
+        all_backend_services = self._get_backend_services()
+        all_firewall_rules = self._get_firewall_rules()
+        all_instances = self._get_instances()
+        all_instance_groups = self._get_instance_groups()
+        all_instance_group_managers = self._get_instance_group_managers()
+        all_instance_templates = self._get_instance_templates()
 
         for parent in projects:
-            backend_services = self._get_backend_services(parent.type_name)
-            firewall_rules = self._get_firewall_rules(parent.type_name)
-            instances = self._get_instances(parent.type_name)
-            instance_groups = self._get_instance_groups(parent.type_name)
-            instance_group_managers = self._get_instance_group_managers(
-                parent.type_name)
-            instance_templates = self._get_instance_templates(parent.type_name)
-
+            # Pop the project resources to release them once scanned.
+            backend_services = all_backend_services.pop(parent.type_name, [])
             run_data = _RunData(
                 backend_services=backend_services,
-                firewall_rules=firewall_rules,
-                instances=instances,
-                instance_groups=instance_groups,
-                instance_group_managers=instance_group_managers,
-                instance_templates=instance_templates)
+                firewall_rules=all_firewall_rules.pop(parent.type_name, []),
+                instances=all_instances.pop(parent.type_name, []),
+                instance_groups=all_instance_groups.pop(parent.type_name, []),
+                instance_group_managers=all_instance_group_managers.pop(
+                    parent.type_name, []),
+                instance_templates=all_instance_templates.pop(
+                    parent.type_name, []))
 
             iap_resources = []
             for backend in backend_services:
@@ -14,10 +14,9 @@
 
 """Scanner for the KE version rules engine."""
 
-import json
-
 from google.cloud.forseti.common.gcp_type.ke_cluster import KeCluster
 from google.cloud.forseti.common.util import logger
+from google.cloud.forseti.scanner import resource_snapshot
 from google.cloud.forseti.scanner.audit import ke_version_rules_engine
 from google.cloud.forseti.scanner.scanners import base_scanner
 
@@ -115,35 +114,40 @@ class KeVersionScanner(base_scanner.BaseScanner):
         Returns:
             list: KE Cluster data.
         """
-        model_manager = self.service_config.model_manager
-        scoped_session, data_access = model_manager.get(self.model_name)
-        with scoped_session as session:
-            ke_clusters = []
-            for ke_cluster in data_access.scanner_iter(
-                    session, 'kubernetes_cluster'):
-                project_id = ke_cluster.parent.name
-                ke_clusters.append(
-                    KeCluster.from_json(project_id,
-                                        None,
-                                        ke_cluster.data,
-                                        ke_cluster.full_name))
-
-        # Retrieve the service config via a separate query because session
-        # in the middle of yield_per() can not support simultaneous queries.
-        with scoped_session as session:
-            for ke_cluster in ke_clusters:
-                position = (
-                    ke_cluster.resource_full_name.find('kubernetes_cluster'))
-                ke_cluster_type_name = (
-                    ke_cluster.resource_full_name[position:][:-1])
-
-                service_config = list(data_access.scanner_iter(
-                    session, 'kubernetes_service_config',
-                    parent_type_name=ke_cluster_type_name))[0]
-                ke_cluster.server_config = json.loads(service_config.data)
-
+        server_configs = self._retrieve_server_configs()
+
+        ke_clusters = []
+        for ke_cluster in self._iter_resources('kubernetes_cluster'):
+            project_id = ke_cluster.parent.name
+            ke_clusters.append(
+                KeCluster.from_dict(project_id,
+                                    server_configs.get(ke_cluster.type_name),
+                                    resource_snapshot.load_data(ke_cluster),
+                                    ke_cluster.full_name))
         return ke_clusters
 
+    def _retrieve_server_configs(self):
+        """Retrieves the server configs of all the clusters in one query.
+
+        The server config is the same for all the clusters of a zone, the
+        identical configs are parsed once and shared by the clusters.
+
+        Returns:
+            dict: The parsed server configs keyed by cluster type_name.
+        """
+        parsed_configs = {}
+        server_configs = {}
+        for service_config in self._iter_resources(
+                'kubernetes_service_config'):
+            server_config = parsed_configs.get(service_config.data)
+            if server_config is None:
+                server_config = resource_snapshot.load_data(service_config)
+                parsed_configs[service_config.data] = server_config
+            server_configs[service_config.parent.type_name] = server_config
+        LOGGER.debug('Retrieved %s server configs, %s distinct.',
+                     len(server_configs), len(parsed_configs))
+        return server_configs
+
     def run(self):
         """Run, the entry point for this scanner."""
         ke_clusters = self._retrieve()
@@ -124,6 +124,42 @@ class AbstractInventoryConfig(dict):
         """
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def get_cai_parse_processes(self):
+        """Returns the number of processes parsing the CAI data dumps.
+
+        Raises:
+            NotImplementedError: Abstract.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_cai_memory_index_mb(self):
+        """Returns the memory cap of the in memory CAI data index.
+
+        Raises:
+            NotImplementedError: Abstract.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_crawler_configs(self):
+        """Returns the settings for the inventory crawler.
+
+        Raises:
+            NotImplementedError: Abstract.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_model_import_processes(self):
+        """Returns the number of processes importing inventories into models.
+
+        Raises:
+            NotImplementedError: Abstract.
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def get_service_config(self):
         """Returns the service config.
@@ -211,6 +247,8 @@ class InventoryConfig(AbstractInventoryConfig):
                  api_quota_configs,
                  retention_days,
                  cai_configs,
+                 crawler_configs=None,
+                 model_import_processes=0,
                  *args,
                  **kwargs):
         """Initialize.
@@ -221,6 +259,9 @@ class InventoryConfig(AbstractInventoryConfig):
             api_quota_configs (dict): API quota configs
             retention_days (int): Days of inventory tables to retain
             cai_configs (dict): Settings for the Cloud AssetInventory API
+            crawler_configs (dict): Settings for the inventory crawler
+            model_import_processes (int): Number of worker processes
+                converting the resources of an inventory imported into a model
             *args: args when creating InventoryConfig
             **kwargs: kwargs when creating InventoryConfig
         """
@@ -232,6 +273,10 @@ class InventoryConfig(AbstractInventoryConfig):
         self.retention_days = retention_days
         self.cai_gcs_path = cai_configs.get('gcs_path', '')
         self.cai_enabled = _validate_cai_enabled(root_resource_id, cai_configs)
+        self.cai_parse_processes = cai_configs.get('parse_processes', 0)
+        self.cai_memory_index_mb = cai_configs.get('memory_index_mb', 0)
+        self.crawler_configs = crawler_configs or {}
+        self.model_import_processes = model_import_processes
 
     def get_root_resource_id(self):
         """Return the configured root resource id.
@@ -281,6 +326,38 @@ class InventoryConfig(AbstractInventoryConfig):
         """
         return self.cai_gcs_path
 
+    def get_cai_parse_processes(self):
+        """Returns the number of processes parsing the CAI data dumps.
+
+        Returns:
+            int: The number of parse processes, 0 to parse in the server.
+        """
+        return self.cai_parse_processes
+
+    def get_cai_memory_index_mb(self):
+        """Returns the memory cap of the in memory CAI data index.
+
+        Returns:
+            int: The cap in MB, 0 to query the CAI data in the database.
+        """
+        return self.cai_memory_index_mb
+
+    def get_crawler_configs(self):
+        """Returns the settings for the inventory crawler.
+
+        Returns:
+            dict: The inventory crawler configurations.
+        """
+        return self.crawler_configs
+
+    def get_model_import_processes(self):
+        """Returns the number of processes importing inventories into models.
+
+        Returns:
+            int: The number of worker processes, 0 to import in the server.
+        """
+        return self.model_import_processes
+
     def get_service_config(self):
         """Return the attached service configuration.
 
@@ -319,6 +396,7 @@ class ServiceConfig(AbstractServiceConfig):
         self.engine = create_engine(forseti_db_connect_string,
                                     pool_recycle=3600)
         self.model_manager = ModelManager(self.engine)
+        self.model_manager.warm_up()
         self.sessionmaker = db.create_scoped_sessionmaker(self.engine)
         self.endpoint = endpoint
 
@@ -392,6 +470,8 @@ class ServiceConfig(AbstractServiceConfig):
                 forseti_inventory_config.get('retention_days', -1),
                 # Default to disable CloudAsset Inventory if not configured.
                 forseti_inventory_config.get('cai', {'enabled': False}),
+                forseti_inventory_config.get('crawler', {}),
+                forseti_inventory_config.get('model_import_processes', 0),
             )
 
             # TODO: Create Config classes to store scanner and notifier configs.
@@ -24,6 +24,7 @@ from google.protobuf.json_format import MessageToJson
 
 from google.cloud.forseti.services import client as iam_client
 from google.cloud.forseti.services.client import ModelNotSetError
+from google.cloud.forseti.services.explain import explain_pb2
 from google.cloud.forseti.common.util import file_loader
 from google.cloud.forseti.common.util import logger
 
@@ -854,6 +855,22 @@ def run_inventory(client, config, output, _):
     actions[config.action]()
 
 
+def merge_pages(pages, reply):
+    """Merge the pages of a streamed listing into a single reply.
+
+    Args:
+        pages (iter): the streamed replies, one per page.
+        reply (object): the empty reply to merge the pages into.
+
+    Returns:
+        object: the reply listing the names of all pages, empty if no page
+            arrived.
+    """
+    for page in pages:
+        reply.MergeFrom(page)
+    return reply
+
+
 def run_explainer(client, config, output, _):
     """Run explain commands.
         Args:
@@ -867,17 +884,20 @@ def run_explainer(client, config, output, _):
 
     def do_list_resources():
         """List resources by prefix"""
-        result = client.list_resources(config.prefix)
+        result = merge_pages(client.stream_resources(config.prefix),
+                             explain_pb2.ListResourcesReply())
         output.write(result)
 
     def do_list_members():
         """List resources by prefix"""
-        result = client.list_members(config.prefix)
+        result = merge_pages(client.stream_members(config.prefix),
+                             explain_pb2.ListGroupMembersReply())
         output.write(result)
 
     def do_list_roles():
         """List roles by prefix"""
-        result = client.list_roles(config.prefix)
+        result = merge_pages(client.stream_roles(config.prefix),
+                             explain_pb2.ListRolesReply())
         output.write(result)
 
     def do_list_permissions():
@@ -463,11 +463,14 @@ class ExplainClient(ForsetiClient):
         return self.stub.Ping(explain_pb2.PingRequest(data=data)).data == data
 
     @require_model
-    def list_resources(self, resource_name_prefix):
+    def list_resources(self, resource_name_prefix, page_token='',
+                       page_size=0):
         """List resources by name prefix.
 
         Args:
             resource_name_prefix (str): the prefix of resource_name to query
+            page_token (str): the next_page_token of the previous page
+            page_size (int): the maximum number of resources, 0 for all
 
         Returns:
             proto: the returned proto message of list_resources
@@ -475,15 +478,38 @@ class ExplainClient(ForsetiClient):
 
         return self.stub.ListResources(
             explain_pb2.ListResourcesRequest(
-                prefix=resource_name_prefix),
+                prefix=resource_name_prefix,
+                page_token=page_token,
+                page_size=page_size),
             metadata=self.metadata())
 
     @require_model
-    def list_members(self, member_name_prefix):
+    def stream_resources(self, resource_name_prefix, page_size=0):
+        """Stream resources by name prefix, page by page.
+
+        Args:
+            resource_name_prefix (str): the prefix of resource_name to query
+            page_size (int): the number of resources in a page, 0 for the
+                server default
+
+        Returns:
+            iter: the returned proto messages of list_resources
+        """
+
+        return self.stub.StreamResources(
+            explain_pb2.ListResourcesRequest(
+                prefix=resource_name_prefix,
+                page_size=page_size),
+            metadata=self.metadata())
+
+    @require_model
+    def list_members(self, member_name_prefix, page_token='', page_size=0):
         """List members by prefix.
 
         Args:
             member_name_prefix (str): the prefix of member_name to query
+            page_token (str): the next_page_token of the previous page
+            page_size (int): the maximum number of members, 0 for all
 
         Returns:
             proto: the returned proto message of list_members
@@ -491,15 +517,38 @@ class ExplainClient(ForsetiClient):
 
         return self.stub.ListGroupMembers(
             explain_pb2.ListGroupMembersRequest(
-                prefix=member_name_prefix),
+                prefix=member_name_prefix,
+                page_token=page_token,
+                page_size=page_size),
+            metadata=self.metadata())
+
+    @require_model
+    def stream_members(self, member_name_prefix, page_size=0):
+        """Stream members by prefix, page by page.
+
+        Args:
+            member_name_prefix (str): the prefix of member_name to query
+            page_size (int): the number of members in a page, 0 for the
+                server default
+
+        Returns:
+            iter: the returned proto messages of list_members
+        """
+
+        return self.stub.StreamGroupMembers(
+            explain_pb2.ListGroupMembersRequest(
+                prefix=member_name_prefix,
+                page_size=page_size),
             metadata=self.metadata())
 
     @require_model
-    def list_roles(self, role_name_prefix):
+    def list_roles(self, role_name_prefix, page_token='', page_size=0):
         """List roles by prefix, can be empty.
 
         Args:
             role_name_prefix (str): the prefix of role_name to query
+            page_token (str): the next_page_token of the previous page
+            page_size (int): the maximum number of roles, 0 for all
 
         Returns:
             proto: the returned proto message of list_roles
@@ -507,7 +556,28 @@ class ExplainClient(ForsetiClient):
 
         return self.stub.ListRoles(
             explain_pb2.ListRolesRequest(
-                prefix=role_name_prefix),
+                prefix=role_name_prefix,
+                page_token=page_token,
+                page_size=page_size),
+            metadata=self.metadata())
+
+    @require_model
+    def stream_roles(self, role_name_prefix, page_size=0):
+        """Stream roles by prefix, page by page.
+
+        Args:
+            role_name_prefix (str): the prefix of role_name to query
+            page_size (int): the number of roles in a page, 0 for the server
+                default
+
+        Returns:
+            iter: the returned proto messages of list_roles
+        """
+
+        return self.stub.StreamRoles(
+            explain_pb2.ListRolesRequest(
+                prefix=role_name_prefix,
+                page_size=page_size),
             metadata=self.metadata())
 
     @require_model
@@ -547,6 +617,27 @@ class ExplainClient(ForsetiClient):
                 identity=member_name),
             metadata=self.metadata())
 
+    @require_model
+    def check_iam_policies(self, checks):
+        """Check access via IAM policy for many triples in one stream.
+
+        Args:
+            checks (iter): (full_resource_name, permission_name, member_name)
+                triples to check
+
+        Returns:
+            iter: the returned proto messages of check_iam_policy, in the
+                order of the checks
+        """
+
+        return self.stub.CheckIamPolicies(
+            (explain_pb2.CheckIamPolicyRequest(
+                resource=full_resource_name,
+                permission=permission_name,
+                identity=member_name)
+             for full_resource_name, permission_name, member_name in checks),
+            metadata=self.metadata())
+
     @require_model
     def explain_denied(self, member_name, resource_names, roles=None,
                        permission_names=None):
@@ -27,6 +27,7 @@ from threading import Lock
 
 from sqlalchemy import Column
 from sqlalchemy import event
+from sqlalchemy import inspect
 from sqlalchemy import Integer
 from sqlalchemy import Boolean
 from sqlalchemy import String
@@ -44,14 +45,17 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import reconstructor
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import bindparam
 from sqlalchemy.sql import select
 from sqlalchemy.sql import union
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateColumn
 
 from google.cloud.forseti.common.util import date_time
 from google.cloud.forseti.services.utils import mutual_exclusive
 from google.cloud.forseti.services.utils import to_full_resource_name
 from google.cloud.forseti.services import db
+from google.cloud.forseti.services.explain import authz_index
 from google.cloud.forseti.services.utils import get_sql_dialect
 from google.cloud.forseti.common.util import logger
 
@@ -60,6 +64,11 @@ LOGGER = logger.get_logger(__name__)
 
 POOL_RECYCLE_SECONDS = 300
 PER_YIELD = 1024
+# Number of group in group rows inserted at once by the in memory
+# denormalization.
+DENORM_INSERT_ROWS = 10000
+# Number of resource intervals updated at once.
+RESOURCE_INTERVAL_ROWS = 10000
 
 
 def generate_model_handle():
@@ -82,6 +91,203 @@ def generate_model_seed():
     return binascii.hexlify(os.urandom(16))
 
 
+def _strongly_connected_components(children):
+    """Find the strongly connected components of a graph.
+
+    Iterative version of Tarjan's algorithm, deep group nesting must not hit
+    the recursion limit.
+
+    Args:
+        children (list): The child node numbers of each node number.
+
+    Returns:
+        list: The lists of node numbers of each component, in reverse
+            topological order: a component comes after all components
+            reachable from it.
+    """
+    order = [-1] * len(children)
+    low = [0] * len(children)
+    on_stack = [False] * len(children)
+    stack = []
+    components = []
+    counter = 0
+    for root in range(len(children)):
+        if order[root] >= 0:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, position = work.pop()
+            if not position:
+                order[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            else:
+                # Returning from the child at position - 1.
+                low[node] = min(low[node], low[children[node][position - 1]])
+
+            descended = False
+            while position < len(children[node]):
+                child = children[node][position]
+                position += 1
+                if order[child] < 0:
+                    work.append((node, position))
+                    work.append((child, 0))
+                    descended = True
+                    break
+                elif on_stack[child]:
+                    low[node] = min(low[node], order[child])
+            if descended:
+                continue
+
+            if low[node] == order[node]:
+                component = []
+                member = None
+                while member != node:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                components.append(component)
+    return components
+
+
+def group_closure(edges):
+    """Compute the transitive closure of the group in group relation.
+
+    The groups are condensed into their strongly connected components, the
+    groups reachable from each component are then propagated as sets, from
+    the innermost components outwards, so the work is proportional to the
+    size of the closure. A set is released once all the components above it
+    are done. A group is a member of itself only if it is part of a
+    membership cycle.
+
+    Args:
+        edges (iterable): The (parent, member) group name pairs.
+
+    Yields:
+        tuple: The (parent, member) group name pairs of the closure.
+    """
+    names = []
+    numbers = {}
+    children = []
+    for parent, member in edges:
+        for name in (parent, member):
+            if name not in numbers:
+                numbers[name] = len(names)
+                names.append(name)
+                children.append([])
+        children[numbers[parent]].append(numbers[member])
+
+    components = _strongly_connected_components(children)
+    component_of = [0] * len(names)
+    for index, component in enumerate(components):
+        for node in component:
+            component_of[node] = index
+
+    # The number of other components with an edge to each component.
+    parent_counts = [0] * len(components)
+    child_components = []
+    for index, component in enumerate(components):
+        child_indexes = set(component_of[child]
+                            for node in component
+                            for child in children[node]) - set([index])
+        for child_index in child_indexes:
+            parent_counts[child_index] += 1
+        child_components.append(child_indexes)
+
+    reachable = []
+    for index, component in enumerate(components):
+        members = set()
+        for node in component:
+            for child in children[node]:
+                child_index = component_of[child]
+                if child_index == index:
+                    members.update(component)
+                else:
+                    members.update(reachable[child_index])
+                    members.add(child)
+        if len(component) > 1:
+            members.update(component)
+        reachable.append(members)
+
+        for child_index in child_components[index]:
+            parent_counts[child_index] -= 1
+            if not parent_counts[child_index]:
+                reachable[child_index] = None
+
+        if members:
+            member_names = [names[member] for member in sorted(members)]
+            for node in component:
+                for member in member_names:
+                    yield names[node], member
+        if not parent_counts[index]:
+            reachable[index] = None
+
+
+def resource_intervals(parents):
+    """Number a resource tree in pre-order.
+
+    Each resource gets an interval (left, right) where left is its pre-order
+    number and right the largest pre-order number of its descendants, so the
+    descendants of a resource are the resources whose left is within its
+    interval. Resources not reachable from a root are not numbered.
+
+    Args:
+        parents (iterable): The (type_name, parent_type_name) pairs, the
+            parent is None for roots.
+
+    Yields:
+        tuple: The (type_name, left, right) intervals.
+    """
+    children = collections.defaultdict(list)
+    type_names = set()
+    for type_name, parent_type_name in parents:
+        type_names.add(type_name)
+        children[parent_type_name].append(type_name)
+
+    roots = [type_name
+             for parent_type_name, names in children.iteritems()
+             if parent_type_name is None or parent_type_name not in type_names
+             for type_name in names]
+
+    counter = 0
+    lefts = {}
+    to_visit = [(type_name, False) for type_name in sorted(roots, reverse=True)]
+    while to_visit:
+        type_name, visited = to_visit.pop()
+        if visited:
+            yield type_name, lefts.pop(type_name), counter - 1
+            continue
+        lefts[type_name] = counter
+        counter += 1
+        to_visit.append((type_name, True))
+        to_visit.extend((child, False)
+                        for child in sorted(children[type_name], reverse=True))
+
+
+def _keyset_page(query, key, after, limit):
+    """Restrict a query to a page of rows ordered by a unique key.
+
+    Args:
+        query (object): The query to restrict.
+        key (object): The unique column to order the rows by.
+        after (str): If set, only rows with a greater key are selected.
+        limit (int): If set, the maximum number of rows selected.
+
+    Returns:
+        object: The restricted query, the query itself if neither after nor
+            limit is set.
+    """
+    if after is None and not limit:
+        return query
+    if after is not None:
+        query = query.filter(key > after)
+    query = query.order_by(key)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
 MODEL_BASE = declarative_base()
 
 
@@ -199,6 +405,33 @@ class Model(MODEL_BASE):
             self.name, self.handle, self.state)
 
 
+def _add_missing_columns(dbengine, table):
+    """Add the columns missing from a table created by an older version.
+
+    The added columns are NULL in the existing rows, their indexes are
+    created too.
+
+    Args:
+        dbengine (object): db engine
+        table (Table): The table as defined by this version.
+    """
+    existing = set(column['name'] for column in
+                   inspect(dbengine).get_columns(table.name))
+    added = set()
+    table_name = dbengine.dialect.identifier_preparer.format_table(table)
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        LOGGER.info('Adding column %s to table %s.', column.name, table.name)
+        dbengine.execute('ALTER TABLE {} ADD COLUMN {}'.format(
+            table_name, CreateColumn(column).compile(dialect=dbengine.dialect)))
+        added.add(column.name)
+
+    for index in table.indexes:
+        if added.intersection(column.name for column in index.columns):
+            index.create(dbengine)
+
+
 # pylint: disable=too-many-locals,no-member
 def define_model(model_name, dbengine, model_seed):
     """Defines table classes which point to the corresponding model.
@@ -295,6 +528,10 @@ def define_model(model_name, dbengine, model_seed):
         display_name = Column(String(256), default='')
         email = Column(String(256), default='')
         data = Column(Text(16777215))
+        # Pre-order interval of the resource in the tree, see
+        # resource_intervals. Unset for resources added after the import.
+        tree_left = Column(Integer, index=True)
+        tree_right = Column(Integer)
 
         parent = relationship('Resource', remote_side=[type_name])
         bindings = relationship('Binding', back_populates='resource')
@@ -461,6 +698,8 @@ def define_model(model_name, dbengine, model_seed):
         TBL_ROLE = Role
         TBL_RESOURCE = Resource
         TBL_MEMBERSHIP = group_members
+        TBL_BINDING_MEMBERS = binding_members
+        TBL_ROLE_PERMISSIONS = role_permissions
 
         @classmethod
         def delete_all(cls, engine):
@@ -582,6 +821,106 @@ def define_model(model_name, dbengine, model_seed):
                 session.commit()
             return iterations
 
+        @classmethod
+        def denorm_group_in_group_in_memory(cls, session):
+            """Denormalize group-in-group relation in memory.
+
+            Fills the GroupInGroup table with the same rows as
+            denorm_group_in_group. The group memberships are read once, the
+            closure is computed in memory by group_closure and inserted in
+            bulk, instead of self joining the table once per nesting level.
+
+            Args:
+                session (object): Database session to use.
+
+            Returns:
+                int: Number of rows inserted.
+
+            Raises:
+                Exception: dernomalize fail
+            """
+
+            edges = session.execute(
+                select([group_members.c.group_name,
+                        group_members.c.members_name])
+                .where(group_members.c.group_name.startswith('group/'))
+                .where(group_members.c.members_name.startswith('group/'))
+            ).fetchall()
+
+            num_rows = 0
+            try:
+                session.execute(GroupInGroup.__table__.delete())
+
+                rows = []
+                for parent, member in group_closure(edges):
+                    rows.append({'parent': parent, 'member': member})
+                    if len(rows) >= DENORM_INSERT_ROWS:
+                        session.execute(GroupInGroup.__table__.insert(), rows)
+                        num_rows += len(rows)
+                        rows = []
+                if rows:
+                    session.execute(GroupInGroup.__table__.insert(), rows)
+                    num_rows += len(rows)
+            except Exception as e:
+                LOGGER.exception(e)
+                session.rollback()
+                raise
+            finally:
+                session.commit()
+            return num_rows
+
+        @classmethod
+        def number_resources(cls, session):
+            """Store the pre-order interval of each resource.
+
+            Once all resources are numbered, the descendants of a resource
+            are found with an indexed range predicate on tree_left instead of
+            a prefix match on the full name.
+
+            Args:
+                session (object): Database session to use.
+
+            Returns:
+                int: Number of resources numbered.
+            """
+
+            resources = Resource.__table__
+            update = (resources.update()
+                      .where(resources.c.type_name == bindparam('key'))
+                      .values(tree_left=bindparam('left'),
+                              tree_right=bindparam('right')))
+            parents = session.query(Resource.type_name,
+                                    Resource.parent_type_name).all()
+
+            num_rows = 0
+            rows = []
+            for type_name, left, right in resource_intervals(parents):
+                rows.append({'key': type_name, 'left': left, 'right': right})
+                if len(rows) >= RESOURCE_INTERVAL_ROWS:
+                    session.execute(update, rows)
+                    num_rows += len(rows)
+                    rows = []
+            if rows:
+                session.execute(update, rows)
+                num_rows += len(rows)
+            session.commit()
+            return num_rows
+
+        @classmethod
+        def resources_numbered(cls, session):
+            """Whether all resources have a pre-order interval.
+
+            Args:
+                session (object): Database session to use.
+
+            Returns:
+                bool: True if the intervals can be used for descendants.
+            """
+
+            return (session.query(Resource.type_name)
+                    .filter(Resource.tree_left.is_(None))
+                    .first() is None)
+
         @classmethod
         def explain_granted(cls, session, member_name, resource_type_name,
                             role, permission):
@@ -896,12 +1235,17 @@ def define_model(model_name, dbengine, model_seed):
 
             if expand_resources:
                 expanded_resources = aliased(Resource)
+                if cls.resources_numbered(session):
+                    descendant = expanded_resources.tree_left.between(
+                        Resource.tree_left, Resource.tree_right)
+                else:
+                    descendant = expanded_resources.full_name.startswith(
+                        Resource.full_name)
                 qry = (
                     session.query(expanded_resources, Binding, Member)
                     .filter(binding_members.c.bindings_id == Binding.id)
                     .filter(binding_members.c.members_name == Member.name)
-                    .filter(expanded_resources.full_name.startswith(
-                        Resource.full_name))
+                    .filter(descendant)
                     .filter((Resource.type_name ==
                              Binding.resource_type_name))
                     .filter(Binding.role_name.in_(role_names))
@@ -1202,19 +1546,89 @@ def define_model(model_name, dbengine, model_seed):
                     .filter(Member.name.in_(member_names)).first() is not None)
 
         @classmethod
-        def list_roles_by_prefix(cls, session, role_prefix):
+        def check_iam_policies(cls, session, checks):
+            """Check access for many (resource, permission, member) triples.
+
+            Each distinct member and resource is expanded once, and the
+            members granted a permission on a resource are queried once.
+
+            Args:
+                session (object): db session
+                checks (list): (resource_type_name, permission_name,
+                    member_name) triples to check
+
+            Returns:
+                list: whether each access is allowed, in the order of the
+                    checks
+
+            Raises:
+                Exception: member or resource not found
+            """
+
+            expanded_members = {}
+            resource_paths = {}
+            granted_members = {}
+            results = []
+            for resource_type_name, permission_name, member_name in checks:
+                if member_name not in expanded_members:
+                    member_names = set(m.name for m in
+                                       cls.reverse_expand_members(
+                                           session,
+                                           [member_name]))
+                    if not member_names:
+                        error_message = 'Member not found: {}'.format(
+                            member_name)
+                        LOGGER.error(error_message)
+                        raise Exception(error_message)
+                    expanded_members[member_name] = member_names
+
+                if resource_type_name not in resource_paths:
+                    resource_type_names = [
+                        r.type_name for r in cls.find_resource_path(
+                            session,
+                            resource_type_name)]
+                    if not resource_type_names:
+                        error_message = 'Resource not found: {}'.format(
+                            resource_type_name)
+                        LOGGER.error(error_message)
+                        raise Exception(error_message)
+                    resource_paths[resource_type_name] = resource_type_names
+
+                key = (resource_type_name, permission_name)
+                if key not in granted_members:
+                    qry = (session.query(Member.name)
+                           .select_from(Binding)
+                           .join(binding_members).join(Member)
+                           .join(Role).join(role_permissions).join(Permission)
+                           .filter(Permission.name == permission_name)
+                           .filter(Binding.resource_type_name.in_(
+                               resource_paths[resource_type_name])))
+                    granted_members[key] = set(name for name, in qry.all())
+
+                results.append(not expanded_members[member_name].isdisjoint(
+                    granted_members[key]))
+            return results
+
+        @classmethod
+        def list_roles_by_prefix(cls, session, role_prefix, after=None,
+                                 limit=None):
             """Provides a list of roles matched via name prefix.
 
             Args:
                 session (object): db session
                 role_prefix (str): prefix of the role_name
+                after (str): if set, only list roles ordered after this
+                    role_name
+                limit (int): if set, the maximum number of roles to list
 
             Returns:
                 list: list of role_names that match the query
             """
 
-            return [r.name for r in session.query(Role).filter(
-                Role.name.startswith(role_prefix)).all()]
+            qry = session.query(Role.name).filter(
+                Role.name.startswith(role_prefix))
+            qry = _keyset_page(qry, Role.name, after, limit)
+            return [name for name, in qry.all()]
 
         @classmethod
         def add_role_by_name(cls, session, role_name, permission_names):
@@ -1273,19 +1687,25 @@ def define_model(model_name, dbengine, model_seed):
             session.commit()
 
         @classmethod
-        def list_group_members(cls, session, member_name_prefix):
+        def list_group_members(cls, session, member_name_prefix, after=None,
+                               limit=None):
             """Returns members filtered by prefix.
 
             Args:
                 session (object): db session
                 member_name_prefix (str): the prefix of the member_name
+                after (str): if set, only list members ordered after this
+                    name
+                limit (int): if set, the maximum number of members to list
 
             Returns:
                 list: list of Members that match the query
             """
 
-            return [m.name for m in session.query(Member).filter(
-                Member.member_name.startswith(member_name_prefix)).all()]
+            qry = session.query(Member.name).filter(
+                Member.member_name.startswith(member_name_prefix))
+            qry = _keyset_page(qry, Member.name, after, limit)
+            return [name for name, in qry.all()]
 
         @classmethod
         def iter_groups(cls, session):
@@ -1308,7 +1728,9 @@ def define_model(model_name, dbengine, model_seed):
                                      full_resource_name_prefix=None,
                                      type_name_prefix=None,
                                      type_prefix=None,
-                                     name_prefix=None):
+                                     name_prefix=None,
+                                     after=None,
+                                     limit=None):
             """Returns iterator to resources filtered by prefix.
 
             Args:
@@ -1318,6 +1740,9 @@ def define_model(model_name, dbengine, model_seed):
                 type_name_prefix (str): the prefix of the type_name
                 type_prefix (str): the prefix of the type
                 name_prefix (ste): the prefix of the name
+                after (str): if set, only list resources ordered after this
+                    type_name
+                limit (int): if set, the maximum number of resources to list
 
             Yields:
                 Resource: that match the query
@@ -1347,6 +1772,7 @@ def define_model(model_name, dbengine, model_seed):
             if name_prefix:
                 qry = qry.filter(Resource.name.startswith(
                     name_prefix))
+            qry = _keyset_page(qry, Resource.type_name, after, limit)
 
             for resource in qry.yield_per(1024):
                 yield resource
@@ -1357,7 +1783,9 @@ def define_model(model_name, dbengine, model_seed):
                                      full_resource_name_prefix=None,
                                      type_name_prefix=None,
                                      type_prefix=None,
-                                     name_prefix=None):
+                                     name_prefix=None,
+                                     after=None,
+                                     limit=None):
             """Returns resources filtered by prefix.
 
             Args:
@@ -1367,6 +1795,9 @@ def define_model(model_name, dbengine, model_seed):
                 type_name_prefix (str): the prefix of the type_name
                 type_prefix (str): the prefix of the type
                 name_prefix (ste): the prefix of the name
+                after (str): if set, only list resources ordered after this
+                    type_name
+                limit (int): if set, the maximum number of resources to list
 
             Returns:
                 list: list of Resources match the query
@@ -1379,7 +1810,9 @@ def define_model(model_name, dbengine, model_seed):
                                              full_resource_name_prefix,
                                              type_name_prefix,
                                              type_prefix,
-                                             name_prefix))
+                                             name_prefix,
+                                             after,
+                                             limit))
 
         @classmethod
         def add_resource_by_name(cls,
@@ -1569,11 +2002,17 @@ def define_model(model_name, dbengine, model_seed):
                 expressions.append(and_(
                     res_key.type_name == res_type_name))
 
+            if cls.resources_numbered(session):
+                descendant = res_values.tree_left.between(
+                    res_key.tree_left, res_key.tree_right)
+            else:
+                descendant = res_values.full_name.startswith(
+                    res_key.full_name)
+
             res = (
                 session.query(res_key, res_values)
                 .filter(res_key.type_name.in_(res_type_names))
-                .filter(res_values.full_name.startswith(
-                    res_key.full_name))
+                .filter(descendant)
                 .yield_per(1024)
             )
 
@@ -1930,6 +2369,9 @@ def define_model(model_name, dbengine, model_seed):
             return session.query(Member).filter(Member.name == name).all()
 
     base.metadata.create_all(dbengine)
+    # Models built before the resource intervals lack their columns, they
+    # then use the full name prefix expansion until renumbered.
+    _add_missing_columns(dbengine, Resource.__table__)
     return sessionmaker(bind=dbengine), ModelAccess
 
 
@@ -1946,6 +2388,8 @@ def undefine_model(session_maker, data_access):
 
 
 LOCK = Lock()
+# Number of recent models whose session makers are defined on server start.
+WARM_MODELS = 5
 
 
 class ModelManager(object):
@@ -1963,7 +2407,15 @@ class ModelManager(object):
         """
         self.engine = dbengine
         self.modelmaker = self._create_model_session()
+        # Session makers by model handle, this is the cache of the models
+        # known to exist, updated by create and delete.
         self.sessionmakers = {}
+        self.sessionmakers_lock = Lock()
+        # Cache hits do not take sessionmakers_lock, which is held while a
+        # missing model is defined, the counters have their own lock.
+        self.cache_stats_lock = Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _create_model_session(self):
         """Create a session to read from the models table.
@@ -2031,6 +2483,9 @@ class ModelManager(object):
     def _get(self, handle):
         """Get model data by name internal.
 
+        Session makers of known models are served from the cache, only
+        unknown handles are looked up in the database.
+
         Args:
             handle (str): the model handle
 
@@ -2041,26 +2496,89 @@ class ModelManager(object):
             KeyError: model handle not available
         """
 
-        if handle not in [m.handle for m in self.models()]:
-            error_message = 'handle={}, available={}'.format(
-                handle,
-                [m.handle for m in self.models()]
-            )
-            LOGGER.error(error_message)
-            raise KeyError(error_message)
-        try:
-            return self.sessionmakers[handle]
-        except KeyError:
+        sessionmaker = self.sessionmakers.get(handle)
+        if sessionmaker:
+            self._count_cache_lookup(hit=True)
+            return sessionmaker
+
+        with self.sessionmakers_lock:
+            sessionmaker = self.sessionmakers.get(handle)
+            if sessionmaker:
+                self._count_cache_lookup(hit=True)
+                return sessionmaker
+            self._count_cache_lookup(hit=False)
+
             LOGGER.debug('Sessionmakers doesn\'t contain handle = %s,'
                          ' creating a new handle.', handle)
             with self.modelmaker() as session:
                 model = (
-                    session.query(Model).filter(Model.handle == handle).one()
+                    session.query(Model).filter(Model.handle == handle).first()
                 )
+                if model is None:
+                    error_message = 'handle={}, available={}'.format(
+                        handle,
+                        [m.handle for m in session.query(Model).all()]
+                    )
+                    LOGGER.error(error_message)
+                    raise KeyError(error_message)
                 self.sessionmakers[model.handle] = define_model(
                     model.handle, self.engine, model.etag_seed)
                 return self.sessionmakers[model.handle]
 
+    def _count_cache_lookup(self, hit):
+        """Count a model cache lookup.
+
+        Args:
+            hit (bool): Whether the model was found in the cache.
+        """
+
+        with self.cache_stats_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def warm_up(self, max_models=WARM_MODELS):
+        """Define the session makers of the most recent complete models.
+
+        Args:
+            max_models (int): Maximum number of models to define.
+
+        Returns:
+            int: Number of session makers defined.
+        """
+
+        with self.modelmaker() as session:
+            handles = [
+                handle for handle, in
+                session.query(Model.handle)
+                .filter(Model.state.in_(['SUCCESS', 'PARTIAL_SUCCESS']))
+                .order_by(Model.created_at_datetime.desc())
+                .limit(max_models)]
+
+        num_defined = 0
+        for handle in handles:
+            try:
+                self._get(handle)
+                num_defined += 1
+            except Exception as e:  # pylint: disable=broad-except
+                LOGGER.warn('Unable to define model %s: %s', handle, e)
+        return num_defined
+
+    def cache_stats(self):
+        """Get the model cache counters.
+
+        Returns:
+            dict: The number of cached models, of cache hits and of misses.
+        """
+
+        with self.cache_stats_lock:
+            return {
+                'models': len(self.sessionmakers),
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+            }
+
     @mutual_exclusive(LOCK)
     def delete(self, model_name):
         """Delete a model entry in the database by name.
@@ -2071,11 +2589,11 @@ class ModelManager(object):
 
         LOGGER.info('Deleting model by name, model_name = %s', model_name)
         _, data_access = self._get(model_name)
-        if model_name in self.sessionmakers:
-            del self.sessionmakers[model_name]
+        self.sessionmakers.pop(model_name, None)
         with self.modelmaker() as session:
             session.query(Model).filter(Model.handle == model_name).delete()
         data_access.delete_all(self.engine)
+        authz_index.remove(model_name)
 
     def _models(self, expunge=False):
         """Return the list of models from the database.
@@ -0,0 +1,661 @@
+# Copyright 2018 The Forseti Security Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compiled, memory mapped authorization index of a model.
+
+The index holds the member to parent group graph, the resource hierarchy,
+the role permissions and the bindings of a model as sorted string tables
+and compressed sparse row arrays of 32 bit integers, in a single file.
+The file is memory mapped read only, so the explain queries are answered
+without touching the database and all processes of the server share the
+same pages.
+"""
+
+import array
+import collections
+import mmap
+import os
+import struct
+import tempfile
+
+from sqlalchemy.sql import select
+
+from google.cloud.forseti.common.util import logger
+
+LOGGER = logger.get_logger(__name__)
+
+MAGIC = 'FAZ1'
+
+# Value of the resource parent array for resources without a parent.
+NO_PARENT = 0xFFFFFFFF
+
+# The sections of the index file, in the order they are stored in.
+SECTIONS = [
+    'member_offsets', 'member_names',
+    'member_parent_offsets', 'member_parents',
+    'resource_offsets', 'resource_names',
+    'resource_parents',
+    'role_offsets', 'role_names',
+    'role_permission_offsets', 'role_permissions',
+    'permission_offsets', 'permission_names',
+    'permission_role_offsets', 'permission_roles',
+    'resource_binding_offsets', 'resource_bindings',
+    'binding_roles', 'binding_resources',
+    'binding_member_offsets', 'binding_members',
+    'member_binding_offsets', 'member_bindings',
+]
+
+HEADER = struct.Struct('<4sI{}Q'.format(2 * len(SECTIONS)))
+
+UINT = struct.Struct('I')
+
+
+def index_path(model_handle):
+    """Returns the path of the index file of a model.
+
+    Args:
+        model_handle (str): The handle of the model.
+
+    Returns:
+        str: The index file path.
+    """
+    return os.path.join(tempfile.gettempdir(), 'forseti-explain',
+                        '{}.authz'.format(model_handle))
+
+
+def remove(model_handle):
+    """Remove the index file of a model, if it was built.
+
+    Processes that still map the file keep their pages until they close it.
+
+    Args:
+        model_handle (str): The handle of the model.
+    """
+    try:
+        os.unlink(index_path(model_handle))
+    except OSError:
+        pass
+
+
+def _uint_array(values=()):
+    """Create an array of 32 bit unsigned integers.
+
+    Args:
+        values (iterable): The initial values.
+
+    Returns:
+        array.array: The array.
+    """
+    return array.array('I', values)
+
+
+def _string_table(names):
+    """Serialize a sorted string table.
+
+    Args:
+        names (list): The sorted utf-8 encoded names.
+
+    Returns:
+        tuple: The offsets and the names sections.
+    """
+    offsets = _uint_array([0])
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+    return offsets.tostring(), ''.join(names)
+
+
+def _csr(rows):
+    """Serialize a list of integer lists as compressed sparse rows.
+
+    Args:
+        rows (list): The integer list of each row.
+
+    Returns:
+        tuple: The offsets and the values sections.
+    """
+    offsets = _uint_array([0])
+    values = _uint_array()
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return offsets.tostring(), values.tostring()
+
+
+def _encode(name):
+    """Encode a name for the string tables.
+
+    Args:
+        name (unicode): The name.
+
+    Returns:
+        str: The utf-8 encoded name.
+    """
+    if isinstance(name, unicode):
+        return name.encode('utf-8')
+    return name
+
+
+def build(session, data_access, path):
+    """Compile the authorization index of a model.
+
+    The file is written next to its final path and renamed, readers never
+    see a partial index.
+
+    Args:
+        session (object): Database session of the model.
+        data_access (object): The ModelAccess of the model.
+        path (str): The index file path.
+    """
+    member_names = sorted(_encode(name) for name, in session.execute(
+        select([data_access.TBL_MEMBER.__table__.c.name])))
+    members = {name: i for i, name in enumerate(member_names)}
+    member_parents = [[] for _ in member_names]
+    membership = data_access.TBL_MEMBERSHIP
+    for group_name, member_name in session.execute(
+            select([membership.c.group_name, membership.c.members_name])):
+        child = members.get(_encode(member_name))
+        parent = members.get(_encode(group_name))
+        if child is not None and parent is not None:
+            member_parents[child].append(parent)
+
+    resource_table = data_access.TBL_RESOURCE.__table__
+    resource_rows = [
+        (_encode(type_name), _encode(parent_type_name))
+        for type_name, parent_type_name in session.execute(
+            select([resource_table.c.type_name,
+                    resource_table.c.parent_type_name]))]
+    resource_rows.sort()
+    resources = {row[0]: i for i, row in enumerate(resource_rows)}
+    resource_parents = _uint_array(
+        resources.get(parent, NO_PARENT) if parent else NO_PARENT
+        for _, parent in resource_rows)
+
+    permission_names = sorted(_encode(name) for name, in session.execute(
+        select([data_access.TBL_PERMISSION.__table__.c.name])))
+    permissions = {name: i for i, name in enumerate(permission_names)}
+    role_names = sorted(_encode(name) for name, in session.execute(
+        select([data_access.TBL_ROLE.__table__.c.name])))
+    roles = {name: i for i, name in enumerate(role_names)}
+    role_permissions = [set() for _ in role_names]
+    role_permission_table = data_access.TBL_ROLE_PERMISSIONS
+    for role_name, permission_name in session.execute(
+            select([role_permission_table.c.roles_name,
+                    role_permission_table.c.permissions_name])):
+        role = roles.get(_encode(role_name))
+        permission = permissions.get(_encode(permission_name))
+        if role is not None and permission is not None:
+            role_permissions[role].add(permission)
+
+    binding_table = data_access.TBL_BINDING.__table__
+    binding_ids = {}
+    binding_roles = _uint_array()
+    binding_resources = _uint_array()
+    resource_bindings = [[] for _ in resource_rows]
+    for binding_id, resource_type_name, role_name in session.execute(
+            select([binding_table.c.id,
+                    binding_table.c.resource_type_name,
+                    binding_table.c.role_name])
+            .order_by(binding_table.c.id)):
+        resource = resources.get(_encode(resource_type_name))
+        role = roles.get(_encode(role_name))
+        if resource is None or role is None:
+            continue
+        binding_ids[binding_id] = len(binding_roles)
+        resource_bindings[resource].append(len(binding_roles))
+        binding_roles.append(role)
+        binding_resources.append(resource)
+    binding_members = [set() for _ in binding_roles]
+    member_bindings = [set() for _ in member_names]
+    binding_member_table = data_access.TBL_BINDING_MEMBERS
+    for binding_id, member_name in session.execute(
+            select([binding_member_table.c.bindings_id,
+                    binding_member_table.c.members_name])):
+        binding = binding_ids.get(binding_id)
+        member = members.get(_encode(member_name))
+        if binding is not None and member is not None:
+            binding_members[binding].add(member)
+            member_bindings[member].add(binding)
+
+    permission_roles = [[] for _ in permission_names]
+    for role, role_permission_set in enumerate(role_permissions):
+        for permission in role_permission_set:
+            permission_roles[permission].append(role)
+
+    sections = {}
+    sections['member_offsets'], sections['member_names'] = (
+        _string_table(member_names))
+    sections['member_parent_offsets'], sections['member_parents'] = (
+        _csr(member_parents))
+    sections['resource_offsets'], sections['resource_names'] = (
+        _string_table([type_name for type_name, _ in resource_rows]))
+    sections['resource_parents'] = resource_parents.tostring()
+    sections['role_offsets'], sections['role_names'] = (
+        _string_table(role_names))
+    sections['role_permission_offsets'], sections['role_permissions'] = (
+        _csr(sorted(row) for row in role_permissions))
+    sections['permission_offsets'], sections['permission_names'] = (
+        _string_table(permission_names))
+    sections['permission_role_offsets'], sections['permission_roles'] = (
+        _csr(permission_roles))
+    sections['resource_binding_offsets'], sections['resource_bindings'] = (
+        _csr(resource_bindings))
+    sections['binding_roles'] = binding_roles.tostring()
+    sections['binding_resources'] = binding_resources.tostring()
+    sections['binding_member_offsets'], sections['binding_members'] = (
+        _csr(sorted(row) for row in binding_members))
+    sections['member_binding_offsets'], sections['member_bindings'] = (
+        _csr(sorted(row) for row in member_bindings))
+
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as index_file:
+            position = HEADER.size
+            locations = []
+            for name in SECTIONS:
+                locations.extend([position, len(sections[name])])
+                position += len(sections[name])
+            index_file.write(HEADER.pack(MAGIC, len(SECTIONS), *locations))
+            for name in SECTIONS:
+                index_file.write(sections[name])
+        os.rename(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    LOGGER.info('Built authorization index %s: %s members, %s resources, '
+                '%s bindings.', path, len(member_names), len(resource_rows),
+                len(binding_roles))
+
+
+class AuthorizationIndex(object):
+    """Answers explain queries from a memory mapped index file."""
+
+    def __init__(self, path):
+        """Initialize.
+
+        Args:
+            path (str): The index file path.
+
+        Raises:
+            ValueError: If the file is not an authorization index.
+        """
+        self.path = path
+        with open(path, 'rb') as index_file:
+            self.data = mmap.mmap(index_file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self.data, 0)
+        if header[0] != MAGIC or header[1] != len(SECTIONS):
+            self.data.close()
+            raise ValueError('Not an authorization index: {}'.format(path))
+        self.sections = {}
+        for i, name in enumerate(SECTIONS):
+            self.sections[name] = header[2 + 2 * i]
+        self.counts = {
+            'member': self._count('member_offsets') - 1,
+            'resource': self._count('resource_offsets') - 1,
+            'role': self._count('role_offsets') - 1,
+            'permission': self._count('permission_offsets') - 1,
+        }
+
+    def close(self):
+        """Unmap the index file."""
+        self.data.close()
+
+    def _count(self, section):
+        """Number of integers in a section.
+
+        Args:
+            section (str): The section name.
+
+        Returns:
+            int: The number of integers.
+        """
+        index = SECTIONS.index(section)
+        next_start = (self.sections[SECTIONS[index + 1]]
+                      if index + 1 < len(SECTIONS) else len(self.data))
+        return (next_start - self.sections[section]) // UINT.size
+
+    def _uint(self, section, position):
+        """Read an integer of a section.
+
+        Args:
+            section (str): The section name.
+            position (int): The position of the integer.
+
+        Returns:
+            int: The integer.
+        """
+        return UINT.unpack_from(
+            self.data, self.sections[section] + UINT.size * position)[0]
+
+    def _row(self, table, position):
+        """Read a compressed sparse row.
+
+        Args:
+            table (str): The table name, its sections are <table>_offsets and
+                <table>s.
+            position (int): The row number.
+
+        Returns:
+            array.array: The integers of the row.
+        """
+        start = self._uint(table + '_offsets', position)
+        end = self._uint(table + '_offsets', position + 1)
+        base = self.sections[table + 's']
+        row = _uint_array()
+        row.fromstring(
+            self.data[base + UINT.size * start:base + UINT.size * end])
+        return row
+
+    def _name_bytes(self, kind, position):
+        """Read the encoded name of an entry of a string table.
+
+        Args:
+            kind (str): The string table, member, resource, role or
+                permission.
+            position (int): The entry number.
+
+        Returns:
+            str: The utf-8 encoded name.
+        """
+        start = self._uint(kind + '_offsets', position)
+        end = self._uint(kind + '_offsets', position + 1)
+        base = self.sections[kind + '_names']
+        return self.data[base + start:base + end]
+
+    def _name(self, kind, position):
+        """Read the name of an entry of a string table.
+
+        Args:
+            kind (str): The string table.
+            position (int): The entry number.
+
+        Returns:
+            unicode: The name.
+        """
+        return self._name_bytes(kind, position).decode('utf-8')
+
+    def _find(self, kind, name):
+        """Binary search a name in a string table.
+
+        Args:
+            kind (str): The string table.
+            name (str): The name to find.
+
+        Returns:
+            int: The entry number, None if the name is not in the table.
+        """
+        key = _encode(name)
+        low, high = 0, self.counts[kind]
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_bytes(kind, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.counts[kind] and self._name_bytes(kind, low) == key:
+            return low
+        return None
+
+    def _expand_member(self, member, graph=None):
+        """Find the member and all groups it is transitively a member of.
+
+        Args:
+            member (int): The member number.
+            graph (dict): If given, filled with the parent names of each
+                member name reached.
+
+        Returns:
+            set: The member numbers.
+        """
+        found = set([member])
+        to_walk = [member]
+        if graph is not None:
+            graph[self._name('member', member)] = set()
+        while to_walk:
+            child = to_walk.pop()
+            for parent in self._row('member_parent', child):
+                if graph is not None:
+                    graph[self._name('member', child)].add(
+                        self._name('member', parent))
+                if parent not in found:
+                    found.add(parent)
+                    to_walk.append(parent)
+        return found
+
+    def _resource_path(self, resource):
+        """Find the resource and its ancestors.
+
+        Args:
+            resource (int): The resource number.
+
+        Returns:
+            list: The resource numbers, from the resource to the root.
+        """
+        path = []
+        while resource != NO_PARENT:
+            path.append(resource)
+            resource = self._uint('resource_parents', resource)
+        return path
+
+    def _roles_with_permissions(self, permission_names):
+        """Find the roles having all the permissions.
+
+        Like ModelAccess.get_roles_by_permission_names, no permission
+        names selects all roles with at least one permission.
+
+        Args:
+            permission_names (list): The permission names.
+
+        Returns:
+            set: The role numbers.
+        """
+        if not permission_names:
+            return set(role for role in xrange(self.counts['role'])
+                       if self._row('role_permission', role))
+
+        required = set()
+        for name in set(permission_names):
+            permission = self._find('permission', name)
+            if permission is None:
+                return set()
+            required.add(permission)
+
+        candidates = self._row('permission_role', min(required))
+        return set(role for role in candidates
+                   if required.issubset(self._row('role_permission', role)))
+
+    def check_iam_policy(self, resource_type_name, permission_name,
+                         member_name):
+        """Check access according to the resource IAM policy.
+
+        Args:
+            resource_type_name (str): type_name of the resource to check
+            permission_name (str): name of the permission to check
+            member_name (str): name of the member to check
+
+        Returns:
+            bool: whether such access is allowed
+
+        Raises:
+            Exception: member or resource not found
+        """
+        member = self._find('member', member_name)
+        if member is None:
+            error_message = 'Member not found: {}'.format(member_name)
+            LOGGER.error(error_message)
+            raise Exception(error_message)
+        resource = self._find('resource', resource_type_name)
+        if resource is None:
+            error_message = 'Resource not found: {}'.format(
+                resource_type_name)
+            LOGGER.error(error_message)
+            raise Exception(error_message)
+
+        permission = self._find('permission', permission_name)
+        if permission is None:
+            return False
+        members = self._expand_member(member)
+        for ancestor in self._resource_path(resource):
+            for binding in self._row('resource_binding', ancestor):
+                role = self._uint('binding_roles', binding)
+                if (permission in self._row('role_permission', role) and
+                        not members.isdisjoint(
+                            self._row('binding_member', binding))):
+                    return True
+        return False
+
+    def check_iam_policies(self, checks):
+        """Check access for many (resource, permission, member) triples.
+
+        Each distinct member is expanded once and the members granted a
+        permission on a resource are collected once.
+
+        Args:
+            checks (list): (resource_type_name, permission_name, member_name)
+                triples to check.
+
+        Returns:
+            list: Whether each access is allowed, in the order of the checks.
+
+        Raises:
+            Exception: member or resource not found
+        """
+        expanded_members = {}
+        resources = {}
+        granted_members = {}
+        results = []
+        for resource_type_name, permission_name, member_name in checks:
+            if member_name not in expanded_members:
+                member = self._find('member', member_name)
+                if member is None:
+                    error_message = 'Member not found: {}'.format(member_name)
+                    LOGGER.error(error_message)
+                    raise Exception(error_message)
+                expanded_members[member_name] = self._expand_member(member)
+
+            if resource_type_name not in resources:
+                resource = self._find('resource', resource_type_name)
+                if resource is None:
+                    error_message = 'Resource not found: {}'.format(
+                        resource_type_name)
+                    LOGGER.error(error_message)
+                    raise Exception(error_message)
+                resources[resource_type_name] = resource
+
+            key = (resource_type_name, permission_name)
+            if key not in granted_members:
+                granted = set()
+                permission = self._find('permission', permission_name)
+                if permission is not None:
+                    roles = set(self._row('permission_role', permission))
+                    for ancestor in self._resource_path(
+                            resources[resource_type_name]):
+                        for binding in self._row('resource_binding', ancestor):
+                            if self._uint('binding_roles', binding) in roles:
+                                granted.update(
+                                    self._row('binding_member', binding))
+                granted_members[key] = granted
+
+            results.append(not expanded_members[member_name].isdisjoint(
+                granted_members[key]))
+        return results
+
+    def explain_granted(self, member_name, resource_type_name, role,
+                        permission):
+        """Provide info about how the member has access to the resource.
+
+        Args:
+            member_name (str): name of the member
+            resource_type_name (str): type_name of the resource
+            role (str): role to query
+            permission (str): permission to query
+
+        Returns:
+            tuples: (bindings, member_graph, resource_type_names) bindings,
+                the bindings to grant the access member_graph, the graph to
+                have member included in the binding esource_type_names, the
+                resource tree
+
+        Raises:
+            Exception: not granted
+        """
+        member_graph = collections.defaultdict(set)
+        member = self._find('member', member_name)
+        members = (self._expand_member(member, member_graph)
+                   if member is not None else set())
+        resource = self._find('resource', resource_type_name)
+        path = self._resource_path(resource) if resource is not None else []
+
+        if role:
+            role_number = self._find('role', role)
+            roles = set([role_number]) if role_number is not None else set()
+        else:
+            roles = self._roles_with_permissions([permission])
+
+        bindings = []
+        for ancestor in path:
+            for binding in self._row('resource_binding', ancestor):
+                binding_role = self._uint('binding_roles', binding)
+                if binding_role not in roles:
+                    continue
+                for binding_member in self._row('binding_member', binding):
+                    if binding_member in members:
+                        bindings.append((self._name('resource', ancestor),
+                                         self._name('role', binding_role),
+                                         self._name('member', binding_member)))
+        if not bindings:
+            error_message = 'Grant not found: ({},{},{})'.format(
+                member_name,
+                resource_type_name,
+                role if role is not None else permission)
+            LOGGER.error(error_message)
+            raise Exception(error_message)
+        return (bindings, member_graph,
+                [self._name('resource', ancestor) for ancestor in path])
+
+    def query_access_by_member(self, member_name, permission_names):
+        """Return the bindings granting the member the permissions.
+
+        Groups the member is in are expanded, the resource hierarchy is not.
+
+        Args:
+            member_name (str): name of the member
+            permission_names (list): list of names of permissions to query
+
+        Returns:
+            list: list of access tuples, ("role_name", ["resource_type_name"])
+        """
+        member = self._find('member', member_name)
+        if member is None:
+            return []
+        members = self._expand_member(member)
+        roles = self._roles_with_permissions(permission_names)
+        if not roles:
+            return []
+
+        bindings = set()
+        for expanded_member in members:
+            bindings.update(self._row('member_binding', expanded_member))
+
+        accesses = []
+        for binding in sorted(bindings):
+            role = self._uint('binding_roles', binding)
+            if role in roles:
+                accesses.append((self._name('role', role),
+                                 [self._name('resource', self._uint(
+                                     'binding_resources', binding))]))
+        return accesses
@@ -14,10 +14,24 @@
 
 """ Explain API. """
 
+import os
+import threading
+
+from sqlalchemy.orm.exc import NoResultFound
+
 from google.cloud.forseti.common.util import logger
+from google.cloud.forseti.services.explain import authz_index
 
 LOGGER = logger.get_logger(__name__)
 
+# Models in these states are complete, they are served from an index.
+INDEXED_MODEL_STATES = frozenset(['SUCCESS', 'PARTIAL_SUCCESS'])
+
+# Number of streamed access checks evaluated together.
+CHECK_BATCH_SIZE = 1000
+# Default number of names in a page of the streamed listings.
+LIST_PAGE_SIZE = 1000
+
 
 class Explainer(object):
     """Implements the Explain API."""
@@ -29,62 +43,204 @@ class Explainer(object):
             config (object): ServiceConfig in server
         """
         self.config = config
+        self.indexes = {}
+        self.index_lock = threading.Lock()
+
+    def _get_index(self, model_name):
+        """Returns the authorization index of a model.
+
+        The index is built on first use, only for completed models, and is
+        shared with the other server processes through its file. A cached
+        index is dropped once its file is removed by the model deletion.
+
+        Args:
+            model_name (str): Model to operate on.
 
-    def list_resources(self, model_name, full_resource_name_prefix):
+        Returns:
+            AuthorizationIndex: The index, None if the model is not complete.
+        """
+        with self.index_lock:
+            index = self.indexes.get(model_name)
+            if index:
+                if os.path.exists(index.path):
+                    return index
+                del self.indexes[model_name]
+                index.close()
+
+        model_manager = self.config.model_manager
+        try:
+            model = model_manager.model(model_name)
+        except NoResultFound:
+            # Let the database path report the missing model.
+            return None
+        if model.state not in INDEXED_MODEL_STATES:
+            return None
+
+        with self.index_lock:
+            if model_name in self.indexes:
+                return self.indexes[model_name]
+
+            path = authz_index.index_path(model.handle)
+            if not os.path.exists(path):
+                scoped_session, data_access = model_manager.get(model_name)
+                with scoped_session as session:
+                    authz_index.build(session, data_access, path)
+            index = authz_index.AuthorizationIndex(path)
+            self.indexes[model_name] = index
+            return index
+
+    def list_resources(self, model_name, full_resource_name_prefix,
+                       page_token=None, page_size=None):
         """Lists resources by resource name prefix.
 
         Args:
             model_name (str): Model to operate on.
             full_resource_name_prefix (ste): the prefix of the resource name
+            page_token (str): if set, list the resources after this
+                type_name
+            page_size (int): if set, the maximum number of resources
 
         Returns:
             list: list of Resources match the query
         """
 
         LOGGER.debug('Listing resources, model_name = %s,'
-                     ' full_resource_name_prefix = %s',
-                     model_name, full_resource_name_prefix)
+                     ' full_resource_name_prefix = %s, page_token = %s,'
+                     ' page_size = %s', model_name, full_resource_name_prefix,
+                     page_token, page_size)
         model_manager = self.config.model_manager
         scoped_session, data_access = model_manager.get(model_name)
         with scoped_session as session:
             return data_access.list_resources_by_prefix(
-                session, full_resource_name_prefix)
+                session, full_resource_name_prefix,
+                after=page_token, limit=page_size)
+
+    def iter_resources(self, model_name, full_resource_name_prefix,
+                       page_size=None):
+        """Lists resources by resource name prefix, page by page.
+
+        Args:
+            model_name (str): Model to operate on.
+            full_resource_name_prefix (ste): the prefix of the resource name
+            page_size (int): the number of resources in a page, defaults to
+                LIST_PAGE_SIZE
+
+        Yields:
+            list: the next page of Resources matching the query
+        """
 
-    def list_group_members(self, model_name, member_name_prefix):
+        LOGGER.debug('Streaming resources, model_name = %s,'
+                     ' full_resource_name_prefix = %s',
+                     model_name, full_resource_name_prefix)
+        model_manager = self.config.model_manager
+        scoped_session, data_access = model_manager.get(model_name)
+        with scoped_session as session:
+            for page in _pages(
+                    lambda after, limit: data_access.list_resources_by_prefix(
+                        session, full_resource_name_prefix,
+                        after=after, limit=limit),
+                    page_size or LIST_PAGE_SIZE,
+                    lambda resource: resource.type_name):
+                yield page
+
+    def list_group_members(self, model_name, member_name_prefix,
+                           page_token=None, page_size=None):
         """Lists a member from the model.
 
         Args:
             model_name (str): Model to operate on.
             member_name_prefix (str): the prefix of the member_name
+            page_token (str): if set, list the members after this name
+            page_size (int): if set, the maximum number of members
 
         Returns:
             list: list of Members that match the query
             """
 
         LOGGER.debug('Listing Group members, model_name = %s,'
-                     ' member_name_prefix = %s', model_name, member_name_prefix)
+                     ' member_name_prefix = %s, page_token = %s,'
+                     ' page_size = %s', model_name, member_name_prefix,
+                     page_token, page_size)
         model_manager = self.config.model_manager
         scoped_session, data_access = model_manager.get(model_name)
         with scoped_session as session:
-            return data_access.list_group_members(session, member_name_prefix)
+            return data_access.list_group_members(
+                session, member_name_prefix, after=page_token,
+                limit=page_size)
+
+    def iter_group_members(self, model_name, member_name_prefix,
+                           page_size=None):
+        """Lists members from the model, page by page.
+
+        Args:
+            model_name (str): Model to operate on.
+            member_name_prefix (str): the prefix of the member_name
+            page_size (int): the number of members in a page, defaults to
+                LIST_PAGE_SIZE
+
+        Yields:
+            list: the next page of member names matching the query
+        """
 
-    def list_roles(self, model_name, role_name_prefix):
+        LOGGER.debug('Streaming Group members, model_name = %s,'
+                     ' member_name_prefix = %s', model_name, member_name_prefix)
+        model_manager = self.config.model_manager
+        scoped_session, data_access = model_manager.get(model_name)
+        with scoped_session as session:
+            for page in _pages(
+                    lambda after, limit: data_access.list_group_members(
+                        session, member_name_prefix, after=after,
+                        limit=limit),
+                    page_size or LIST_PAGE_SIZE):
+                yield page
+
+    def list_roles(self, model_name, role_name_prefix, page_token=None,
+                   page_size=None):
         """Lists the role in the model matching the prefix.
 
         Args:
             model_name (str): Model to operate on.
             role_name_prefix (str): prefix of the role_name
+            page_token (str): if set, list the roles after this role_name
+            page_size (int): if set, the maximum number of roles
 
         Returns:
             list: list of role_names that match the query
         """
 
         LOGGER.info('Listing roles, model_name = %s,'
+                    ' role_name_prefix = %s, page_token = %s,'
+                    ' page_size = %s', model_name, role_name_prefix,
+                    page_token, page_size)
+        model_manager = self.config.model_manager
+        scoped_session, data_access = model_manager.get(model_name)
+        with scoped_session as session:
+            return data_access.list_roles_by_prefix(
+                session, role_name_prefix, after=page_token, limit=page_size)
+
+    def iter_roles(self, model_name, role_name_prefix, page_size=None):
+        """Lists the roles matching the prefix, page by page.
+
+        Args:
+            model_name (str): Model to operate on.
+            role_name_prefix (str): prefix of the role_name
+            page_size (int): the number of roles in a page, defaults to
+                LIST_PAGE_SIZE
+
+        Yields:
+            list: the next page of role_names matching the query
+        """
+
+        LOGGER.info('Streaming roles, model_name = %s,'
                     ' role_name_prefix = %s', model_name, role_name_prefix)
         model_manager = self.config.model_manager
         scoped_session, data_access = model_manager.get(model_name)
         with scoped_session as session:
-            return data_access.list_roles_by_prefix(session, role_name_prefix)
+            for page in _pages(
+                    lambda after, limit: data_access.list_roles_by_prefix(
+                        session, role_name_prefix, after=after, limit=limit),
+                    page_size or LIST_PAGE_SIZE):
+                yield page
 
     def get_iam_policy(self, model_name, resource):
         """Gets the IAM policy for the resource.
@@ -120,12 +276,45 @@ class Explainer(object):
         LOGGER.debug('Checking IAM policy, model_name = %s, resource = %s,'
                      ' permission = %s, identity = %s',
                      model_name, resource, permission, identity)
+        index = self._get_index(model_name)
+        if index:
+            return index.check_iam_policy(resource, permission, identity)
+
         model_manager = self.config.model_manager
         scoped_session, data_access = model_manager.get(model_name)
         with scoped_session as session:
             return data_access.check_iam_policy(
                 session, resource, permission, identity)
 
+    def check_iam_policies(self, model_name, checks):
+        """Checks access according to IAM policy for many triples.
+
+        The checks are read in batches of CHECK_BATCH_SIZE, each batch
+        expands its distinct members and resources once.
+
+        Args:
+            model_name (str): Model to operate on.
+            checks (iter): (resource, permission, identity) triples to check.
+
+        Yields:
+            bool: whether each access is allowed, in the order of the checks
+        """
+
+        LOGGER.debug('Checking IAM policies, model_name = %s', model_name)
+        index = self._get_index(model_name)
+        if index:
+            for batch in _batches(checks, CHECK_BATCH_SIZE):
+                for result in index.check_iam_policies(batch):
+                    yield result
+            return
+
+        model_manager = self.config.model_manager
+        scoped_session, data_access = model_manager.get(model_name)
+        with scoped_session as session:
+            for batch in _batches(checks, CHECK_BATCH_SIZE):
+                for result in data_access.check_iam_policies(session, batch):
+                    yield result
+
     def explain_denied(self, model_name, member, resources, permissions, roles):
         """Provides information on granting a member access to a resource.
 
@@ -176,6 +365,10 @@ class Explainer(object):
                      ' model_name = %s, member = %s, resource = %s,'
                      ' permission = %s, role = %s',
                      model_name, member, resource, permission, role)
+        index = self._get_index(model_name)
+        if index:
+            return index.explain_granted(member, resource, role, permission)
+
         model_manager = self.config.model_manager
         scoped_session, data_access = model_manager.get(model_name)
         with scoped_session as session:
@@ -264,6 +457,13 @@ class Explainer(object):
                      ' permission_names = %s, expand_resources = %s',
                      model_name, member_name,
                      permission_names, expand_resources)
+        index = None if expand_resources else self._get_index(model_name)
+        if index:
+            for role, resources in index.query_access_by_member(
+                    member_name, permission_names):
+                yield role, resources
+            return
+
         model_manager = self.config.model_manager
         scoped_session, data_access = model_manager.get(model_name)
         with scoped_session as session:
@@ -293,3 +493,44 @@ class Explainer(object):
             for result in data_access.query_permissions_by_roles(
                     session, role_names, role_prefixes):
                 yield result
+
+
+def _batches(iterable, size):
+    """Split an iterable in lists.
+
+    Args:
+        iterable (iter): The items to split.
+        size (int): The maximum number of items in a list.
+
+    Yields:
+        list: The next items.
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _pages(list_page, page_size, key=lambda item: item):
+    """List all the pages of a keyset paginated listing.
+
+    Args:
+        list_page (func): Lists the items after a key, up to a limit.
+        page_size (int): The number of items in a page.
+        key (func): The key of an item.
+
+    Yields:
+        list: The next page of items.
+    """
+    after = None
+    while True:
+        page = list_page(after, page_size)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after = key(page[-1])
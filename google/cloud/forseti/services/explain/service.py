@@ -121,10 +121,36 @@ class GrpcExplainer(explain_pb2_grpc.ExplainServicer):
 
         handle = self._get_handle(context)
         resources = self.explainer.list_resources(handle,
-                                                  request.prefix)
+                                                  request.prefix,
+                                                  request.page_token or None,
+                                                  request.page_size)
         reply.full_resource_names.extend([r.type_name for r in resources])
+        if request.page_size and len(resources) == request.page_size:
+            reply.next_page_token = resources[-1].type_name
         return reply
 
+    @autoclose_stream
+    def StreamResources(self, request, context):
+        """Streams the resources in the model, page by page.
+
+        Args:
+            request (object): gRPC request.
+            context (object): gRPC context.
+
+        Yields:
+            object: proto message of a page of resources
+        """
+        if not self.is_supported:
+            yield self._set_not_supported_status(
+                context, explain_pb2.ListResourcesReply())
+
+        handle = self._get_handle(context)
+        for resources in self.explainer.iter_resources(handle,
+                                                       request.prefix,
+                                                       request.page_size):
+            yield explain_pb2.ListResourcesReply(
+                full_resource_names=[r.type_name for r in resources])
+
     def ListGroupMembers(self, request, context):
         """Lists members in the model.
 
@@ -141,12 +167,37 @@ class GrpcExplainer(explain_pb2_grpc.ExplainServicer):
             return self._set_not_supported_status(context, reply)
 
         handle = self._get_handle(context)
-        member_names = self.explainer.list_group_members(handle,
-                                                         request.prefix)
+        member_names = self.explainer.list_group_members(
+            handle,
+            request.prefix,
+            request.page_token or None,
+            request.page_size)
 
         reply.member_names.extend(member_names)
+        if request.page_size and len(member_names) == request.page_size:
+            reply.next_page_token = member_names[-1]
         return reply
 
+    @autoclose_stream
+    def StreamGroupMembers(self, request, context):
+        """Streams the members in the model, page by page.
+
+        Args:
+            request (object): gRPC request.
+            context (object): gRPC context.
+
+        Yields:
+            object: proto message of a page of members
+        """
+        if not self.is_supported:
+            yield self._set_not_supported_status(
+                context, explain_pb2.ListGroupMembersReply())
+
+        handle = self._get_handle(context)
+        for member_names in self.explainer.iter_group_members(
+                handle, request.prefix, request.page_size):
+            yield explain_pb2.ListGroupMembersReply(member_names=member_names)
+
     def ListRoles(self, request, context):
         """List roles from the model.
 
@@ -163,10 +214,36 @@ class GrpcExplainer(explain_pb2_grpc.ExplainServicer):
             return self._set_not_supported_status(context, reply)
 
         handle = self._get_handle(context)
-        role_names = self.explainer.list_roles(handle, request.prefix)
+        role_names = self.explainer.list_roles(handle,
+                                               request.prefix,
+                                               request.page_token or None,
+                                               request.page_size)
         reply.role_names.extend(role_names)
+        if request.page_size and len(role_names) == request.page_size:
+            reply.next_page_token = role_names[-1]
         return reply
 
+    @autoclose_stream
+    def StreamRoles(self, request, context):
+        """Streams the roles in the model, page by page.
+
+        Args:
+            request (object): gRPC request.
+            context (object): gRPC context.
+
+        Yields:
+            object: proto message of a page of roles
+        """
+        if not self.is_supported:
+            yield self._set_not_supported_status(
+                context, explain_pb2.ListRolesReply())
+
+        handle = self._get_handle(context)
+        for role_names in self.explainer.iter_roles(handle,
+                                                    request.prefix,
+                                                    request.page_size):
+            yield explain_pb2.ListRolesReply(role_names=role_names)
+
     def GetIamPolicy(self, request, context):
         """Gets the policy for a resource.
 
@@ -222,6 +299,28 @@ class GrpcExplainer(explain_pb2_grpc.ExplainServicer):
         reply.result = authorized
         return reply
 
+    @autoclose_stream
+    def CheckIamPolicies(self, request_iterator, context):
+        """Checks access according to policy for a stream of requests.
+
+        Args:
+            request_iterator (iter): gRPC CheckIamPolicy requests.
+            context (object): gRPC context.
+
+        Yields:
+            object: proto message of whether access granted, in the order of
+                the requests
+        """
+        if not self.is_supported:
+            yield self._set_not_supported_status(
+                context, explain_pb2.CheckIamPolicyReply())
+
+        handle = self._get_handle(context)
+        checks = ((request.resource, request.permission, request.identity)
+                  for request in request_iterator)
+        for authorized in self.explainer.check_iam_policies(handle, checks):
+            yield explain_pb2.CheckIamPolicyReply(result=authorized)
+
     def ExplainDenied(self, request, context):
         """Provides information on how to grant access.
 
@@ -18,6 +18,7 @@ import threading
 from google.cloud.forseti.services import db
 from google.cloud.forseti.services.inventory.base import gcp
 from google.cloud.forseti.services.inventory.storage import CaiDataAccess
+from google.cloud.forseti.services.inventory.storage import CaiMemoryIndex
 from google.cloud.forseti.services.inventory.storage import ContentTypes
 
 LOCAL_THREAD = threading.local()
@@ -27,17 +28,25 @@ LOCAL_THREAD = threading.local()
 class CaiApiClientImpl(gcp.ApiClientImpl):
     """The gcp api client Implementation"""
 
-    def __init__(self, config, engine):
+    def __init__(self, config, engine, memory_index_mb=0):
         """Initialize.
 
         Args:
             config (dict): GCP API client configuration.
             engine (object): Database engine to operate on.
+            memory_index_mb (int): If set, the CAI data is loaded into an in
+                memory index if it fits in this many MB, else every lookup
+                queries the database.
         """
         super(CaiApiClientImpl, self).__init__(config)
-        self.dao = CaiDataAccess()
         self.engine = engine
         self._local = LOCAL_THREAD
+        self.dao = None
+        if memory_index_mb:
+            self.dao = CaiMemoryIndex.load(self.session,
+                                           memory_index_mb * 1024 * 1024)
+        if not self.dao:
+            self.dao = CaiDataAccess()
 
     @property
     def session(self):
@@ -444,5 +453,33 @@ class CaiApiClientImpl(gcp.ApiClientImpl):
         return super(CaiApiClientImpl, self).fetch_storage_bucket_iam_policy(
             bucket_id)
 
+    def fetch_storage_bucket_iam_policies(self, bucket_ids):
+        """Bucket IAM policies of many buckets from Cloud Asset data.
+
+        Args:
+            bucket_ids (list): ids of the buckets to query.
+
+        Returns:
+            dict: Bucket IAM policy by bucket id, buckets not found in Cloud
+                Asset data or in a batched API call are left out.
+        """
+        policies = {}
+        missing_bucket_ids = []
+        for bucket_id in bucket_ids:
+            resource = self.dao.fetch_cai_asset(
+                ContentTypes.iam_policy,
+                'google.cloud.storage.Bucket',
+                '//storage.googleapis.com/{}'.format(bucket_id),
+                self.session)
+            if resource:
+                policies[bucket_id] = resource
+            else:
+                missing_bucket_ids.append(bucket_id)
+        # Batch the live API fallbacks of the buckets not in the CAI cache.
+        policies.update(
+            super(CaiApiClientImpl, self).fetch_storage_bucket_iam_policies(
+                missing_bucket_ids))
+        return policies
+
     # Use live API because CAI does not yet have bucket ACLs.
     # def iter_storage_buckets(self, project_number):
@@ -14,7 +14,6 @@
 
 """Forseti Inventory Cloud Asset API integration."""
 
-import os
 import time
 
 import concurrent.futures
@@ -57,26 +56,27 @@ def load_cloudasset_data(session, config):
                                            content_type))
 
         for future in concurrent.futures.as_completed(futures):
+            export_path = future.result()
+            if not export_path:
+                return _clear_cai_data(session)
+
+            LOGGER.debug('Streaming Cloud Asset data from %s to database.',
+                         export_path)
             try:
-                temporary_file = future.result()
-                if not temporary_file:
-                    return _clear_cai_data(session)
-
-                LOGGER.debug('Importing Cloud Asset data from %s to database.',
-                             temporary_file)
-                with open(temporary_file, 'r') as cai_data:
-                    rows = CaiDataAccess.populate_cai_data(cai_data, session)
-                    imported_assets += rows
-                    LOGGER.info('%s assets imported to database.', rows)
-            finally:
-                if temporary_file:
-                    os.unlink(temporary_file)
+                cai_data = file_loader.stream_file_from_gcs(export_path)
+                rows = CaiDataAccess.populate_cai_data(
+                    cai_data, session, config.get_cai_parse_processes())
+            except errors.HttpError as e:
+                LOGGER.warn('Download of CAI dump from GCS failed: %s', e)
+                return _clear_cai_data(session)
+            imported_assets += rows
+            LOGGER.info('%s assets imported to database.', rows)
 
     return imported_assets
 
 
 def _export_assets(cloudasset_client, config, content_type):
-    """Worker function for exporting assets and downloading dump from GCS.
+    """Worker function for exporting assets to GCS.
 
     Args:
         cloudasset_client (CloudAssetClient): CloudAsset API client interface.
@@ -84,8 +84,7 @@ def _export_assets(cloudasset_client, config, content_type):
         content_type (ContentTypes): The content type to export.
 
     Returns:
-        str: The path to the temporary file downloaded from GCS or None on
-            error.
+        str: The path to the dump in GCS or None on error.
     """
     root_id = config.get_root_resource_id()
     timestamp = int(time.time())
@@ -117,12 +116,7 @@ def _export_assets(cloudasset_client, config, content_type):
                      '%s', results)
         return None
 
-    try:
-        LOGGER.debug('Downloading Cloud Asset data from GCS to disk.')
-        return file_loader.copy_file_from_gcs(export_path)
-    except errors.HttpError as e:
-        LOGGER.warn('Download of CAI dump from GCS failed: %s', e)
-        return None
+    return export_path
 
 
 def _clear_cai_data(session):
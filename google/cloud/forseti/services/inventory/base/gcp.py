@@ -45,6 +45,15 @@ class ApiClient(object):
             dataset_id (str): id of the dataset to query.
         """
 
+    @abc.abstractmethod
+    def fetch_bigquery_dataset_policies(self, project_id, dataset_ids):
+        """Dataset policies of many datasets from batched gcp API calls.
+
+        Args:
+            project_id (str): id of the project to query.
+            dataset_ids (list): ids of the datasets to query.
+        """
+
     @abc.abstractmethod
     def iter_bigquery_datasets(self, project_number):
         """Iterate Datasets from GCP API.
@@ -353,6 +362,14 @@ class ApiClient(object):
                 projects/{PROJECT_ID}/serviceAccounts/{SERVICE_ACCOUNT_EMAIL}
         """
 
+    @abc.abstractmethod
+    def fetch_iam_serviceaccount_iam_policies(self, names):
+        """Service Account IAM policies from batched gcp API calls.
+
+        Args:
+            names (list): The service account names to query.
+        """
+
     @abc.abstractmethod
     def iter_iam_curated_roles(self):
         """Iterate Curated roles in an organization from GCP API.
@@ -438,6 +455,14 @@ class ApiClient(object):
             bucket_id (str): id of the bucket to query.
         """
 
+    @abc.abstractmethod
+    def fetch_storage_bucket_iam_policies(self, bucket_ids):
+        """Bucket IAM policies of many buckets from batched gcp API calls.
+
+        Args:
+            bucket_ids (list): ids of the buckets to query.
+        """
+
     @abc.abstractmethod
     def fetch_storage_object_iam_policy(self, bucket_name, object_name):
         """Object IAM policy Iterator for an object from gcp API call.
@@ -525,6 +550,9 @@ class ApiClientImpl(ApiClient):
         self.storage = None
 
         self.config = config
+        # Number of per resource policies fetched per batch request, 0
+        # disables batching.
+        self.policy_batch_size = config.get('policy_batch_size', 0)
 
     def _create_ad(self):
         """Create admin directory API client.
@@ -635,6 +663,23 @@ class ApiClientImpl(ApiClient):
         """
         return self.bigquery.get_dataset_access(project_id, dataset_id)
 
+    @create_lazy('bigquery', _create_bq)
+    def fetch_bigquery_dataset_policies(self, project_id, dataset_ids):
+        """Dataset policies of many datasets from batched gcp API calls.
+
+        Args:
+            project_id (str): id of the project to query.
+            dataset_ids (list): ids of the datasets to query.
+
+        Returns:
+            dict: Dataset Policy by dataset id, datasets not fetched in a batch
+                are left out.
+        """
+        if not self.policy_batch_size or not dataset_ids:
+            return {}
+        return self.bigquery.get_dataset_accesses(
+            project_id, dataset_ids, batch_size=self.policy_batch_size)
+
     @create_lazy('bigquery', _create_bq)
     def iter_bigquery_datasets(self, project_number):
         """Iterate Datasets from GCP API.
@@ -1135,6 +1180,24 @@ class ApiClientImpl(ApiClient):
         """
         return self.iam.get_service_account_iam_policy(name)
 
+    @create_lazy('iam', _create_iam)
+    def fetch_iam_serviceaccount_iam_policies(self, names):
+        """Service Account IAM policies from batched gcp API calls.
+
+        Args:
+            names (list): The service account names to query, each must be in
+                the format
+                projects/{PROJECT_ID}/serviceAccounts/{SERVICE_ACCOUNT_EMAIL}
+
+        Returns:
+            dict: Service Account IAM policy by name, service accounts not
+                fetched in a batch are left out.
+        """
+        if not self.policy_batch_size or not names:
+            return {}
+        return self.iam.get_service_account_iam_policies(
+            names, batch_size=self.policy_batch_size)
+
     @create_lazy('iam', _create_iam)
     def iter_iam_curated_roles(self):
         """Iterate Curated roles in an organization from GCP API.
@@ -1274,6 +1337,22 @@ class ApiClientImpl(ApiClient):
         """
         return self.storage.get_bucket_iam_policy(bucket_id)
 
+    @create_lazy('storage', _create_storage)
+    def fetch_storage_bucket_iam_policies(self, bucket_ids):
+        """Bucket IAM policies of many buckets from batched gcp API calls.
+
+        Args:
+            bucket_ids (list): ids of the buckets to query.
+
+        Returns:
+            dict: Bucket IAM policy by bucket id, buckets not fetched in a
+                batch are left out.
+        """
+        if not self.policy_batch_size or not bucket_ids:
+            return {}
+        return self.storage.get_bucket_iam_policies(
+            bucket_ids, batch_size=self.policy_batch_size)
+
     @create_lazy('storage', _create_storage)
     def fetch_storage_object_iam_policy(self, bucket_name, object_name):
         """Object IAM policy Iterator for an object from gcp API call.
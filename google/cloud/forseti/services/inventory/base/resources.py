@@ -96,6 +96,22 @@ def cached(field_name):
     return _cached
 
 
+def prefetch(field_name, resources, values):
+    """Fill the cache of a cached getter on many resources at once.
+
+    Args:
+        field_name (str): The name of the cached attribute, as passed to
+            cached.
+        resources (list): (resource, value key) tuples to fill the cache of.
+        values (dict): The prefetched values by value key, the getter is left
+            to fetch the value of resources missing from it.
+    """
+    field_name = '__cached_{}'.format(field_name)
+    for resource, value_key in resources:
+        if value_key in values:
+            setattr(resource, field_name, values[value_key])
+
+
 class ResourceFactory(object):
     """ResourceFactory for visitor pattern"""
 
@@ -1691,9 +1707,16 @@ class BucketIterator(ResourceIterator):
         """
         gcp = self.client
         if self.resource.storage_api_enabled():
-            for data in gcp.iter_storage_buckets(
-                    project_number=self.resource['projectNumber']):
-                yield FACTORIES['bucket'].create_new(data)
+            buckets = [FACTORIES['bucket'].create_new(data)
+                       for data in gcp.iter_storage_buckets(
+                           project_number=self.resource['projectNumber'])]
+            # Batch the policy fetches of all buckets in the project.
+            prefetch('iam_policy',
+                     [(bucket, bucket.key()) for bucket in buckets],
+                     gcp.fetch_storage_bucket_iam_policies(
+                         [bucket.key() for bucket in buckets]))
+            for bucket in buckets:
+                yield bucket
 
 
 class ObjectIterator(ResourceIterator):
@@ -1717,9 +1740,17 @@ class DataSetIterator(ResourceIterator):
         """
         gcp = self.client
         if self.resource.bigquery_api_enabled():
-            for data in gcp.iter_bigquery_datasets(
-                    project_number=self.resource['projectNumber']):
-                yield FACTORIES['dataset'].create_new(data)
+            datasets = [(FACTORIES['dataset'].create_new(data),
+                         data['datasetReference']['datasetId'])
+                        for data in gcp.iter_bigquery_datasets(
+                            project_number=self.resource['projectNumber'])]
+            # Batch the policy fetches of all datasets in the project.
+            prefetch('dataset_policy', datasets,
+                     gcp.fetch_bigquery_dataset_policies(
+                         self.resource.key(),
+                         [dataset_id for _, dataset_id in datasets]))
+            for dataset, _ in datasets:
+                yield dataset
 
 
 class AppEngineAppIterator(ResourceIterator):
@@ -1996,9 +2027,16 @@ class ServiceAccountIterator(ResourceIterator):
         """
         gcp = self.client
         if self.resource.enumerable():
-            for data in gcp.iter_iam_serviceaccounts(
-                    project_id=self.resource['projectId']):
-                yield FACTORIES['serviceaccount'].create_new(data)
+            serviceaccounts = [FACTORIES['serviceaccount'].create_new(data)
+                               for data in gcp.iter_iam_serviceaccounts(
+                                   project_id=self.resource['projectId'])]
+            # Batch the policy fetches of all service accounts in the project.
+            prefetch('iam_policy',
+                     [(sa, sa['name']) for sa in serviceaccounts],
+                     gcp.fetch_iam_serviceaccount_iam_policies(
+                         [sa['name'] for sa in serviceaccounts]))
+            for serviceaccount in serviceaccounts:
+                yield serviceaccount
 
 
 class ServiceAccountKeyIterator(ResourceIterator):
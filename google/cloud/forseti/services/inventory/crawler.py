@@ -14,11 +14,15 @@
 
 """Crawler implementation."""
 
+from functools import partial
 from Queue import Empty
 from Queue import Queue
 import threading
 import time
 
+import concurrent.futures
+
+from google.cloud.forseti.common.gcp_api import _base_repository
 from google.cloud.forseti.common.util import logger
 from google.cloud.forseti.services.inventory.base import cai_gcp_client
 from google.cloud.forseti.services.inventory.base import cloudasset
@@ -29,6 +33,23 @@ from google.cloud.forseti.services.inventory.base import resources
 
 LOGGER = logger.get_logger(__name__)
 
+# The per resource getters called on every visited resource before it is
+# written to storage. Each getter caches its result on the resource, so they
+# are independent of each other and can be called in any order.
+RESOURCE_DATA_GETTERS = [
+    'get_iam_policy',
+    'get_gcs_policy',
+    'get_dataset_policy',
+    'get_cloudsql_policy',
+    'get_billing_info',
+    'get_enabled_apis',
+    'get_kubernetes_service_config',
+]
+
+# The maximum number of storage operations waiting for the writer thread,
+# crawler threads block when the queue is full.
+WRITE_QUEUE_SIZE = 1024
+
 
 class CrawlerConfig(crawler.CrawlerConfig):
     """Crawler configuration to inject dependencies."""
@@ -54,7 +75,7 @@ class ParallelCrawlerConfig(crawler.CrawlerConfig):
     """Multithreaded crawler configuration, to inject dependencies."""
 
     def __init__(self, storage, progresser, api_client, threads=10,
-                 variables=None):
+                 variables=None, policy_fetch_threads=0):
         """Initialize
 
         Args:
@@ -64,12 +85,16 @@ class ParallelCrawlerConfig(crawler.CrawlerConfig):
             api_client (ApiClientImpl): GCP API client
             threads (int): how many threads to use
             variables (dict): config variables
+            policy_fetch_threads (int): how many threads to use for fetching
+                the policies and other per resource data of visited resources
+                concurrently, 0 fetches them serially on the crawler thread.
         """
         super(ParallelCrawlerConfig, self).__init__()
         self.storage = storage
         self.progresser = progresser
         self.variables = {} if not variables else variables
         self.threads = threads
+        self.policy_fetch_threads = policy_fetch_threads
         self.client = api_client
 
 
@@ -110,15 +135,7 @@ class Crawler(crawler.Crawler):
 
         progresser = self.config.progresser
         try:
-
-            resource.get_iam_policy(self.get_client())
-            resource.get_gcs_policy(self.get_client())
-            resource.get_dataset_policy(self.get_client())
-            resource.get_cloudsql_policy(self.get_client())
-            resource.get_billing_info(self.get_client())
-            resource.get_enabled_apis(self.get_client())
-            resource.get_kubernetes_service_config(self.get_client())
-
+            self.fetch_resource_data(resource)
             self.write(resource)
         except Exception as e:
             LOGGER.exception(e)
@@ -127,6 +144,16 @@ class Crawler(crawler.Crawler):
         else:
             progresser.on_new_object(resource)
 
+    def fetch_resource_data(self, resource):
+        """Fetch the policies and other per resource data of a resource.
+
+        Args:
+            resource (object): Resource to fetch the data for.
+        """
+        client = self.get_client()
+        for getter in RESOURCE_DATA_GETTERS:
+            getattr(resource, getter)(client)
+
     def dispatch(self, callback):
         """Dispatch crawling of a subtree.
 
@@ -193,9 +220,11 @@ class ParallelCrawler(Crawler):
             config (ParallelCrawlerConfig): The crawler configuration
         """
         super(ParallelCrawler, self).__init__(config)
-        self._write_lock = threading.Lock()
         self._dispatch_queue = Queue()
+        self._write_queue = Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer = None
         self._shutdown_event = threading.Event()
+        self._fetch_executor = None
 
     def _start_workers(self):
         """Start a pool of worker threads for processing the dispatch queue."""
@@ -216,6 +245,58 @@ class ParallelCrawler(Crawler):
             callback()
             self._dispatch_queue.task_done()
 
+    def _start_writer(self):
+        """Start the single thread applying all writes to the storage."""
+        self._writer = threading.Thread(target=self._process_write_queue)
+        self._writer.daemon = True
+        self._writer.start()
+
+    def _stop_writer(self):
+        """Wait for all queued writes to be applied and stop the writer."""
+        if self._writer:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    # pylint: disable=broad-except
+    def _process_write_queue(self):
+        """Apply queued storage operations until the stop marker is read.
+
+        The storage is only touched by this thread, so crawler threads never
+        wait on each other's database round trips. Writes are applied in the
+        order they were queued, a parent is always written before its children
+        are crawled, so its inventory key is set before any child row is
+        built. The result or error of each operation is set on its future.
+        """
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+
+            future, operation = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(operation())
+            except Exception as e:
+                future.set_exception(e)
+    # pylint: enable=broad-except
+
+    def _apply(self, operation, *args):
+        """Apply a storage operation on the writer thread.
+
+        Args:
+            operation (function): The storage method to call.
+            *args: The arguments to call it with.
+
+        Returns:
+            object: The result of the operation.
+        """
+        future = concurrent.futures.Future()
+        self._write_queue.put((future, partial(operation, *args)))
+        # Reraises the exception of the operation, if any.
+        return future.result()
+
     def run(self, resource):
         """Run the crawler, given a start resource.
 
@@ -226,11 +307,19 @@ class ParallelCrawler(Crawler):
             QueueProgresser: The filled progresser described in inventory
         """
         try:
+            if self.config.policy_fetch_threads > 0:
+                self._fetch_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.config.policy_fetch_threads)
+            self._start_writer()
             self._start_workers()
             resource.accept(self)
             self._dispatch_queue.join()
         finally:
             self._shutdown_event.set()
+            self._stop_writer()
+            if self._fetch_executor:
+                self._fetch_executor.shutdown(wait=False)
+                self._fetch_executor = None
             # Wait for threads to exit.
             time.sleep(2)
         return self.config.progresser
@@ -243,14 +332,40 @@ class ParallelCrawler(Crawler):
         """
         self._dispatch_queue.put(callback)
 
+    def fetch_resource_data(self, resource):
+        """Fetch the policies and other per resource data of a resource.
+
+        When policy fetch threads are configured, the getters run concurrently
+        on the bounded fetch pool instead of one after another on the crawler
+        thread. API quotas are still enforced by the rate limiters shared by
+        all threads in the API client.
+
+        Args:
+            resource (Resource): Resource to fetch the data for.
+        """
+        if not self._fetch_executor:
+            super(ParallelCrawler, self).fetch_resource_data(resource)
+            return
+
+        client = self.get_client()
+        futures = [self._fetch_executor.submit(getattr(resource, getter),
+                                               client)
+                   for getter in RESOURCE_DATA_GETTERS]
+        concurrent.futures.wait(futures)
+        for future in futures:
+            # Reraises the first exception raised by a getter, if any.
+            future.result()
+
     def write(self, resource):
-        """Save resource to storage.
+        """Save resource to storage on the writer thread.
+
+        Returns once the resource is written, so its children are only crawled
+        once it has its inventory key, and a failed write is raised to visit.
 
         Args:
             resource (Resource): Resource to handle.
         """
-        with self._write_lock:
-            self.config.storage.write(resource)
+        self._apply(self.config.storage.write, resource)
 
     def on_child_error(self, error):
         """Process the error generated by child of a resource
@@ -262,13 +377,11 @@ class ParallelCrawler(Crawler):
         """
 
         warning_message = '{}\n'.format(error)
-        with self._write_lock:
-            self.config.storage.warning(warning_message)
-
+        self._apply(self.config.storage.warning, warning_message)
         self.config.progresser.on_warning(error)
 
     def update(self, resource):
-        """Update the row of an existing resource
+        """Update the row of an existing resource on the writer thread.
 
         Args:
             resource (Resource): The db row of Resource to update
@@ -276,10 +389,8 @@ class ParallelCrawler(Crawler):
         Raises:
             Exception: Reraises any exception.
         """
-
         try:
-            with self._write_lock:
-                self.config.storage.update(resource)
+            self._apply(self.config.storage.update, resource)
         except Exception as e:
             LOGGER.exception(e)
             self.config.progresser.on_error(e)
@@ -302,8 +413,11 @@ def run_crawler(storage,
         QueueProgresser: The progresser implemented in inventory
     """
 
+    crawler_configs = config.get_crawler_configs()
     client_config = config.get_api_quota_configs()
     client_config['domain_super_admin_email'] = config.get_gsuite_admin_email()
+    client_config['policy_batch_size'] = crawler_configs.get(
+        'policy_batch_size', 0)
     asset_count = 0
     if config.get_cai_enabled():
         asset_count = cloudasset.load_cloudasset_data(storage.session, config)
@@ -311,20 +425,31 @@ def run_crawler(storage,
                     asset_count)
 
     if config.get_cai_enabled() and asset_count:
-        client = cai_gcp_client.CaiApiClientImpl(client_config,
-                                                 storage.session.get_bind())
+        client = cai_gcp_client.CaiApiClientImpl(
+            client_config,
+            storage.session.get_bind(),
+            memory_index_mb=config.get_cai_memory_index_mb())
     else:
         client = gcp.ApiClientImpl(client_config)
 
     root_id = config.get_root_resource_id()
     resource = resources.from_root_id(client, root_id)
     if parallel:
-        crawler_config = ParallelCrawlerConfig(storage, progresser, client)
+        crawler_config = ParallelCrawlerConfig(
+            storage, progresser, client,
+            threads=crawler_configs.get('threads', 10),
+            policy_fetch_threads=crawler_configs.get('policy_fetch_threads',
+                                                     0))
         crawler_impl = ParallelCrawler(crawler_config)
     else:
         crawler_config = CrawlerConfig(storage, progresser, client)
         crawler_impl = Crawler(crawler_config)
-    progresser = crawler_impl.run(resource)
+    _base_repository.configure_http_pool(
+        crawler_configs.get('api_connections', 0))
+    try:
+        progresser = crawler_impl.run(resource)
+    finally:
+        _base_repository.configure_http_pool(0)
     # flush the buffer at the end to make sure nothing is cached.
     storage.commit()
     return progresser
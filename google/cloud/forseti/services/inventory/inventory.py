@@ -167,14 +167,21 @@ def run_inventory(service_config,
     """
 
     storage_cls = service_config.get_storage_class()
-    with storage_cls(session) as storage:
+    inventory_config = service_config.get_inventory_config()
+    crawler_configs = inventory_config.get_crawler_configs()
+    with storage_cls(
+            session,
+            incremental=crawler_configs.get('incremental', False),
+            deduplicate_data=crawler_configs.get('deduplicate_data', False),
+            data_compression=crawler_configs.get('data_compression')
+    ) as storage:
         try:
             progresser.inventory_index_id = storage.inventory_index.id
             progresser.final_message = True if background else False
             queue.put(progresser)
             result = run_crawler(storage,
                                  progresser,
-                                 service_config.get_inventory_config())
+                                 inventory_config)
         except Exception as e:
             LOGGER.exception(e)
             storage.rollback()
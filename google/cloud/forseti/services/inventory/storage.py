@@ -14,28 +14,41 @@
 """Inventory storage implementation."""
 # pylint: disable=too-many-lines
 
+from array import array
+import hashlib
+import itertools
 import json
+import multiprocessing
+import time
+import zlib
+
 import enum
 
 from sqlalchemy import and_
+from sqlalchemy import bindparam
 from sqlalchemy import BigInteger
 from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import Enum
 from sqlalchemy import exists
 from sqlalchemy import func
+from sqlalchemy import inspect
 from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import LargeBinary
 from sqlalchemy import or_
 from sqlalchemy import PrimaryKeyConstraint
+from sqlalchemy import select
 from sqlalchemy import String
 from sqlalchemy import Table
 from sqlalchemy import Text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import aliased
+from sqlalchemy.orm import column_property
 from sqlalchemy.orm import mapper
+from sqlalchemy.orm.attributes import set_committed_value
 
 from google.cloud.asset_v1beta1.proto import assets_pb2
 from google.protobuf import json_format
@@ -51,6 +64,20 @@ LOGGER = logger.get_logger(__name__)
 BASE = declarative_base()
 CURRENT_SCHEMA = 1
 PER_YIELD = 1024
+# Number of ids reserved from the id sequence table in one round trip.
+ID_BLOCK_SIZE = 10000
+# Number of CAI assets inserted and committed per batch.
+CAI_INSERT_BATCH_SIZE = 5000
+# Number of CAI dump lines sent to a parse process at once.
+CAI_PARSE_CHUNK_SIZE = 256
+# Number of CAI assets between two import progress reports.
+CAI_PROGRESS_ROWS = 100000
+# Estimated memory used per asset by the CAI memory index, besides the data.
+CAI_MEMORY_INDEX_ROW_OVERHEAD = 200
+# Number of hashes of deduplicated resource data remembered while writing.
+KNOWN_DATA_HASHES = 1000000
+# Number of deduplicated data hashes checked for removal per delete statement.
+DATA_DELETE_BATCH_SIZE = 500
 
 
 class Categories(enum.Enum):
@@ -74,6 +101,30 @@ SUPPORTED_CATEGORIES = frozenset(item.name for item in list(Categories))
 SUPPORTED_CONTENT_TYPES = frozenset(item.name for item in list(ContentTypes))
 
 
+def hash_resource_data(resource_data):
+    """Hash the json data of an inventory row.
+
+    Args:
+        resource_data (str): The json data of the row.
+
+    Returns:
+        str: The hex digest of the data.
+    """
+    return hashlib.sha1(resource_data).hexdigest()
+
+
+def _data_hash_value(data_hash):
+    """Get the integer value of a data hash for the in memory indexes.
+
+    Args:
+        data_hash (str): The hex digest of the data.
+
+    Returns:
+        int: The first 60 bits of the digest.
+    """
+    return int(data_hash[:15], 16)
+
+
 class InventoryIndex(BASE):
     """Represents a GCP inventory."""
 
@@ -185,6 +236,11 @@ class Inventory(BASE):
     parent_id = Column(Integer)
     other = Column(Text)
     inventory_errors = Column(Text)
+    # Hash of resource_data, used to find unchanged data.
+    data_hash = Column(String(40))
+    # Set if resource_data is unchanged since a previous inventory, the id of
+    # the row in that inventory holding the data, resource_data is None.
+    data_ref_id = Column(Integer)
 
     __table_args__ = (
         Index('idx_resource_category',
@@ -192,7 +248,24 @@ class Inventory(BASE):
               'resource_type',
               'category'),
         Index('idx_parent_id',
-              'parent_id'))
+              'parent_id'),
+        Index('idx_data_ref_id',
+              'data_ref_id'),
+        Index('idx_data_hash',
+              'data_hash'))
+
+    @staticmethod
+    def get_schema_update_actions():
+        """Maintain all the schema changes for this table.
+
+        Returns:
+            dict: A mapping of Action: Column.
+        """
+        columns_to_create = [Column('data_hash', String(40)),
+                             Column('data_ref_id', Integer)]
+
+        schema_update_actions = {'CREATE': columns_to_create}
+        return schema_update_actions
 
     @classmethod
     def from_resource(cls, index, resource):
@@ -291,8 +364,21 @@ class Inventory(BASE):
                     other=other,
                     inventory_errors=None))
 
+        for row in rows:
+            row.data_hash = hash_resource_data(row.resource_data)
+
         return rows
 
+    def to_dict(self):
+        """Get the column values of the database row object.
+
+        Returns:
+            dict: The column values keyed by column name, used for bulk
+                inserts of rows.
+        """
+        return {column.name: getattr(self, column.name)
+                for column in self.__table__.columns}
+
     def copy_inplace(self, new_row):
         """Update a database row object from a resource.
 
@@ -304,6 +390,8 @@ class Inventory(BASE):
         self.resource_id = new_row.resource_id
         self.resource_type = new_row.resource_type
         self.resource_data = new_row.resource_data
+        self.data_hash = new_row.data_hash
+        self.data_ref_id = new_row.data_ref_id
         self.other = new_row.other
         self.inventory_errors = new_row.inventory_errors
 
@@ -358,15 +446,24 @@ class Inventory(BASE):
         Returns:
             dict: row's metadata.
         """
-        return json.loads(self.resource_data)
+        return json.loads(self.get_resource_data_raw())
 
     def get_resource_data_raw(self):
         """Get the row's data json string.
 
+        The data is stored in the row, in the row it references or in the
+        deduplicated data table, it is only decompressed when requested. The
+        data held elsewhere is loaded on first access if it was not loaded
+        with the row.
+
         Returns:
             str: row's raw data.
         """
-        return self.resource_data
+        if self.resource_data is not None:
+            return self.resource_data
+        if self.data_ref_id is not None:
+            return self.referenced_data
+        return InventoryData.decode(self.stored_data, self.stored_compression)
 
     def get_other(self):
         """Get the row's other data.
@@ -385,6 +482,250 @@ class Inventory(BASE):
         return self.inventory_errors
 
 
+_DATA_ROW = Inventory.__table__.alias('data_row')
+# The data of the row holding resource_data for a row referencing unchanged
+# data, only loaded on access or by _load_data.
+Inventory.referenced_data = column_property(
+    select([_DATA_ROW.c.resource_data]).where(
+        _DATA_ROW.c.id == Inventory.data_ref_id).as_scalar(),
+    deferred=True)
+
+
+class InventoryData(BASE):
+    """Deduplicated resource data, keyed by the hash of the data."""
+
+    __tablename__ = 'gcp_inventory_data'
+
+    data_hash = Column(String(40), primary_key=True)
+    compression = Column(String(16))
+    data = Column(LargeBinary(length=(2**32) - 1))
+
+    @staticmethod
+    def encode(data_hash, resource_data, compression=None):
+        """Create the column values of a data row.
+
+        Args:
+            data_hash (str): The hash of the resource data.
+            resource_data (str): The resource data json string.
+            compression (str): 'zlib' to compress the data, the data is
+                stored uncompressed if compression does not shrink it.
+
+        Returns:
+            dict: The column values keyed by column name.
+        """
+        data = resource_data.encode('utf-8')
+        if compression == 'zlib':
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return {'data_hash': data_hash,
+                        'compression': compression,
+                        'data': compressed}
+        return {'data_hash': data_hash, 'compression': None, 'data': data}
+
+    @staticmethod
+    def decode(data, compression):
+        """Get the resource data json string of a data row.
+
+        Args:
+            data (bytes): The stored data.
+            compression (str): The compression of the stored data.
+
+        Returns:
+            str: The resource data json string, None if there is no data.
+        """
+        if data is None:
+            return None
+        if compression == 'zlib':
+            data = zlib.decompress(data)
+        return data.decode('utf-8')
+
+
+# The deduplicated data of rows not holding their data, only loaded on access
+# or by _load_data and decoded on request.
+Inventory.stored_data = column_property(
+    select([InventoryData.data]).where(and_(
+        Inventory.resource_data.is_(None),
+        InventoryData.data_hash == Inventory.data_hash)).as_scalar(),
+    deferred=True, group='stored_data')
+Inventory.stored_compression = column_property(
+    select([InventoryData.compression]).where(and_(
+        Inventory.resource_data.is_(None),
+        InventoryData.data_hash == Inventory.data_hash)).as_scalar(),
+    deferred=True, group='stored_data')
+
+
+def _load_data(session, rows):
+    """Load the data of the rows not holding it, a query per data location.
+
+    Rows holding their data, all rows if neither incremental inventories nor
+    deduplicated data are used, cost no query.
+
+    Args:
+        session (object): Database session.
+        rows (list): The Inventory rows.
+    """
+    referencing_rows = []
+    deduplicated_rows = []
+    for row in rows:
+        if row.resource_data is not None:
+            continue
+        if row.data_ref_id is not None:
+            referencing_rows.append(row)
+        elif row.data_hash is not None:
+            deduplicated_rows.append(row)
+
+    if referencing_rows:
+        table = Inventory.__table__
+        referenced_data = dict(session.execute(
+            select([table.c.id, table.c.resource_data]).where(
+                table.c.id.in_(set(row.data_ref_id
+                                   for row in referencing_rows)))).fetchall())
+        for row in referencing_rows:
+            set_committed_value(row, 'referenced_data',
+                                referenced_data.get(row.data_ref_id))
+
+    if deduplicated_rows:
+        data_table = InventoryData.__table__
+        stored_data = {}
+        for data_row in session.execute(
+                select([data_table.c.data_hash, data_table.c.data,
+                        data_table.c.compression]).where(
+                            data_table.c.data_hash.in_(set(
+                                row.data_hash for row in deduplicated_rows)))):
+            stored_data[data_row.data_hash] = (data_row.data,
+                                               data_row.compression)
+        for row in deduplicated_rows:
+            data, compression = stored_data.get(row.data_hash, (None, None))
+            set_committed_value(row, 'stored_data', data)
+            set_committed_value(row, 'stored_compression', compression)
+
+
+def _iter_with_data(session, query):
+    """Iterate the results of a query, loading the data held elsewhere.
+
+    Args:
+        session (object): Database session.
+        query (object): The query of Inventory rows, or of tuples of them.
+
+    Yields:
+        object: The results of the query.
+    """
+    results = iter(query.yield_per(PER_YIELD))
+    while True:
+        batch = list(itertools.islice(results, PER_YIELD))
+        if not batch:
+            return
+        rows = []
+        for result in batch:
+            if isinstance(result, Inventory):
+                rows.append(result)
+            else:
+                rows.extend(result)
+        _load_data(session, rows)
+        for result in batch:
+            yield result
+
+
+class IdSequence(BASE):
+    """Next unallocated id of tables with client side assigned ids."""
+
+    __tablename__ = 'id_sequence'
+
+    table_name = Column(String(255), primary_key=True)
+    next_id = Column(BigInteger)
+
+
+class IdBlockAllocator(object):
+    """Allocates unique row ids for a table in blocks.
+
+    Ids are reserved from the id_sequence table a block at a time, so rows can
+    be built with their final id and inserted in bulk without flushing each
+    row to learn its autoincrement id. All writers of the table must allocate
+    their ids through the sequence.
+    """
+
+    def __init__(self, session, table, block_size=ID_BLOCK_SIZE):
+        """Initialize
+
+        Args:
+            session (object): db session.
+            table (Table): The table to allocate ids for, the primary key
+                column must be named 'id'.
+            block_size (int): The number of ids to reserve at once.
+        """
+        self.session = session
+        self.table = table
+        self.block_size = block_size
+        self._next_id = 0
+        self._end_id = 0
+
+    def next_id(self):
+        """Allocate the next id.
+
+        Returns:
+            int: An id not used by any other writer of the table.
+        """
+        if self._next_id >= self._end_id:
+            self._next_id = self._reserve_block()
+            self._end_id = self._next_id + self.block_size
+
+        next_id = self._next_id
+        self._next_id += 1
+        return next_id
+
+    def _reserve_block(self):
+        """Reserve the next block of ids from the sequence.
+
+        The reservation is committed right away in its own transaction, so
+        concurrent writers only hold the sequence row lock for one round
+        trip. Sqlite only supports a single writer, the reservation is made
+        in the session transaction instead to not wait on its own lock.
+
+        Returns:
+            int: The first id of the reserved block.
+        """
+        engine = self.session.get_bind()
+        if engine.dialect.name == 'sqlite':
+            return self._reserve_block_with(self.session.connection())
+
+        try:
+            with engine.begin() as connection:
+                return self._reserve_block_with(connection)
+        except IntegrityError:
+            # A concurrent writer created the sequence row first.
+            with engine.begin() as connection:
+                return self._reserve_block_with(connection)
+
+    def _reserve_block_with(self, connection):
+        """Reserve the next block of ids using a database connection.
+
+        Args:
+            connection (object): The connection to execute on.
+
+        Returns:
+            int: The first id of the reserved block.
+        """
+        sequence = IdSequence.__table__
+        this_table = sequence.c.table_name == self.table.name
+        updated = connection.execute(
+            sequence.update().where(this_table).values(
+                next_id=sequence.c.next_id + self.block_size))
+
+        if not updated.rowcount:
+            # First allocation, continue after any existing row.
+            max_id = connection.execute(
+                select([func.max(self.table.c.id)])).scalar()
+            start_id = (max_id or 0) + 1
+            connection.execute(sequence.insert().values(
+                table_name=self.table.name,
+                next_id=start_id + self.block_size))
+            return start_id
+
+        end_id = connection.execute(
+            select([sequence.c.next_id]).where(this_table)).scalar()
+        return end_id - self.block_size
+
+
 class CaiTemporaryStore(object):
     """CAI temporary inventory table."""
 
@@ -449,12 +790,25 @@ class CaiTemporaryStore(object):
         Args:
             content_type (ContentTypes): The content type data to extract.
 
+        Returns:
+            dict: The dict representation of the asset data.
+        """
+        return self.decode_asset_data(self.asset_data, content_type)
+
+    @staticmethod
+    def decode_asset_data(asset_data, content_type):
+        """Extracts the data from a serialized asset based on the content type.
+
+        Args:
+            asset_data (bytes): The serialized Asset protobuf.
+            content_type (ContentTypes): The content type data to extract.
+
         Returns:
             dict: The dict representation of the asset data.
         """
         # The no-member is a false positive for the dynamic protobuf class.
         # pylint: disable=no-member
-        asset_pb = assets_pb2.Asset.FromString(self.asset_data)
+        asset_pb = assets_pb2.Asset.FromString(asset_data)
         # pylint: enable=no-member
         if content_type == ContentTypes.resource:
             return json_format.MessageToDict(asset_pb.resource.data)
@@ -473,6 +827,22 @@ class CaiTemporaryStore(object):
         Returns:
             object: database row object or None if there is no data.
         """
+        values = cls.values_from_json(asset_json)
+        if not values:
+            return None
+        return cls(**values)
+
+    @classmethod
+    def values_from_json(cls, asset_json):
+        """Creates the column values of a row from the json in a dump file.
+
+        Args:
+            asset_json (str): The json representation of an Asset.
+
+        Returns:
+            dict: The column values keyed by column name or None if there is
+                no data.
+        """
         asset_pb = json_format.Parse(asset_json, assets_pb2.Asset())
         if asset_pb.HasField('resource'):
             content_type = ContentTypes.resource
@@ -483,13 +853,13 @@ class CaiTemporaryStore(object):
         else:
             return None
 
-        return cls(
-            name=asset_pb.name,
-            parent_name=parent_name,
-            content_type=content_type,
-            asset_type=asset_pb.asset_type,
-            asset_data=asset_pb.SerializeToString()
-        )
+        return {
+            'name': asset_pb.name,
+            'parent_name': parent_name,
+            'content_type': content_type,
+            'asset_type': asset_pb.asset_type,
+            'asset_data': asset_pb.SerializeToString()
+        }
 
     @classmethod
     def delete_all(cls, session):
@@ -535,10 +905,30 @@ class CaiTemporaryStore(object):
         return ''
 
 
+def _parse_cai_line(line):
+    """Parse a line of a CAI data dump, runs in parse worker processes.
+
+    Args:
+        line (str): A line of the dump, the json representation of an Asset.
+
+    Returns:
+        tuple: The column values of the row or None if there is no data, and
+            the parse error message or None.
+    """
+    line = line.strip()
+    if not line:
+        return None, None
+    try:
+        return CaiTemporaryStore.values_from_json(line), None
+    except json_format.ParseError as e:
+        return None, 'Line {} had a parse error {}, skipping.'.format(line, e)
+
+
 class BufferedDbWriter(object):
     """Buffered db writing."""
 
-    def __init__(self, session, max_size=1024, commit_on_flush=False):
+    def __init__(self, session, max_size=1024, commit_on_flush=False,
+                 insert_table=None):
         """Initialize
 
         Args:
@@ -546,11 +936,15 @@ class BufferedDbWriter(object):
             max_size (int): max size of buffer
             commit_on_flush (bool): If true, the session is committed to the
                 database when the data is flushed.
+            insert_table (Table): If set, the buffered objects are dicts of
+                column values, written to this table with one bulk insert
+                per flush instead of being added to the session.
         """
         self.session = session
         self.buffer = []
         self.max_size = max_size
         self.commit_on_flush = commit_on_flush
+        self.insert_table = insert_table
 
     def add(self, obj):
         """Add an object to the buffer to write to db.
@@ -566,13 +960,67 @@ class BufferedDbWriter(object):
     def flush(self):
         """Flush all pending objects to the database."""
 
-        self.session.add_all(self.buffer)
+        if self.insert_table is None:
+            self.session.add_all(self.buffer)
+        elif self.buffer:
+            self.session.execute(self.insert_table.insert(), self.buffer)
         self.session.flush()
         if self.commit_on_flush:
             self.session.commit()
         self.buffer = []
 
 
+class InventoryDataWriter(BufferedDbWriter):
+    """Buffered writing of deduplicated resource data."""
+
+    def __init__(self, session, compression=None, max_size=1024,
+                 max_known_hashes=KNOWN_DATA_HASHES):
+        """Initialize
+
+        Args:
+            session (object): db session
+            compression (str): The compression of new data, 'zlib' or None.
+            max_size (int): max size of buffer
+            max_known_hashes (int): Number of hashes of stored data to
+                remember, bounds the memory used.
+        """
+        super(InventoryDataWriter, self).__init__(
+            session, max_size, insert_table=InventoryData.__table__)
+        self.compression = compression
+        self.max_known_hashes = max_known_hashes
+        self.known_hashes = set()
+
+    def add_data(self, data_hash, resource_data):
+        """Add resource data to write unless it was already stored.
+
+        Args:
+            data_hash (str): The hash of the resource data.
+            resource_data (str): The resource data json string.
+        """
+        if data_hash in self.known_hashes:
+            return
+        if len(self.known_hashes) >= self.max_known_hashes:
+            # Forgetting hashes only costs a lookup in the database, flush
+            # first so that no forgotten hash is still waiting in the buffer.
+            self.flush()
+            self.known_hashes.clear()
+        self.known_hashes.add(data_hash)
+        self.add(InventoryData.encode(data_hash, resource_data,
+                                      self.compression))
+
+    def flush(self):
+        """Flush the data not stored in the database yet."""
+        if self.buffer:
+            stored = set(
+                data_hash for data_hash, in self.session.query(
+                    InventoryData.data_hash).filter(
+                        InventoryData.data_hash.in_(
+                            [row['data_hash'] for row in self.buffer])))
+            self.buffer = [row for row in self.buffer
+                           if row['data_hash'] not in stored]
+        super(InventoryDataWriter, self).flush()
+
+
 class CaiDataAccess(object):
     """Access to the CAI temporary store table."""
 
@@ -596,37 +1044,59 @@ class CaiDataAccess(object):
         return num_rows
 
     @staticmethod
-    def populate_cai_data(data, session):
+    def populate_cai_data(data, session, parse_processes=0):
         """Add assets from cai data dump into cai temporary table.
 
         Args:
-            data (file): A file like object, line delimeted text dump of json
-                data representing assets from Cloud Asset Inventory exportAssets
-                API.
+            data (iterable): The lines of a text dump of json data
+                representing assets from Cloud Asset Inventory exportAssets
+                API, a file like object or a stream.
             session (object): Database session.
+            parse_processes (int): Number of processes parsing the lines, 0
+                parses them in this process.
 
         Returns:
             int: The number of rows inserted
         """
-        commit_buffer = BufferedDbWriter(session, commit_on_flush=True)
+        commit_buffer = BufferedDbWriter(
+            session,
+            max_size=CAI_INSERT_BATCH_SIZE,
+            commit_on_flush=True,
+            insert_table=inspect(CaiTemporaryStore).local_table)
+        pool = None
+        if parse_processes:
+            pool = multiprocessing.Pool(parse_processes)
+            parsed_lines = pool.imap(_parse_cai_line, data,
+                                     CAI_PARSE_CHUNK_SIZE)
+        else:
+            parsed_lines = (_parse_cai_line(line) for line in data)
+
         num_rows = 0
+        start_time = time.time()
         try:
-            for line in data:
-                if not line:
-                    continue
-
-                try:
-                    row = CaiTemporaryStore.from_json(line.strip())
-                except json_format.ParseError as e:
-                    LOGGER.error('Line %s had a parse error %s, skipping.',
-                                 line.strip(), e)
+            for values, error in parsed_lines:
+                if error:
+                    LOGGER.error(error)
+                if not values:
                     continue
-                commit_buffer.add(row)
+                commit_buffer.add(values)
                 num_rows += 1
+                if not num_rows % CAI_PROGRESS_ROWS:
+                    LOGGER.info('%s CAI assets imported, %.0f rows/s.',
+                                num_rows,
+                                num_rows / (time.time() - start_time))
             commit_buffer.flush()
         except SQLAlchemyError as e:
             LOGGER.exception('Error populating CAI data: %s', e)
             session.rollback()
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
+
+        elapsed = time.time() - start_time
+        LOGGER.info('%s CAI assets imported in %.1f seconds, %.0f rows/s.',
+                    num_rows, elapsed, num_rows / elapsed if elapsed else 0)
         return num_rows
 
     @staticmethod
@@ -688,6 +1158,120 @@ class CaiDataAccess(object):
         return {}
 
 
+class CaiMemoryIndex(object):
+    """In memory index of the cai temporary table.
+
+    Serves the same lookups as CaiDataAccess without a query per lookup. The
+    assets are kept serialized and only decoded when returned.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        # (content_type, asset_type, name) -> serialized asset.
+        self._assets = {}
+        # (content_type, asset_type, parent_name) -> names, sorted.
+        self._children = {}
+        self.size_bytes = 0
+
+    @classmethod
+    def load(cls, session, max_size_bytes):
+        """Load the cai temporary table into memory.
+
+        Args:
+            session (object): Database session.
+            max_size_bytes (int): The maximum memory used by the index.
+
+        Returns:
+            CaiMemoryIndex: The loaded index or None if the table does not
+                fit in max_size_bytes.
+        """
+        index = cls()
+        table = inspect(CaiTemporaryStore).local_table
+        query = (
+            select([table.c.content_type,
+                    table.c.asset_type,
+                    table.c.parent_name,
+                    table.c.name,
+                    table.c.asset_data])
+            .order_by(table.c.content_type,
+                      table.c.asset_type,
+                      table.c.name)
+            .execution_options(stream_results=True))
+        for row in session.execute(query):
+            index.size_bytes += (CAI_MEMORY_INDEX_ROW_OVERHEAD +
+                                 len(row.name) +
+                                 len(row.parent_name or '') +
+                                 len(row.asset_data))
+            if index.size_bytes > max_size_bytes:
+                LOGGER.info('CAI data exceeds the %s bytes memory index cap, '
+                            'using database lookups.', max_size_bytes)
+                return None
+            index.add(row.content_type, row.asset_type, row.parent_name,
+                      row.name, row.asset_data)
+        LOGGER.info('CAI data loaded into memory index, %s assets, %s bytes.',
+                    len(index), index.size_bytes)
+        return index
+
+    def __len__(self):
+        """Number of assets in the index.
+
+        Returns:
+            int: The number of assets.
+        """
+        return len(self._assets)
+
+    def add(self, content_type, asset_type, parent_name, name, asset_data):
+        """Add an asset, assets under the same parent are added in name order.
+
+        Args:
+            content_type (ContentTypes): The content type of the asset.
+            asset_type (str): The asset type.
+            parent_name (str): The parent resource of the asset.
+            name (str): The name of the asset.
+            asset_data (bytes): The serialized Asset protobuf.
+        """
+        self._assets[(content_type, asset_type, name)] = asset_data
+        self._children.setdefault(
+            (content_type, asset_type, parent_name), []).append(name)
+
+    def iter_cai_assets(self, content_type, asset_type, parent_name,
+                        session=None):
+        """Iterate the assets of a type under a parent.
+
+        Args:
+            content_type (ContentTypes): The content type to return.
+            asset_type (str): The asset type to return.
+            parent_name (str): The parent resource to iter children under.
+            session (object): Unused, for compatibility with CaiDataAccess.
+
+        Yields:
+            object: The content_type data for each resource.
+        """
+        del session
+        for name in self._children.get(
+                (content_type, asset_type, parent_name), []):
+            yield CaiTemporaryStore.decode_asset_data(
+                self._assets[(content_type, asset_type, name)], content_type)
+
+    def fetch_cai_asset(self, content_type, asset_type, name, session=None):
+        """Returns a single asset.
+
+        Args:
+            content_type (ContentTypes): The content type to return.
+            asset_type (str): The asset type to return.
+            name (str): The resource to return.
+            session (object): Unused, for compatibility with CaiDataAccess.
+
+        Returns:
+            dict: The content data for the specified resource.
+        """
+        del session
+        asset_data = self._assets.get((content_type, asset_type, name))
+        if asset_data is None:
+            return {}
+        return CaiTemporaryStore.decode_asset_data(asset_data, content_type)
+
+
 class DataAccess(object):
     """Access to inventory for services."""
 
@@ -709,8 +1293,12 @@ class DataAccess(object):
 
         try:
             result = cls.get(session, inventory_index_id)
+            data_hashes = cls._get_stored_data_hashes(session,
+                                                      inventory_index_id)
+            cls._move_referenced_data(session, inventory_index_id)
             session.query(Inventory).filter(
                 Inventory.inventory_index_id == inventory_index_id).delete()
+            cls._delete_unreferenced_data(session, data_hashes)
             session.query(InventoryIndex).filter(
                 InventoryIndex.id == inventory_index_id).delete()
             session.commit()
@@ -720,6 +1308,95 @@ class DataAccess(object):
             session.rollback()
             raise
 
+    @staticmethod
+    def _move_referenced_data(session, inventory_index_id):
+        """Move data referenced by other inventories out of an inventory.
+
+        For each row of the inventory holding data referenced by rows of
+        later incremental inventories, the data is copied into the first
+        referencing row and the other references are pointed to it.
+
+        Args:
+            session (object): Database session.
+            inventory_index_id (str): Id of the inventory to be deleted.
+        """
+        table = Inventory.__table__
+        data_row = table.alias('data_row')
+        query = (
+            select([table.c.id, table.c.data_ref_id, data_row.c.resource_data])
+            .select_from(table.join(data_row,
+                                    table.c.data_ref_id == data_row.c.id))
+            .where(data_row.c.inventory_index_id == inventory_index_id)
+            .order_by(table.c.data_ref_id, table.c.id))
+
+        moved_data = []
+        references = []
+        new_data_row_ids = {}
+        for row in session.execute(query):
+            new_data_row_id = new_data_row_ids.get(row.data_ref_id)
+            if new_data_row_id:
+                references.append({'row_id': row.id,
+                                   'new_data_ref_id': new_data_row_id})
+            else:
+                new_data_row_ids[row.data_ref_id] = row.id
+                moved_data.append({'row_id': row.id,
+                                   'moved_data': row.resource_data})
+
+        if moved_data:
+            session.execute(
+                table.update().where(table.c.id == bindparam('row_id'))
+                .values(resource_data=bindparam('moved_data'),
+                        data_ref_id=None),
+                moved_data)
+        if references:
+            session.execute(
+                table.update().where(table.c.id == bindparam('row_id'))
+                .values(data_ref_id=bindparam('new_data_ref_id')),
+                references)
+        LOGGER.debug('Moved %s referenced data rows out of inventory %s.',
+                     len(moved_data), inventory_index_id)
+
+    @staticmethod
+    def _get_stored_data_hashes(session, inventory_index_id):
+        """Get the hashes of the deduplicated data used by an inventory.
+
+        Args:
+            session (object): Database session.
+            inventory_index_id (str): Id of the inventory.
+
+        Returns:
+            list: The distinct data hashes.
+        """
+        rows = session.query(Inventory.data_hash).filter(
+            Inventory.inventory_index_id == inventory_index_id,
+            Inventory.resource_data.is_(None),
+            Inventory.data_ref_id.is_(None),
+            Inventory.data_hash.isnot(None)).distinct()
+        return [data_hash for data_hash, in rows]
+
+    @staticmethod
+    def _delete_unreferenced_data(session, data_hashes):
+        """Delete the deduplicated data no longer used by any inventory.
+
+        Only the data of the given hashes, used by the deleted inventory, is
+        checked, each against the data hash index of the inventory rows.
+
+        Args:
+            session (object): Database session.
+            data_hashes (list): The hashes of the data to delete if unused.
+        """
+        data_table = InventoryData.__table__
+        deleted = 0
+        for start in xrange(0, len(data_hashes), DATA_DELETE_BATCH_SIZE):
+            result = session.execute(
+                data_table.delete().where(and_(
+                    data_table.c.data_hash.in_(
+                        data_hashes[start:start + DATA_DELETE_BATCH_SIZE]),
+                    ~exists().where(
+                        Inventory.data_hash == data_table.c.data_hash))))
+            deleted += result.rowcount
+        LOGGER.debug('Deleted %s unreferenced data rows.', deleted)
+
     @classmethod
     def list(cls, session):
         """List all inventory index entries.
@@ -812,10 +1489,148 @@ def initialize(engine):
     BASE.metadata.create_all(engine)
 
 
+class ResourceIdIndex(object):
+    """Compact index of the inventory ids of the resources in an inventory.
+
+    Maps (resource_type, resource_id) to the inventory id of the resource row
+    without keeping the keys themselves. The 64 bit hashes of the keys, the
+    ids and optionally the data hashes of the rows are stored in an open
+    addressing hash table backed by arrays, so tens of millions of keys fit in
+    a few hundred MB. Distinct keys can share a hash, lookups therefore return
+    candidate ids to be verified by the caller.
+    """
+
+    def __init__(self, capacity=1024):
+        """Initialize
+
+        Args:
+            capacity (int): The initial number of slots, a power of 2.
+        """
+        self._hashes = array('l', [0]) * capacity
+        self._ids = array('l', [0]) * capacity
+        self._data_hashes = array('l', [0]) * capacity
+        self._mask = capacity - 1
+        self._size = 0
+
+    def __len__(self):
+        """Number of keys in the index.
+
+        Returns:
+            int: The number of keys added.
+        """
+        return self._size
+
+    @staticmethod
+    def _hash(resource_type, resource_id):
+        """Hash a key, 0 is reserved for empty slots.
+
+        Args:
+            resource_type (str): The type of the resource.
+            resource_id (str): The id of the resource.
+
+        Returns:
+            int: The hash of the key.
+        """
+        return hash((resource_type, resource_id)) or 1
+
+    def _insert(self, key_hash, inventory_id, data_hash):
+        """Insert a hash into the first free slot of its probe sequence.
+
+        Args:
+            key_hash (int): The hash of the key.
+            inventory_id (int): The inventory id of the resource.
+            data_hash (int): The data hash value of the row.
+        """
+        slot = key_hash & self._mask
+        while self._hashes[slot]:
+            slot = (slot + 1) & self._mask
+        self._hashes[slot] = key_hash
+        self._ids[slot] = inventory_id
+        self._data_hashes[slot] = data_hash
+
+    def _grow(self):
+        """Double the number of slots and reinsert all keys."""
+        hashes, ids, data_hashes = self._hashes, self._ids, self._data_hashes
+        capacity = 2 * len(hashes)
+        self._hashes = array('l', [0]) * capacity
+        self._ids = array('l', [0]) * capacity
+        self._data_hashes = array('l', [0]) * capacity
+        self._mask = capacity - 1
+        for slot in xrange(len(hashes)):
+            if hashes[slot]:
+                self._insert(hashes[slot], ids[slot], data_hashes[slot])
+
+    def add(self, resource_type, resource_id, inventory_id, data_hash=0):
+        """Add a resource to the index.
+
+        Args:
+            resource_type (str): The type of the resource.
+            resource_id (str): The id of the resource.
+            inventory_id (int): The inventory id of the resource row.
+            data_hash (int): The data hash value of the row, if needed.
+        """
+        if 2 * (self._size + 1) > len(self._hashes):
+            self._grow()
+        self._insert(self._hash(resource_type, resource_id), inventory_id,
+                     data_hash)
+        self._size += 1
+
+    def _slots(self, resource_type, resource_id):
+        """Get the slots of the keys with the same hash as a key.
+
+        Args:
+            resource_type (str): The type of the resource.
+            resource_id (str): The id of the resource.
+
+        Yields:
+            int: A slot of a key that may match the key.
+        """
+        key_hash = self._hash(resource_type, resource_id)
+        slot = key_hash & self._mask
+        while self._hashes[slot]:
+            if self._hashes[slot] == key_hash:
+                yield slot
+            slot = (slot + 1) & self._mask
+
+    def candidates(self, resource_type, resource_id):
+        """Get the inventory ids of the resources with the same key hash.
+
+        Args:
+            resource_type (str): The type of the resource.
+            resource_id (str): The id of the resource.
+
+        Yields:
+            int: The inventory id of a resource that may match the key.
+        """
+        for slot in self._slots(resource_type, resource_id):
+            yield self._ids[slot]
+
+    def find_data(self, resource_type, resource_id, data_hash):
+        """Find a row of a resource with the same data.
+
+        A match on the data hash means the data is the same, even if the key
+        hash of a different resource collided.
+
+        Args:
+            resource_type (str): The type of the resource.
+            resource_id (str): The id of the resource.
+            data_hash (int): The data hash value to look for.
+
+        Returns:
+            int: The inventory id of the row with the same data, else 0.
+        """
+        for slot in self._slots(resource_type, resource_id):
+            if self._data_hashes[slot] == data_hash:
+                return self._ids[slot]
+        return 0
+
+
 class Storage(BaseStorage):
     """Inventory storage used during creation."""
 
-    def __init__(self, session, existing_id=0, readonly=False):
+    def __init__(self, session, existing_id=0, readonly=False,
+                 incremental=False, deduplicate_data=False,
+                 data_compression=None):
         """Initialize
 
         Args:
@@ -823,14 +1638,37 @@ class Storage(BaseStorage):
             existing_id (int64): The inventory id if wants to open an existing
                 inventory.
             readonly (bool): whether to keep the inventory read-only.
+            incremental (bool): whether data unchanged since the previous
+                successful inventory is stored as a reference to the row
+                holding it instead of a copy.
+            deduplicate_data (bool): whether resource data is stored once in
+                the deduplicated data table, shared by all rows and
+                inventories with the same data.
+            data_compression (str): The compression of deduplicated data,
+                'zlib' or None.
         """
         self.session = session
         self.opened = False
         self.inventory_index = None
-        self.buffer = BufferedDbWriter(self.session)
+        self.buffer = BufferedDbWriter(self.session,
+                                       insert_table=Inventory.__table__)
+        self.id_allocator = IdBlockAllocator(self.session,
+                                             Inventory.__table__)
+        # The inventory ids of the resources written through this storage,
+        # the rows may still be buffered.
+        self._resource_ids = ResourceIdIndex()
         self._existing_id = existing_id
+        self._opened_existing = False
         self.session_completed = False
         self.readonly = readonly
+        self.incremental = incremental
+        self.data_buffer = None
+        if deduplicate_data:
+            self.data_buffer = InventoryDataWriter(self.session,
+                                                   data_compression)
+        # The rows of the previous inventory, for incremental inventories.
+        self._previous_rows = None
+        self.previous_index_id = None
 
     def _require_opened(self):
         """Make sure the storage is in 'open' state.
@@ -879,12 +1717,68 @@ class Storage(BaseStorage):
                         [IndexState.SUCCESS, IndexState.PARTIAL_SUCCESS]))
             .one())
 
-    def _get_resource_rows(self, key, resource_type):
+    def _load_previous_inventory(self):
+        """Index the data hashes of the previous successful inventory."""
+        previous_index = (
+            self.session.query(InventoryIndex.id).filter(
+                InventoryIndex.id != self.inventory_index.id).filter(
+                    InventoryIndex.inventory_status.in_(
+                        [IndexState.SUCCESS, IndexState.PARTIAL_SUCCESS]))
+            .order_by(InventoryIndex.id.desc()).first())
+        if not previous_index:
+            LOGGER.info('No previous inventory, storing a full inventory.')
+            return
+
+        self._previous_rows = ResourceIdIndex()
+        self.previous_index_id = previous_index.id
+        rows = self.session.query(
+            Inventory.id,
+            Inventory.resource_type,
+            Inventory.resource_id,
+            Inventory.data_hash,
+            Inventory.data_ref_id,
+            Inventory.resource_data.isnot(None).label(
+                'resource_data_stored')).filter(
+                    Inventory.inventory_index_id == previous_index.id)
+        for row in rows.yield_per(PER_YIELD):
+            # Rows stored before data hashes were added are never referenced,
+            # neither are rows with deduplicated data.
+            if row.data_hash and (row.data_ref_id or row.resource_data_stored):
+                self._previous_rows.add(row.resource_type,
+                                        row.resource_id,
+                                        row.data_ref_id or row.id,
+                                        _data_hash_value(row.data_hash))
+        LOGGER.info('Incremental inventory based on inventory %s, %s rows '
+                    'indexed.', previous_index.id, len(self._previous_rows))
+
+    def _store_data(self, row):
+        """Move the data of a row to the deduplicated data table.
+
+        Args:
+            row (Inventory): The row to write.
+        """
+        self.data_buffer.add_data(row.data_hash, row.resource_data)
+        row.resource_data = None
+
+    def _reference_unchanged_data(self, row):
+        """Replace the data of a row by a reference if it is unchanged.
+
+        Args:
+            row (Inventory): The row to write.
+        """
+        data_ref_id = self._previous_rows.find_data(
+            row.resource_type,
+            row.resource_id,
+            _data_hash_value(row.data_hash))
+        if data_ref_id:
+            row.data_ref_id = data_ref_id
+            row.resource_data = None
+
+    def _get_resource_rows(self, resource):
         """ Get the rows in the database for a certain resource
 
         Args:
-            key (str): The key of the resource
-            resource_type (str): The type of the resource
+            resource (object): Resource object to get the rows of.
 
         Returns:
             object: The inventory db rows of the resource,
@@ -893,22 +1787,59 @@ class Storage(BaseStorage):
         Raises:
             Exception: if there is no such row or more than one.
         """
-
-        rows = self.session.query(Inventory).filter(
-            and_(
+        inventory_key = resource.inventory_key()
+        if inventory_key:
+            # The related data rows have the resource row as their parent.
+            filters = or_(
+                Inventory.id == inventory_key,
+                and_(Inventory.parent_id == inventory_key,
+                     Inventory.category != Categories.resource))
+        else:
+            filters = and_(
                 Inventory.inventory_index_id == self.inventory_index.id,
-                Inventory.resource_id == key,
-                Inventory.resource_type == resource_type
-            )).all()
+                Inventory.resource_id == resource.key(),
+                Inventory.resource_type == resource.type())
+
+        rows = self.session.query(Inventory).filter(filters).all()
 
         if not rows:
-            raise Exception('Resource {} not found in the table'.format(key))
+            raise Exception(
+                'Resource {} not found in the table'.format(resource.key()))
         else:
             return rows
 
     def _get_resource_id(self, resource):
         """Checks if a resource exists already in the inventory.
 
+        Args:
+            resource (object): Resource object to check against the db.
+
+        Returns:
+            int: The resource id of the existing resource, else 0.
+        """
+        candidates = list(self._resource_ids.candidates(resource.type(),
+                                                        resource.key()))
+        if candidates:
+            # Verify the hash match against the stored rows.
+            self.buffer.flush()
+            for candidate in candidates:
+                row = self.session.query(
+                    Inventory.resource_type, Inventory.resource_id).filter(
+                        Inventory.id == candidate).one()
+                if (row.resource_type == resource.type() and
+                        row.resource_id == resource.key()):
+                    return candidate
+
+        if not self._opened_existing:
+            # Every resource of a new inventory is written through this
+            # storage, no need to look for it in the database.
+            return 0
+
+        return self._query_resource_id(resource)
+
+    def _query_resource_id(self, resource):
+        """Look up the id of a resource in the inventory in the database.
+
         Args:
             resource (object): Resource object to check against the db.
 
@@ -952,9 +1883,13 @@ class Storage(BaseStorage):
         # Should we create a new entry or are we opening an existing one?
         if existing_id:
             self.inventory_index = self._open(existing_id)
+            self._opened_existing = True
         else:
             self.inventory_index = self._create()
             self.session.commit()  # commit only on create.
+            # Deduplicated data is shared with previous inventories already.
+            if self.incremental and not self.data_buffer:
+                self._load_previous_inventory()
 
         self.opened = True
         if not self.readonly:
@@ -977,6 +1912,8 @@ class Storage(BaseStorage):
 
         try:
             self.buffer.flush()
+            if self.data_buffer:
+                self.data_buffer.flush()
             self.session.commit()
             self.inventory_index.complete()
             self.session.commit()
@@ -1021,17 +1958,20 @@ class Storage(BaseStorage):
         rows = Inventory.from_resource(self.inventory_index, resource)
 
         for row in rows:
+            # The ids are allocated up front, the rows can be written in bulk
+            # while the inventory id of the resource is used to tie child
+            # resources and related data back to the parent resource row.
+            row.id = self.id_allocator.next_id()
             if row.category == Categories.resource:
-                # Force flush to insert the resource row in order to get the
-                # inventory id value. This is used to tie child resources
-                # and related data back to the parent resource row and to
-                # check for duplicate resources.
-                self.session.add(row)
-                self.session.flush()
                 resource.set_inventory_key(row.id)
+                self._resource_ids.add(resource.type(), resource.key(), row.id)
             else:
                 row.parent_id = resource.inventory_key()
-                self.buffer.add(row)
+            if self.data_buffer:
+                self._store_data(row)
+            elif self._previous_rows is not None:
+                self._reference_unchanged_data(row)
+            self.buffer.add(row.to_dict())
 
         self.inventory_index.counter += len(rows)
 
@@ -1052,20 +1992,24 @@ class Storage(BaseStorage):
 
         try:
             new_rows = Inventory.from_resource(self.inventory_index, resource)
-            old_rows = self._get_resource_rows(
-                resource.key(), resource.type())
+            old_rows = self._get_resource_rows(resource)
 
             new_dict = {row.category.name: row for row in new_rows}
             old_dict = {row.category.name: row for row in old_rows}
 
             for category in SUPPORTED_CATEGORIES:
                 if category in new_dict:
+                    if self.data_buffer:
+                        self._store_data(new_dict[category])
                     if category in old_dict:
                         old_dict[category].copy_inplace(
                             new_dict[category])
                     else:
+                        new_dict[category].id = self.id_allocator.next_id()
                         new_dict[category].parent_id = resource.inventory_key()
                         self.session.add(new_dict[category])
+            if self.data_buffer:
+                self.data_buffer.flush()
             self.session.commit()
         except Exception as e:
             LOGGER.exception(e)
@@ -1107,7 +2051,8 @@ class Storage(BaseStorage):
              fetch_billing_info=False,
              fetch_enabled_apis=False,
              fetch_service_config=False,
-             with_parent=False):
+             with_parent=False,
+             changed_since=None):
         """Iterate the objects in the storage.
 
         Args:
@@ -1119,6 +2064,10 @@ class Storage(BaseStorage):
             fetch_enabled_apis (bool): Yield project enabled APIs info.
             fetch_service_config (bool): Yield container service config info.
             with_parent (bool): Join parent with results, yield tuples.
+            changed_since (int64): Only yield the rows with data changed since
+                this inventory index, new rows included. Removed resources
+                are not reported, rows stored before data hashes were added
+                are always yielded.
 
         Yields:
             object: Single row object or child/parent if 'with_parent' is set.
@@ -1157,6 +2106,15 @@ class Storage(BaseStorage):
         if type_list:
             filters.append(Inventory.resource_type.in_(type_list))
 
+        if changed_since:
+            previous_row = aliased(Inventory)
+            filters.append(~exists().where(and_(
+                previous_row.inventory_index_id == changed_since,
+                previous_row.resource_type == Inventory.resource_type,
+                previous_row.category == Inventory.category,
+                previous_row.resource_id == Inventory.resource_id,
+                previous_row.data_hash == Inventory.data_hash)))
+
         if with_parent:
             parent_inventory = aliased(Inventory)
             p_id = parent_inventory.id
@@ -1171,7 +2129,31 @@ class Storage(BaseStorage):
 
         base_query = base_query.order_by(Inventory.id.asc())
 
-        for row in base_query.yield_per(PER_YIELD):
+        for row in _iter_with_data(self.session, base_query):
+            yield row
+
+    def iter_all(self, type_list=None):
+        """Iterate the rows of every category in the storage, by id.
+
+        A row is always written after its parent, so a single scan ordered by
+        id sees the parent resource of every row before the row itself.
+
+        Args:
+            type_list (list): List of types to iterate over, or [] for all.
+
+        Yields:
+            object: Single row object.
+        """
+        base_query = self.session.query(Inventory).filter(
+            Inventory.inventory_index_id == self.inventory_index.id)
+
+        if type_list:
+            base_query = base_query.filter(
+                Inventory.resource_type.in_(type_list))
+
+        base_query = base_query.order_by(Inventory.id.asc())
+
+        for row in _iter_with_data(self.session, base_query):
             yield row
 
     def get_root(self):
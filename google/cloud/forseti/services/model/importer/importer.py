@@ -17,10 +17,16 @@
 # pylint: disable=unused-argument,too-many-instance-attributes
 # pylint: disable=no-self-use,not-callable,too-many-lines
 
+import array
+import bisect
+import collections
+import multiprocessing
 from StringIO import StringIO
 import traceback
 import json
 
+from sqlalchemy import func
+
 from google.cloud.forseti.common.util import logger
 from google.cloud.forseti.services.utils import get_resource_id_from_type_name
 from google.cloud.forseti.services.utils import get_sql_dialect
@@ -31,24 +37,433 @@ from google.cloud.forseti.services.inventory.storage import Storage as Inventory
 
 LOGGER = logger.get_logger(__name__)
 
+# Inventories with at least this many rows are imported with the bulk writer.
+BULK_IMPORT_MIN_ROWS = 100000
+
+# Number of rows buffered by the bulk writer before they are inserted.
+BULK_INSERT_ROWS = 10000
+
+# The handle of a stored resource, passed as the parent of its children.
+ResourceRef = collections.namedtuple('ResourceRef', ['type_name', 'full_name'])
+
+# The leaf resource types converted by the import worker processes, with the
+# data field holding their display name.
+PARALLEL_IMPORT_TYPES = {
+    'backendservice': 'displayName',
+    'disk': 'displayName',
+    'firewall': 'displayName',
+    'forwardingrule': 'displayName',
+    'image': 'displayName',
+    'instance': 'displayName',
+    'instancegroup': 'displayName',
+    'instancegroupmanager': 'displayName',
+    'instancetemplate': 'displayName',
+    'network': 'displayName',
+    'snapshot': 'name',
+    'subnetwork': 'displayName',
+}
+
+# Number of leaf resources handed to the import worker processes at once.
+PARALLEL_IMPORT_ROWS = 5000
+
+# Number of leaf resources sent to a worker process in one task.
+PARALLEL_IMPORT_CHUNK_SIZE = 100
+
+
+def _convert_leaf_resource(item):
+    """Convert a leaf resource row to the column values of its resource.
+
+    Runs in the import worker processes, it only needs the full resource name
+    of the parent, which is passed along with the row.
+
+    Args:
+        item (tuple): The row id, resource type, resource id and raw data of
+            the row, the parent row id and the parent full resource name.
+
+    Returns:
+        tuple: The row id, the parent row id and the column values.
+    """
+    row_id, res_type, res_id, data_raw, parent_id, parent_full_name = item
+    data = json.loads(data_raw)
+    type_name = to_type_name(res_type, res_id)
+    return row_id, parent_id, dict(
+        full_name=to_full_resource_name(parent_full_name, type_name),
+        type_name=type_name,
+        name=res_id,
+        type=res_type,
+        display_name=data.get(PARALLEL_IMPORT_TYPES[res_type], ''),
+        email=data.get('email', ''),
+        data=data_raw)
+
+
+class ResourceCache(object):
+    """Resource cache.
+
+    Maps the inventory ids of the imported resources to their type name and
+    full resource name, without holding on to the resource objects. The ids
+    are kept sorted in an array, next to the offset of the resource in the
+    per resource arrays. A full resource name is stored as the offset of its
+    parent and the name segment it adds to the parent name, so the name
+    prefixes shared by the resources under a parent are stored only once.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.ids = array.array('l')
+        self.offsets = array.array('l')
+        self.parents = array.array('l')
+        self.type_names = []
+        # None if the segment is the type name of the resource.
+        self.segments = []
+        self.last_full_name = (-1, None)
+
+    def __contains__(self, resource_id):
+        """Whether the resource is in the cache.
+
+        Args:
+            resource_id (int): The inventory id of the resource.
+
+        Returns:
+            bool: True if the resource is in the cache.
+        """
+        return self._find(resource_id) is not None
+
+    def __len__(self):
+        """The number of resources in the cache.
+
+        Returns:
+            int: The number of resources.
+        """
+        return len(self.ids)
+
+    def __getitem__(self, resource_id):
+        """Return the cached resource.
+
+        Args:
+            resource_id (int): The inventory id of the resource.
+
+        Returns:
+            tuple: The ResourceRef of the resource and its full resource name.
+
+        Raises:
+            KeyError: If the resource is not in the cache.
+        """
+        offset = self._find(resource_id)
+        if offset is None:
+            raise KeyError(resource_id)
+        full_name = self._full_name(offset)
+        return ResourceRef(self.type_names[offset], full_name), full_name
+
+    def add(self, resource_id, parent_id, type_name, full_name):
+        """Add a resource to the cache.
+
+        Args:
+            resource_id (int): The inventory id of the resource.
+            parent_id (int): The inventory id of the parent resource.
+            type_name (str): The type/name of the resource.
+            full_name (str): The full resource name of the resource.
+
+        Raises:
+            Exception: If the resource is already in the cache.
+        """
+        if resource_id in self:
+            raise Exception('Key should not exist: {}'.format(resource_id))
+
+        parent_offset = -1
+        segment = full_name
+        if parent_id is not None:
+            offset = self._find(parent_id)
+            if offset is not None:
+                parent_name = self._full_name(offset)
+                if full_name.startswith(parent_name):
+                    parent_offset = offset
+                    segment = full_name[len(parent_name):]
+        if segment == '{}/'.format(type_name):
+            segment = None
+
+        offset = len(self.type_names)
+        self.parents.append(parent_offset)
+        self.type_names.append(type_name)
+        self.segments.append(segment)
+        if not self.ids or self.ids[-1] < resource_id:
+            self.ids.append(resource_id)
+            self.offsets.append(offset)
+        else:
+            position = bisect.bisect_left(self.ids, resource_id)
+            self.ids.insert(position, resource_id)
+            self.offsets.insert(position, offset)
+
+    def _find(self, resource_id):
+        """Find the offset of a resource.
+
+        Args:
+            resource_id (int): The inventory id of the resource.
+
+        Returns:
+            int: The offset of the resource, None if it is not in the cache.
+        """
+        position = bisect.bisect_left(self.ids, resource_id)
+        if position < len(self.ids) and self.ids[position] == resource_id:
+            return self.offsets[position]
+        return None
+
+    def _full_name(self, offset):
+        """Build the full resource name of a resource.
+
+        Args:
+            offset (int): The offset of the resource.
+
+        Returns:
+            str: The full resource name.
+        """
+        last_offset, last_full_name = self.last_full_name
+        if offset == last_offset:
+            return last_full_name
+
+        segments = []
+        current = offset
+        while current >= 0:
+            segment = self.segments[current]
+            if segment is None:
+                segment = '{}/'.format(self.type_names[current])
+            segments.append(segment)
+            current = self.parents[current]
+        full_name = ''.join(reversed(segments))
+        self.last_full_name = (offset, full_name)
+        return full_name
+
+
+class ModelWriter(object):
+    """Writes the model rows as ORM objects of the session."""
+
+    def __init__(self, session, dao):
+        """Initialize.
+
+        Args:
+            session (Session): Database session.
+            dao (object): Data Access Object from dao.py.
+        """
+        self.session = session
+        self.dao = dao
+        self.resources = []
+
+    def add_resource(self, **columns):
+        """Add a resource row.
+
+        Args:
+            **columns (dict): The column values, parent is the handle of the
+                parent resource.
+
+        Returns:
+            ResourceRef: The handle of the resource, to pass as parent of its
+                children.
+        """
+        parent = columns.pop('parent', None)
+        if parent:
+            columns['parent_type_name'] = parent.type_name
+        resource = self.dao.TBL_RESOURCE(**columns)
+        self.session.add(resource)
+        self.resources.append(resource)
+        return ResourceRef(columns['type_name'], columns['full_name'])
+
+    def add_member(self, **columns):
+        """Add a member row.
+
+        Args:
+            **columns (dict): The column values.
+
+        Returns:
+            object: The handle of the member, to pass to add_binding.
+        """
+        member = self.dao.TBL_MEMBER(**columns)
+        self.session.add(member)
+        return member
+
+    def add_permission(self, **columns):
+        """Add a permission row.
+
+        Args:
+            **columns (dict): The column values.
+
+        Returns:
+            object: The handle of the permission, to pass to add_role.
+        """
+        permission = self.dao.TBL_PERMISSION(**columns)
+        self.session.add(permission)
+        return permission
+
+    def add_role(self, **columns):
+        """Add a role row.
+
+        Args:
+            **columns (dict): The column values, permissions are the handles
+                of the permissions of the role.
+
+        Returns:
+            object: The handle of the role.
+        """
+        role = self.dao.TBL_ROLE(**columns)
+        self.session.add(role)
+        return role
+
+    def add_binding(self, **columns):
+        """Add a binding row.
+
+        Args:
+            **columns (dict): The column values, members are the handles of
+                the members of the binding.
+        """
+        self.session.add(self.dao.TBL_BINDING(**columns))
+
+    def flush(self):
+        """Write the added rows to the database.
+
+        The written resources are expunged from the session, they are not
+        referenced by any later row.
+        """
+        self.session.flush()
+        for resource in self.resources:
+            self.session.expunge(resource)
+        self.resources = []
+
+
+class BulkModelWriter(ModelWriter):
+    """Writes the model rows in bulk, bypassing the ORM unit of work.
+
+    Rows are buffered as plain dicts per table and inserted with one
+    executemany per table. Bindings get explicit ids, so their members are
+    inserted in bulk too.
+    """
+
+    def __init__(self, session, dao, max_rows=None):
+        """Initialize.
+
+        Args:
+            session (Session): Database session.
+            dao (object): Data Access Object from dao.py.
+            max_rows (int): Number of buffered rows that triggers an insert,
+                defaults to BULK_INSERT_ROWS.
+        """
+        super(BulkModelWriter, self).__init__(session, dao)
+        self.max_rows = max_rows or BULK_INSERT_ROWS
+        self.buffered_rows = 0
+        # The tables in the order they are inserted in, the referenced rows
+        # first.
+        self.tables = [dao.TBL_PERMISSION.__table__,
+                       dao.TBL_ROLE.__table__,
+                       dao.TBL_ROLE_PERMISSIONS,
+                       dao.TBL_RESOURCE.__table__,
+                       dao.TBL_MEMBER.__table__,
+                       dao.TBL_BINDING.__table__,
+                       dao.TBL_BINDING_MEMBERS]
+        self.rows = {table: [] for table in self.tables}
+        self.next_binding_id = (
+            session.query(func.max(dao.TBL_BINDING.id)).scalar() or 0) + 1
+
+    def _add(self, table, row):
+        """Buffer a row, inserting the buffered rows if the buffer is full.
+
+        Args:
+            table (Table): The table of the row.
+            row (dict): The column values.
+        """
+        self.rows[table].append(row)
+        self.buffered_rows += 1
+        if self.buffered_rows >= self.max_rows:
+            self.flush()
+
+    def add_resource(self, **columns):
+        """Add a resource row.
+
+        Args:
+            **columns (dict): The column values, parent is the handle of the
+                parent resource.
+
+        Returns:
+            ResourceRef: The handle of the resource, to pass as parent of its
+                children.
+        """
+        parent = columns.pop('parent', None)
+        self._add(self.dao.TBL_RESOURCE.__table__, {
+            'full_name': columns['full_name'],
+            'type_name': columns['type_name'],
+            'parent_type_name': (parent.type_name if parent else
+                                 columns.get('parent_type_name')),
+            'name': columns['name'],
+            'type': columns['type'],
+            'policy_update_counter': 0,
+            'display_name': columns.get('display_name', ''),
+            'email': columns.get('email', ''),
+            'data': columns.get('data')})
+        return ResourceRef(columns['type_name'], columns['full_name'])
+
+    def add_member(self, **columns):
+        """Add a member row.
+
+        Args:
+            **columns (dict): The column values.
 
-class ResourceCache(dict):
-    """Resource cache."""
+        Returns:
+            str: The handle of the member, to pass to add_binding.
+        """
+        self._add(self.dao.TBL_MEMBER.__table__, columns)
+        return columns['name']
 
-    def __setitem__(self, key, value):
-        """Overriding to assert the keys does not exist previously.
+    def add_permission(self, **columns):
+        """Add a permission row.
 
-            Args:
-                key (object): Key into the dict.
-                value (object): Value to set.
+        Args:
+            **columns (dict): The column values.
 
-            Raises:
-                Exception: If the key already exists in the dict.
+        Returns:
+            str: The handle of the permission, to pass to add_role.
         """
+        self._add(self.dao.TBL_PERMISSION.__table__, columns)
+        return columns['name']
 
-        if key in self:
-            raise Exception('Key should not exist: {}'.format(key))
-        super(ResourceCache, self).__setitem__(key, value)
+    def add_role(self, **columns):
+        """Add a role row.
+
+        Args:
+            **columns (dict): The column values, permissions are the handles
+                of the permissions of the role.
+
+        Returns:
+            str: The handle of the role.
+        """
+        permissions = columns.pop('permissions', [])
+        self._add(self.dao.TBL_ROLE.__table__, columns)
+        for permission in set(permissions):
+            self._add(self.dao.TBL_ROLE_PERMISSIONS,
+                      {'roles_name': columns['name'],
+                       'permissions_name': permission})
+        return columns['name']
+
+    def add_binding(self, **columns):
+        """Add a binding row.
+
+        Args:
+            **columns (dict): The column values, members are the handles of
+                the members of the binding.
+        """
+        members = columns.pop('members', [])
+        binding_id = self.next_binding_id
+        self.next_binding_id += 1
+        columns['id'] = binding_id
+        self._add(self.dao.TBL_BINDING.__table__, columns)
+        for member in members:
+            self._add(self.dao.TBL_BINDING_MEMBERS,
+                      {'bindings_id': binding_id, 'members_name': member})
+
+    def flush(self):
+        """Insert the buffered rows, one executemany per table."""
+        self.session.flush()
+        for table in self.tables:
+            rows = self.rows[table]
+            if rows:
+                self.session.execute(table.insert(), rows)
+                self.rows[table] = []
+        self.buffered_rows = 0
 
 
 class EmptyImporter(object):
@@ -96,6 +511,7 @@ class InventoryImporter(object):
                  dao,
                  service_config,
                  inventory_index_id,
+                 import_processes=0,
                  *args,
                  **kwargs):
         """Create a Inventory importer which creates a model from the inventory.
@@ -107,6 +523,8 @@ class InventoryImporter(object):
             dao (object): Data Access Object from dao.py
             service_config (ServiceConfig): Service configuration.
             inventory_index_id (int64): Inventory id to import from
+            import_processes (int): Number of worker processes converting the
+                leaf resources, 0 converts them in this process.
             *args (list): Unused.
             **kwargs (dict): Unused.
         """
@@ -117,6 +535,7 @@ class InventoryImporter(object):
         self.dao = dao
         self.service_config = service_config
         self.inventory_index_id = inventory_index_id
+        self.import_processes = import_processes
         self.session.add(self.model)
 
         self.role_cache = {}
@@ -126,8 +545,13 @@ class InventoryImporter(object):
         self.membership_map = {}  # Maps group_name to {member_name}
         self.member_cache = {}
         self.member_cache_policies = {}
+        # The (resource type/name, members) of the IAM policy bindings by the
+        # name of their role, until the role is imported.
+        self.pending_bindings = {}
 
         self.found_root = False
+        self.last_res_type = None
+        self.writer = ModelWriter(self.session, self.dao)
 
     # pylint: disable=too-many-statements
     def run(self):
@@ -187,6 +611,10 @@ class InventoryImporter(object):
             self.session.autoflush = True
             with Inventory(self.readonly_session, self.inventory_index_id,
                            True) as inventory:
+                if inventory.inventory_index.counter >= BULK_IMPORT_MIN_ROWS:
+                    LOGGER.debug('Importing %s rows in bulk.',
+                                 inventory.inventory_index.counter)
+                    self.writer = BulkModelWriter(self.session, self.dao)
                 root = inventory.get_root()
                 description = {
                     'source': 'inventory',
@@ -206,83 +634,11 @@ class InventoryImporter(object):
                 if not self.found_root:
                     LOGGER.debug('Root resource is not organization: %s.', root)
 
-                last_res_type = None
-                item_counter = 0
-                LOGGER.debug('Start storing resources into models.')
-                for resource in inventory.iter(gcp_type_list):
-                    item_counter += 1
-                    last_res_type = self._store_resource(resource,
-                                                         last_res_type)
-                    if not item_counter % 1000:
-                        # Flush database every 1000 resources
-                        LOGGER.debug('Flushing model write session: %s',
-                                     item_counter)
-                        self.session.flush()
-
-                self._store_resource(None, last_res_type)
-                if item_counter % 1000:
-                    # Additional rows added since last flush.
-                    self.session.flush()
-                LOGGER.debug('Finished storing resources into models.')
-
-                item_counter += self.model_action_wrapper(
-                    self.session,
-                    inventory.iter(gcp_type_list,
-                                   fetch_dataset_policy=True),
-                    None,
-                    self._convert_dataset_policy,
-                    None,
-                    1000
-                )
-
-                item_counter += self.model_action_wrapper(
-                    self.session,
-                    inventory.iter(gcp_type_list,
-                                   fetch_service_config=True),
-                    None,
-                    self._convert_service_config,
-                    None,
-                    1000
-                )
-
-                self.model_action_wrapper(
-                    self.session,
-                    inventory.iter(gsuite_type_list),
-                    None,
-                    self._store_gsuite_principal,
-                    None,
-                    1000
-                )
-
-                self.model_action_wrapper(
-                    self.session,
-                    inventory.iter(gcp_type_list, fetch_enabled_apis=True),
-                    None,
-                    self._convert_enabled_apis,
-                    None,
-                    1000
-                )
-
-                self.model_action_wrapper(
-                    self.session,
-                    inventory.iter(member_type_list, with_parent=True),
-                    self._store_gsuite_membership_pre,
-                    self._store_gsuite_membership,
-                    self._store_gsuite_membership_post,
-                    1000
-                )
-
-                self.dao.denorm_group_in_group(self.session)
-
-                self.model_action_wrapper(
-                    self.session,
-                    inventory.iter(gcp_type_list,
-                                   fetch_iam_policy=True),
-                    self._store_iam_policy_pre,
-                    self._store_iam_policy,
-                    self._store_iam_policy_post,
-                    1000
-                )
+                item_counter = self._import_inventory(
+                    inventory,
+                    gcp_type_list,
+                    gsuite_type_list,
+                    member_type_list)
         except Exception as e:  # pylint: disable=broad-except
             LOGGER.exception(e)
             buf = StringIO()
@@ -303,6 +659,161 @@ class InventoryImporter(object):
             self.session.autoflush = autoflush
     # pylint: enable=too-many-statements
 
+    def _import_inventory(self, inventory, gcp_type_list, gsuite_type_list,
+                          member_type_list):
+        """Import the inventory into the model in a single scan.
+
+        The rows of all categories are read once, ordered by id, and routed
+        by category and type to their handler. A row is always stored after
+        its parent, so the parent of every row is already in the resource
+        cache. Only the forward references are buffered: the group names of
+        gsuite groups for their memberships, and the IAM policy bindings of
+        roles not imported yet, which are stored with their role. The members
+        of a binding are created on first reference and reused by gsuite.
+
+        With import processes, the leaf resources of PARALLEL_IMPORT_TYPES
+        are buffered and converted by a pool of worker processes, their rows
+        are stored before any row that is a child of them.
+
+        Args:
+            inventory (Inventory): The inventory storage to import from.
+            gcp_type_list (list): The gcp resource types to import.
+            gsuite_type_list (list): The gsuite principal types to import.
+            member_type_list (list): The gsuite membership types to import.
+
+        Returns:
+            int: Number of resources, dataset policies and service configs
+                imported.
+        """
+        gcp_types = frozenset(gcp_type_list)
+        gsuite_types = frozenset(gsuite_type_list)
+        member_types = frozenset(member_type_list)
+        group_names = {}
+
+        pool = None
+        leaf_items = []
+        leaf_ids = set()
+        if self.import_processes:
+            LOGGER.debug('Converting leaf resources in %s processes.',
+                         self.import_processes)
+            pool = multiprocessing.Pool(self.import_processes)
+
+        item_counter = 0
+        LOGGER.debug('Start storing inventory into models.')
+        try:
+            for idx, row in enumerate(inventory.iter_all(), start=1):
+                if leaf_ids and row.get_parent_id() in leaf_ids:
+                    self._store_leaf_resources(pool, leaf_items)
+                    leaf_ids.clear()
+
+                if (pool and row.get_category() == 'resource' and
+                        row.get_resource_type() in PARALLEL_IMPORT_TYPES):
+                    item_counter += 1
+                    leaf_items.append(self._read_leaf_resource(row))
+                    leaf_ids.add(row.id)
+                    if len(leaf_items) >= PARALLEL_IMPORT_ROWS:
+                        self._store_leaf_resources(pool, leaf_items)
+                        leaf_ids.clear()
+                else:
+                    item_counter += self._import_row(
+                        row, gcp_types, gsuite_types, member_types,
+                        group_names)
+
+                if not idx % 1000:
+                    # Flush database every 1000 rows
+                    LOGGER.debug('Flushing model write session: %s', idx)
+                    self.writer.flush()
+
+            if leaf_items:
+                self._store_leaf_resources(pool, leaf_items)
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
+
+        self._store_resource(None, self.last_res_type)
+        self._drop_pending_bindings()
+        self.writer.flush()
+        LOGGER.debug('Finished storing inventory into models.')
+
+        self._store_gsuite_membership_post()
+        self.dao.denorm_group_in_group_in_memory(self.session)
+        self.dao.number_resources(self.session)
+        return item_counter
+
+    def _import_row(self, row, gcp_types, gsuite_types, member_types,
+                    group_names):
+        """Route an inventory row to its handler.
+
+        Args:
+            row (object): The inventory row to import.
+            gcp_types (frozenset): The gcp resource types to import.
+            gsuite_types (frozenset): The gsuite principal types to import.
+            member_types (frozenset): The gsuite membership types to import.
+            group_names (dict): The group names by row id of the gsuite
+                groups, updated with the group of the row.
+
+        Returns:
+            int: The number of items imported from the row.
+        """
+        item_counter = 0
+        category = row.get_category()
+        res_type = row.get_resource_type()
+        if res_type in gcp_types:
+            if category == 'resource':
+                item_counter += 1
+                self.last_res_type = self._store_resource(
+                    row, self.last_res_type)
+            elif category == 'iam_policy':
+                self._store_iam_policy(*self._read_iam_policy(row))
+            elif category == 'dataset_policy':
+                item_counter += 1
+                self._convert_dataset_policy(row)
+            elif category == 'kubernetes_service_config':
+                item_counter += 1
+                self._convert_service_config(row)
+            elif category == 'enabled_apis':
+                self._convert_enabled_apis(row)
+        elif category == 'resource' and res_type in gsuite_types:
+            member = self._store_gsuite_principal(row)
+            if res_type == 'gsuite_group':
+                group_names[row.id] = member
+        elif category == 'resource' and res_type in member_types:
+            parent_group = group_names.get(row.get_parent_id())
+            if parent_group:
+                self._store_gsuite_membership(row, parent_group)
+        return item_counter
+
+    def _read_leaf_resource(self, row):
+        """Read a leaf resource row for the import worker processes.
+
+        Args:
+            row (object): The inventory row of the leaf resource.
+
+        Returns:
+            tuple: The arguments of _convert_leaf_resource.
+        """
+        parent_id = row.get_parent_id()
+        _, parent_full_name = self.resource_cache[parent_id]
+        return (row.id, row.get_resource_type(), row.get_resource_id(),
+                row.get_resource_data_raw(), parent_id, parent_full_name)
+
+    def _store_leaf_resources(self, pool, items):
+        """Convert leaf resources in the worker processes and store them.
+
+        Args:
+            pool (multiprocessing.Pool): The import worker processes.
+            items (list): The rows read by _read_leaf_resource, the list is
+                emptied.
+        """
+        for row_id, parent_id, columns in pool.imap(
+                _convert_leaf_resource, items, PARALLEL_IMPORT_CHUNK_SIZE):
+            parent, _ = self.resource_cache[parent_id]
+            resource = self.writer.add_resource(parent=parent, **columns)
+            self.resource_cache.add(row_id, parent_id, resource.type_name,
+                                    resource.full_name)
+        del items[:]
+
     @staticmethod
     def model_action_wrapper(session,
                              inventory_iterable,
@@ -357,6 +868,9 @@ class InventoryImporter(object):
         Args:
             principal (object): object to store.
 
+        Returns:
+            str: The type/name of the stored member.
+
         Raises:
             Exception: if the principal type is unknown.
         """
@@ -370,18 +884,26 @@ class InventoryImporter(object):
         else:
             raise Exception('Unknown gsuite principal: {}'.format(gsuite_type))
 
-        if member not in self.member_cache:
-            m_type, name = member.split('/', 1)
-            self.member_cache[member] = self.dao.TBL_MEMBER(
-                name=member,
-                type=m_type,
-                member_name=name)
-            self.session.add(self.member_cache[member])
+        self._add_gsuite_member(member)
+        return member
 
-    def _store_gsuite_membership_pre(self):
-        """Prepare storing gsuite memberships."""
+    def _add_gsuite_member(self, member):
+        """Add a gsuite member, unless it was already added.
 
-        pass
+        Args:
+            member (str): The type/name of the member.
+        """
+        if member in self.member_cache:
+            return
+        if member in self.member_cache_policies:
+            # Already added for an IAM policy binding read before it.
+            self.member_cache[member] = self.member_cache_policies.pop(member)
+            return
+        m_type, name = member.split('/', 1)
+        self.member_cache[member] = self.writer.add_member(
+            name=member,
+            type=m_type,
+            member_name=name)
 
     def _store_gsuite_membership_post(self):
         """Flush storing gsuite memberships."""
@@ -389,7 +911,7 @@ class InventoryImporter(object):
         if not self.member_cache:
             return
 
-        self.session.flush()
+        self.writer.flush()
 
         # session.execute automatically flushes
         if self.membership_items:
@@ -403,54 +925,20 @@ class InventoryImporter(object):
                     self.membership_items)
                 self.session.execute(stmt)
 
-    def _store_gsuite_membership(self, child, parent):
+    def _store_gsuite_membership(self, child, parent_group):
         """Store a gsuite principal such as a group, user or member.
 
         Args:
             child (object): member item.
-            parent (object): parent part of membership.
+            parent_group (str): type/name of the group of the membership.
         """
-
-        def member_name(child):
-            """Create the type:name representation for a non-group.
-
-            Args:
-                child (object): member to create representation from.
-
-            Returns:
-                str: type:name representation of the member.
-            """
-
-            data = child.get_resource_data()
-            return '{}/{}'.format(data['type'].lower(),
-                                  data['email'].lower())
-
-        def group_name(parent):
-            """Create the type:name representation for a group.
-
-            Args:
-                parent (object): group to create representation from.
-
-            Returns:
-                str: group:name representation of the group.
-            """
-
-            data = parent.get_resource_data()
-            return 'group/{}'.format(data['email'].lower())
+        data = child.get_resource_data()
 
         # Gsuite group members don't have to be part
         # of this domain, so we might see them for
         # the first time here.
-        member = member_name(child)
-        if member not in self.member_cache:
-            m_type, name = member.split('/', 1)
-            self.member_cache[member] = self.dao.TBL_MEMBER(
-                name=member,
-                type=m_type,
-                member_name=name)
-            self.session.add(self.member_cache[member])
-
-        parent_group = group_name(parent)
+        member = '{}/{}'.format(data['type'].lower(), data['email'].lower())
+        self._add_gsuite_member(member)
 
         if parent_group not in self.membership_map:
             self.membership_map[parent_group] = set()
@@ -458,41 +946,56 @@ class InventoryImporter(object):
         if member not in self.membership_map[parent_group]:
             self.membership_map[parent_group].add(member)
             self.membership_items.append(
-                dict(group_name=group_name(parent), members_name=member))
-
-    def _store_iam_policy_pre(self):
-        """Executed before iam policies are inserted."""
+                dict(group_name=parent_group, members_name=member))
 
-        pass
+    def _store_pending_bindings(self, role):
+        """Store the IAM policy bindings read before their role.
 
-    def _store_iam_policy_post(self):
-        """Executed after iam policies are inserted."""
-
-        # Store all members which are mentioned in policies
-        # that were not previously in groups or gsuite users.
-        self.session.flush()
+        Args:
+            role (str): The name of the role just imported.
+        """
+        for policy_type_name, members in self.pending_bindings.pop(role, []):
+            self._store_iam_policy(policy_type_name, [(role, members)])
+
+    def _drop_pending_bindings(self):
+        """Warn about the IAM policy bindings of roles never imported."""
+        for role, bindings in self.pending_bindings.iteritems():
+            msg = 'Role reference in iam policy not found: {}'.format(role)
+            for _ in bindings:
+                self.model.add_warning(msg)
+        self.pending_bindings = {}
 
-    def _store_iam_policy(self, policy):
-        """Store the iam policy of the resource.
+    def _read_iam_policy(self, policy):
+        """Store the iam policy resource and read its bindings.
 
         Args:
             policy (object): IAM policy to store.
 
-        Raises:
-            KeyError: if member could not be found in any cache.
+        Returns:
+            tuple: The type/name of the resource and its list of
+                (role, members) bindings, to be stored by _store_iam_policy.
         """
+        self._convert_iam_policy(policy)
+        bindings = [(binding['role'], tuple(set(binding['members'])))
+                    for binding in
+                    policy.get_resource_data().get('bindings', [])]
+        return self._type_name(policy), bindings
+
+    def _store_iam_policy(self, policy_type_name, bindings):
+        """Store the iam policy bindings of the resource.
 
-        bindings = policy.get_resource_data().get('bindings', [])
-        policy_type_name = self._type_name(policy)
-        for binding in bindings:
-            role = binding['role']
+        Args:
+            policy_type_name (str): The type/name of the resource.
+            bindings (list): The (role, members) bindings of the policy.
+        """
+        for role, members in bindings:
             if role not in self.role_cache:
-                msg = 'Role reference in iam policy not found: {}'.format(role)
-                self.model.add_warning(msg)
+                # The role may still be imported later in the scan.
+                self.pending_bindings.setdefault(role, []).append(
+                    (policy_type_name, members))
                 continue
 
             # binding['members'] can have duplicate ids
-            members = set(binding['members'])
             db_members = set()
             for member in members:
                 member = member.replace(':', '/', 1).lower()
@@ -511,19 +1014,17 @@ class InventoryImporter(object):
                     except ValueError:
                         # Special groups like 'allUsers' done specify a type
                         m_type, name = member, member
-                    self.member_cache_policies[member] = self.dao.TBL_MEMBER(
-                        name=member,
-                        type=m_type,
-                        member_name=name)
-                    self.session.add(self.member_cache_policies[member])
+                    self.member_cache_policies[member] = (
+                        self.writer.add_member(
+                            name=member,
+                            type=m_type,
+                            member_name=name))
                 db_members.add(self.member_cache_policies[member])
 
-            binding_object = self.dao.TBL_BINDING(
+            self.writer.add_binding(
                 resource_type_name=policy_type_name,
                 role_name=role,
                 members=list(db_members))
-            self.session.add(binding_object)
-        self._convert_iam_policy(policy)
 
     def _store_resource(self, resource, last_res_type=None):
         """Store an inventory resource in the database.
@@ -551,9 +1052,9 @@ class InventoryImporter(object):
             'billing_account': (None,
                                 self._convert_billing_account,
                                 None),
-            'role': (self._convert_role_pre,
+            'role': (None,
                      self._convert_role,
-                     self._convert_role_post),
+                     None),
             'appengine_app': (None,
                               self._convert_appengine_resource,
                               None),
@@ -670,7 +1171,7 @@ class InventoryImporter(object):
         data = gae_resource.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             gae_resource)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=gae_resource.get_resource_id(),
@@ -679,8 +1180,7 @@ class InventoryImporter(object):
             data=gae_resource.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, gae_resource.id)
+        self._add_to_cache(resource, gae_resource)
 
     def _convert_bucket(self, bucket):
         """Convert a bucket to a database object.
@@ -691,7 +1191,7 @@ class InventoryImporter(object):
         data = bucket.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             bucket)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=bucket.get_resource_id(),
@@ -701,8 +1201,7 @@ class InventoryImporter(object):
             data=bucket.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, bucket.id)
+        self._add_to_cache(resource, bucket)
 
     def _convert_kubernetes_cluster(self, cluster):
         """Convert an AppEngine resource to a database object.
@@ -713,7 +1212,7 @@ class InventoryImporter(object):
         data = cluster.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             cluster)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=cluster.get_resource_id(),
@@ -722,8 +1221,7 @@ class InventoryImporter(object):
             data=cluster.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, cluster.id)
+        self._add_to_cache(resource, cluster)
 
     def _convert_service_config(self, service_config):
         """Convert Kubernetes Service Config to a database object.
@@ -736,7 +1234,7 @@ class InventoryImporter(object):
             service_config.get_category(),
             parent.type_name)
         sc_res_name = to_full_resource_name(full_res_name, sc_type_name)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=sc_res_name,
             type_name=sc_type_name,
             name=service_config.get_resource_id(),
@@ -744,8 +1242,7 @@ class InventoryImporter(object):
             data=service_config.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, service_config.id)
+        self._add_to_cache(resource, service_config)
 
     def _convert_sink(self, sink):
         """Convert a log sink to a database object.
@@ -755,7 +1252,7 @@ class InventoryImporter(object):
         """
         parent, full_res_name, type_name = self._full_resource_name(sink)
         data = sink.get_resource_data()
-        resource = self.dao.TBL_RESOURCE(
+        self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=sink.get_resource_id(),
@@ -765,8 +1262,6 @@ class InventoryImporter(object):
             data=sink.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-
     def _convert_dataset(self, dataset):
         """Convert a dataset to a database object.
 
@@ -775,7 +1270,7 @@ class InventoryImporter(object):
         """
         parent, full_res_name, type_name = self._full_resource_name(
             dataset)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=dataset.get_resource_id(),
@@ -783,8 +1278,7 @@ class InventoryImporter(object):
             data=dataset.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, dataset.id)
+        self._add_to_cache(resource, dataset)
 
     def _convert_enabled_apis(self, enabled_apis):
         """Convert a description of enabled APIs to a database object.
@@ -797,7 +1291,7 @@ class InventoryImporter(object):
             enabled_apis.get_category(),
             ':'.join(parent.type_name.split('/')))
         apis_res_name = to_full_resource_name(full_res_name, apis_type_name)
-        resource = self.dao.TBL_RESOURCE(
+        self.writer.add_resource(
             full_name=apis_res_name,
             type_name=apis_type_name,
             name=enabled_apis.get_resource_id(),
@@ -805,8 +1299,6 @@ class InventoryImporter(object):
             data=enabled_apis.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-
     def _convert_dataset_policy(self, dataset_policy):
         """Convert a dataset policy to a database object.
 
@@ -820,7 +1312,7 @@ class InventoryImporter(object):
             dataset_policy.get_category(),
             dataset_policy.get_resource_id())
         policy_res_name = to_full_resource_name(full_res_name, policy_type_name)
-        resource = self.dao.TBL_RESOURCE(
+        self.writer.add_resource(
             full_name=policy_res_name,
             type_name=policy_type_name,
             name=dataset_policy.get_resource_id(),
@@ -828,8 +1320,6 @@ class InventoryImporter(object):
             data=dataset_policy.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-
     def _convert_computeproject(self, computeproject):
         """Convert a computeproject to a database object.
 
@@ -839,7 +1329,7 @@ class InventoryImporter(object):
         data = computeproject.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             computeproject)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=computeproject.get_resource_id(),
@@ -849,8 +1339,7 @@ class InventoryImporter(object):
             data=computeproject.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, computeproject.id)
+        self._add_to_cache(resource, computeproject)
 
     def _convert_iam_policy(self, iam_policy):
         """Convert an IAM policy to a database object.
@@ -866,7 +1355,7 @@ class InventoryImporter(object):
         iam_policy_full_res_name = to_full_resource_name(
             full_res_name,
             iam_policy_type_name)
-        resource = self.dao.TBL_RESOURCE(
+        self.writer.add_resource(
             full_name=iam_policy_full_res_name,
             type_name=iam_policy_type_name,
             name=iam_policy.get_resource_id(),
@@ -874,8 +1363,6 @@ class InventoryImporter(object):
             data=iam_policy.get_resource_data_raw(),
             parent_type_name=parent_type_name)
 
-        self.session.add(resource)
-
     def _convert_disk(self, disk):
         """Convert a disk to a database object.
 
@@ -885,7 +1372,7 @@ class InventoryImporter(object):
         data = disk.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             disk)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=disk.get_resource_id(),
@@ -895,8 +1382,7 @@ class InventoryImporter(object):
             data=disk.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, disk.id)
+        self._add_to_cache(resource, disk)
 
     def _convert_image(self, image):
         """Convert a image to a database object.
@@ -907,7 +1393,7 @@ class InventoryImporter(object):
         data = image.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             image)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=image.get_resource_id(),
@@ -917,8 +1403,7 @@ class InventoryImporter(object):
             data=image.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, image.id)
+        self._add_to_cache(resource, image)
 
     def _convert_instancegroup(self, instancegroup):
         """Convert a instancegroup to a database object.
@@ -929,7 +1414,7 @@ class InventoryImporter(object):
         data = instancegroup.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             instancegroup)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=instancegroup.get_resource_id(),
@@ -939,8 +1424,7 @@ class InventoryImporter(object):
             data=instancegroup.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, instancegroup.id)
+        self._add_to_cache(resource, instancegroup)
 
     def _convert_instancegroupmanager(self, instancegroupmanager):
         """Convert a instancegroupmanager to a database object.
@@ -951,7 +1435,7 @@ class InventoryImporter(object):
         data = instancegroupmanager.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             instancegroupmanager)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=instancegroupmanager.get_resource_id(),
@@ -961,8 +1445,7 @@ class InventoryImporter(object):
             data=instancegroupmanager.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, instancegroupmanager.id)
+        self._add_to_cache(resource, instancegroupmanager)
 
     def _convert_instancetemplate(self, instancetemplate):
         """Convert a instancetemplate to a database object.
@@ -973,7 +1456,7 @@ class InventoryImporter(object):
         data = instancetemplate.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             instancetemplate)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=instancetemplate.get_resource_id(),
@@ -983,8 +1466,7 @@ class InventoryImporter(object):
             data=instancetemplate.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, instancetemplate.id)
+        self._add_to_cache(resource, instancetemplate)
 
     def _convert_instance(self, instance):
         """Convert a instance to a database object.
@@ -995,7 +1477,7 @@ class InventoryImporter(object):
         data = instance.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             instance)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=instance.get_resource_id(),
@@ -1005,8 +1487,7 @@ class InventoryImporter(object):
             data=instance.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, instance.id)
+        self._add_to_cache(resource, instance)
 
     def _convert_lien(self, lien):
         """Convert a lien to a database object.
@@ -1016,7 +1497,7 @@ class InventoryImporter(object):
         """
         data = lien.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(lien)
-        resource = self.dao.TBL_RESOURCE(
+        self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=lien.get_resource_id(),
@@ -1025,8 +1506,6 @@ class InventoryImporter(object):
             data=lien.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-
     def _convert_firewall(self, firewall):
         """Convert a firewall to a database object.
 
@@ -1036,7 +1515,7 @@ class InventoryImporter(object):
         data = firewall.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             firewall)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=firewall.get_resource_id(),
@@ -1046,8 +1525,7 @@ class InventoryImporter(object):
             data=firewall.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, firewall.id)
+        self._add_to_cache(resource, firewall)
 
     def _convert_backendservice(self, backendservice):
         """Convert a backendservice to a database object.
@@ -1058,7 +1536,7 @@ class InventoryImporter(object):
         data = backendservice.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             backendservice)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=backendservice.get_resource_id(),
@@ -1068,8 +1546,7 @@ class InventoryImporter(object):
             data=backendservice.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, backendservice.id)
+        self._add_to_cache(resource, backendservice)
 
     def _convert_forwardingrule(self, forwardingrule):
         """Convert a forwarding rule to a database object.
@@ -1080,7 +1557,7 @@ class InventoryImporter(object):
         data = forwardingrule.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             forwardingrule)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=forwardingrule.get_resource_id(),
@@ -1090,8 +1567,7 @@ class InventoryImporter(object):
             data=forwardingrule.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, forwardingrule.id)
+        self._add_to_cache(resource, forwardingrule)
 
     def _convert_network(self, network):
         """Convert a network to a database object.
@@ -1102,7 +1578,7 @@ class InventoryImporter(object):
         data = network.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             network)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=network.get_resource_id(),
@@ -1112,8 +1588,7 @@ class InventoryImporter(object):
             data=network.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, network.id)
+        self._add_to_cache(resource, network)
 
     def _convert_snapshot(self, snapshot):
         """Convert a snapshot to a database object.
@@ -1124,7 +1599,7 @@ class InventoryImporter(object):
         data = snapshot.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             snapshot)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=snapshot.get_resource_id(),
@@ -1134,8 +1609,7 @@ class InventoryImporter(object):
             data=snapshot.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, snapshot.id)
+        self._add_to_cache(resource, snapshot)
 
     def _convert_subnetwork(self, subnetwork):
         """Convert a subnetwork to a database object.
@@ -1146,7 +1620,7 @@ class InventoryImporter(object):
         data = subnetwork.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             subnetwork)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=subnetwork.get_resource_id(),
@@ -1156,8 +1630,7 @@ class InventoryImporter(object):
             data=subnetwork.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, subnetwork.id)
+        self._add_to_cache(resource, subnetwork)
 
     def _convert_cloudsqlinstance(self, cloudsqlinstance):
         """Convert a cloudsqlinstance to a database object.
@@ -1174,7 +1647,7 @@ class InventoryImporter(object):
         type_name = to_type_name(cloudsqlinstance.get_resource_type(),
                                  resource_identifier)
 
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=cloudsqlinstance.get_resource_id(),
@@ -1184,8 +1657,7 @@ class InventoryImporter(object):
             data=cloudsqlinstance.get_resource_data_raw(),
             parent=parent)
 
-        self.session.add(resource)
-        self._add_to_cache(resource, cloudsqlinstance.id)
+        self._add_to_cache(resource, cloudsqlinstance)
 
     def _convert_serviceaccount(self, service_account):
         """Convert a service account to a database object.
@@ -1196,7 +1668,7 @@ class InventoryImporter(object):
         data = service_account.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             service_account)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=service_account.get_resource_id(),
@@ -1205,8 +1677,7 @@ class InventoryImporter(object):
             email=data.get('email', ''),
             data=service_account.get_resource_data_raw(),
             parent=parent)
-        self.session.add(resource)
-        self._add_to_cache(resource, service_account.id)
+        self._add_to_cache(resource, service_account)
 
     def _convert_serviceaccount_key(self, service_account_key):
         """Convert a service account key to a database object.
@@ -1218,7 +1689,7 @@ class InventoryImporter(object):
         data = service_account_key.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             service_account_key)
-        resource = self.dao.TBL_RESOURCE(
+        self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=service_account_key.get_resource_id(),
@@ -1227,7 +1698,6 @@ class InventoryImporter(object):
             email=data.get('email', ''),
             data=service_account_key.get_resource_data_raw(),
             parent=parent)
-        self.session.add(resource)
 
     def _convert_folder(self, folder):
         """Convert a folder to a database object.
@@ -1243,7 +1713,7 @@ class InventoryImporter(object):
         else:
             parent, full_res_name, type_name = self._full_resource_name(
                 folder)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=folder.get_resource_id(),
@@ -1251,8 +1721,7 @@ class InventoryImporter(object):
             display_name=data.get('displayName', ''),
             data=folder.get_resource_data_raw(),
             parent=parent)
-        self.session.add(resource)
-        self._add_to_cache(resource, folder.id)
+        self._add_to_cache(resource, folder)
 
     def _convert_project(self, project):
         """Convert a project to a database object.
@@ -1268,7 +1737,7 @@ class InventoryImporter(object):
         else:
             parent, full_res_name, type_name = self._full_resource_name(
                 project)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=project.get_resource_id(),
@@ -1276,8 +1745,7 @@ class InventoryImporter(object):
             display_name=data.get('name', ''),
             data=project.get_resource_data_raw(),
             parent=parent)
-        self.session.add(resource)
-        self._add_to_cache(resource, project.id)
+        self._add_to_cache(resource, project)
 
     def _convert_billing_account(self, billing_account):
         """Convert a billing account to a database object.
@@ -1289,7 +1757,7 @@ class InventoryImporter(object):
         data = billing_account.get_resource_data()
         parent, full_res_name, type_name = self._full_resource_name(
             billing_account)
-        resource = self.dao.TBL_RESOURCE(
+        resource = self.writer.add_resource(
             full_name=full_res_name,
             type_name=type_name,
             name=billing_account.get_resource_id(),
@@ -1297,19 +1765,7 @@ class InventoryImporter(object):
             display_name=data.get('displayName', ''),
             data=billing_account.get_resource_data_raw(),
             parent=parent)
-        self.session.add(resource)
-        self._add_to_cache(resource, billing_account.id)
-
-    def _convert_role_pre(self):
-        """Executed before roles are handled. Prepares for bulk insert."""
-
-        pass
-
-    def _convert_role_post(self):
-        """Executed after all roles were handled. Performs bulk insert."""
-
-        self.session.add_all(self.permission_cache.values())
-        self.session.add_all(self.role_cache.values())
+        self._add_to_cache(resource, billing_account)
 
     def _convert_role(self, role):
         """Convert a role to a database object.
@@ -1328,14 +1784,14 @@ class InventoryImporter(object):
         else:
             for perm_name in data['includedPermissions']:
                 if perm_name not in self.permission_cache:
-                    permission = self.dao.TBL_PERMISSION(
+                    permission = self.writer.add_permission(
                         name=perm_name)
                     self.permission_cache[perm_name] = permission
                 db_permissions.append(self.permission_cache[perm_name])
 
         if not self._is_role_unique(data['name']):
             return
-        dbrole = self.dao.TBL_ROLE(
+        dbrole = self.writer.add_role(
             name=data['name'],
             title=data.get('title', ''),
             stage=data.get('stage', ''),
@@ -1343,10 +1799,11 @@ class InventoryImporter(object):
             custom=is_custom,
             permissions=db_permissions)
         self.role_cache[data['name']] = dbrole
+        self._store_pending_bindings(data['name'])
 
         if is_custom:
             parent, full_res_name, type_name = self._full_resource_name(role)
-            role_resource = self.dao.TBL_RESOURCE(
+            role_resource = self.writer.add_resource(
                 full_name=full_res_name,
                 type_name=type_name,
                 name=role.get_resource_id(),
@@ -1355,8 +1812,7 @@ class InventoryImporter(object):
                 data=role.get_resource_data_raw(),
                 parent=parent)
 
-            self._add_to_cache(role_resource, role.id)
-            self.session.add(role_resource)
+            self._add_to_cache(role_resource, role)
 
     def _convert_organization(self, organization):
         """Convert an organization a database object.
@@ -1369,7 +1825,7 @@ class InventoryImporter(object):
         self.found_root = True
         data = organization.get_resource_data()
         type_name = self._type_name(organization)
-        org = self.dao.TBL_RESOURCE(
+        org = self.writer.add_resource(
             full_name=to_full_resource_name('', type_name),
             type_name=type_name,
             name=organization.get_resource_id(),
@@ -1378,8 +1834,7 @@ class InventoryImporter(object):
             data=organization.get_resource_data_raw(),
             parent=None)
 
-        self._add_to_cache(org, organization.id)
-        self.session.add(org)
+        self._add_to_cache(org, organization)
 
     def _is_role_unique(self, role_name):
         """Check to see if the session contains Role with
@@ -1401,16 +1856,16 @@ class InventoryImporter(object):
             return False
         return True
 
-    def _add_to_cache(self, resource, resource_id):
+    def _add_to_cache(self, resource, row):
         """Add a resource to the cache for parent lookup.
 
         Args:
-            resource (object): Resource to put in the cache.
-            resource_id (int): The database key for the resource.
+            resource (ResourceRef): Resource to put in the cache.
+            row (object): The inventory row of the resource.
         """
 
-        full_res_name = resource.full_name
-        self.resource_cache[resource_id] = (resource, full_res_name)
+        self.resource_cache.add(row.id, row.get_parent_id(),
+                                resource.type_name, resource.full_name)
 
     def _get_parent(self, resource):
         """Return the parent object for a resource from cache.
@@ -1419,7 +1874,7 @@ class InventoryImporter(object):
             resource (object): Resource whose parent to look for.
 
         Returns:
-            tuple: cached object and full resource name
+            tuple: cached ResourceRef and full resource name
         """
 
         parent_id = resource.get_parent_id()
@@ -52,6 +52,8 @@ class Modeller(object):
         LOGGER.debug('Created model_handle: %s', model_handle)
         scoped_session, data_access = model_manager.get(model_handle)
         readonly_session = model_manager.get_readonly_session()
+        import_processes = (
+            self.config.inventory_config.get_model_import_processes())
 
         def do_import():
             """Import runnable."""
@@ -64,7 +66,8 @@ class Modeller(object):
                     model_manager.model(model_handle, expunge=False),
                     data_access,
                     self.config,
-                    inventory_index_id)
+                    inventory_index_id,
+                    import_processes=import_processes)
                 import_runner.run()
 
         if background:
@@ -17,6 +17,7 @@
 from collections import defaultdict
 import hashlib
 import json
+import threading
 
 from sqlalchemy import BigInteger
 from sqlalchemy import Column
@@ -209,6 +210,8 @@ class ViolationAccess(object):
             session (Session): SQLAlchemy session object.
         """
         self.session = session
+        # Serializes the use of the session by concurrent scanners.
+        self.lock = threading.RLock()
 
     def create(self, violations, scanner_index_id):
         """Save violations to the db table.
@@ -219,6 +222,7 @@ class ViolationAccess(object):
                 scanner run.
         """
         created_at_datetime = date_time.get_utc_now_datetime()
+        rows = []
         for violation in violations:
             violation_hash = _create_violation_hash(
                 violation.get('full_name', ''),
@@ -241,7 +245,9 @@ class ViolationAccess(object):
                 violation_hash=violation_hash,
                 violation_type=violation.get('violation_type')
             )
-            self.session.add(violation)
+            rows.append(violation)
+        with self.lock:
+            self.session.add_all(rows)
 
     def list(self, inv_index_id=None, scanner_index_id=None):
         """List all violations from the db table.
@@ -277,6 +277,84 @@ class BaseRepositoryTest(unittest_utils.ForsetiTestCase):
 
         self.assertEqual(http_objects[0], http_objects[1])
 
+    def test_pooled_queries_share_http_objects(self):
+        """Validate concurrent queries only use the pooled connections."""
+        used_http_objects = set()
+
+        def execute(http, num_retries):
+            used_http_objects.add(http.http)
+            return {'items': []}
+
+        gcp_service_mock = mock.Mock()
+        gcp_service_mock.fake_component.return_value.get.return_value = (
+            mock.Mock(execute=execute))
+        credentials_mock = mock.Mock(spec=credentials.Credentials)
+        repo = base.GCPRepository(
+            gcp_service=gcp_service_mock,
+            credentials=credentials_mock,
+            component='fake_component',
+            use_cached_http=True)
+
+        results = []
+
+        def query():
+            for i in range(5):
+                results.append(repo.execute_query('get', {'project': i}))
+
+        base.configure_http_pool(2)
+        try:
+            threads = [threading.Thread(target=query) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            base.configure_http_pool(0)
+
+        self.assertEqual([{'items': []}] * 40, results)
+        self.assertLessEqual(len(used_http_objects), 2)
+
+    def test_execute_batch_query(self):
+        """Validate queries are batched and counted by the rate limiter."""
+        batches = []
+
+        class FakeBatch(object):
+            def __init__(self):
+                self.requests = []
+                batches.append(self)
+
+            def add(self, request, callback, request_id):
+                self.requests.append((request, callback, request_id))
+
+            def execute(self, http):
+                for request, callback, request_id in self.requests:
+                    if request == 'get-3':
+                        callback(request_id, None, ValueError('failed'))
+                    else:
+                        callback(request_id, {'name': request}, None)
+
+        gcp_service_mock = mock.Mock()
+        gcp_service_mock.new_batch_http_request.side_effect = FakeBatch
+        gcp_service_mock.fake_component.return_value.get.side_effect = (
+            lambda project: 'get-{}'.format(project))
+        rate_limiter_mock = mock.MagicMock()
+        repo = base.GCPRepository(
+            gcp_service=gcp_service_mock,
+            credentials=mock.Mock(spec=credentials.Credentials),
+            component='fake_component',
+            rate_limiter=rate_limiter_mock)
+
+        results = repo.execute_batch_query(
+            'get', [{'project': i} for i in range(5)], batch_size=2)
+
+        self.assertEqual([2, 2, 1], [len(b.requests) for b in batches])
+        self.assertEqual(5, rate_limiter_mock.__enter__.call_count)
+        self.assertEqual({'name': 'get-0'}, results[0][0])
+        self.assertIsNone(results[0][1])
+        self.assertIsNone(results[3][0])
+        self.assertIsInstance(results[3][1], ValueError)
+        self.assertEqual({'name': 'get-4'}, results[4][0])
+
 
 if __name__ == '__main__':
     unittest.main()
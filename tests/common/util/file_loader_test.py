@@ -105,5 +105,15 @@ class FileLoaderTest(ForsetiTestCase):
         finally:
             os.unlink(file_path)
 
+    def test_stream_file_from_gcs(self):
+        """Test lines split across downloaded chunks are joined."""
+        mock_storage_client = mock.Mock()
+        mock_storage_client.download_chunks.return_value = iter(
+            ['{"a": 1}\n{"b"', ': 2}\n', '{"c": 3}'])
+        lines = list(file_loader.stream_file_from_gcs(
+            'gs://fake/file.dump', storage_client=mock_storage_client))
+
+        self.assertEqual(['{"a": 1}\n', '{"b": 2}\n', '{"c": 3}'], lines)
+
 if __name__ == '__main__':
     unittest.main()
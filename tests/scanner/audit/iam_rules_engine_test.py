@@ -2023,6 +2023,63 @@ class IamRulesEngineTest(ForsetiTestCase):
 
         self.assertEqual(expected_violations, actual_violations)
 
+    def test_member_index_matches_like_rule_members(self):
+        """Test the member index matches like IamPolicyMember.matches."""
+        rule_members = [
+            IamPolicyMember.create_from(m) for m in [
+                'user:*@company.com',
+                'user:Owner@company.com',
+                'group:*@googlegroups.com',
+                'serviceAccount:*@*.gserviceaccount.com',
+                'domain:example.com',
+                'allUsers',
+            ]]
+        policy_members = [
+            'user:foo@company.com',
+            'user:OWNER@company.com',
+            'user:@company.com',
+            'user:someone@example.com',
+            'user:someone@notexample.com',
+            'group:some-group@googlegroups.com',
+            'group:some-group@company.com',
+            'serviceAccount:12345@iam.gserviceaccount.com',
+            'domain:EXAMPLE.com',
+            'allUsers',
+            'allAuthenticatedUsers',
+        ]
+        for count in range(len(rule_members) + 1):
+            for members in itertools.combinations(rule_members, count):
+                member_index = ire._MemberIndex(members)
+                for policy_member in policy_members:
+                    self.assertEqual(
+                        any(m.matches(policy_member) for m in members),
+                        member_index.matches(policy_member),
+                        (members, policy_member))
+
+    def test_indexed_rule_roles_keep_binding_order(self):
+        """Test exact and glob roles of a rule both match a policy role."""
+        rule = scanner_rules.Rule(
+            'test rule', 0,
+            [IamPolicyBinding.create_from(b) for b in [
+                {'role': 'roles/*', 'members': ['user:*@company.com']},
+                {'role': 'roles/Owner', 'members': ['user:a@company.com']},
+                {'role': 'roles/editor', 'members': ['user:b@company.com']},
+            ]],
+            mode='blacklist')
+        policy_bindings = [IamPolicyBinding.create_from({
+            'role': 'roles/owner',
+            'members': ['user:a@company.com', 'user:c@other.com'],
+        })]
+        resource_rule = ire.ResourceRules(rules=set([rule]))
+        results = list(resource_rule.find_mismatches(
+            self.project1, policy_bindings))
+
+        violating_members = tuple([IamPolicyMember.create_from(
+            'user:a@company.com')])
+        self.assertEqual(
+            [('roles/owner', violating_members)] * 2,
+            [(r.role, r.members) for r in results])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -526,6 +526,20 @@ class IapScannerTest(ForsetiTestCase):
                 iap_enabled=True,
             ), iap_resources[BACKEND_SERVICES['bs1'].key])
 
+    @mock.patch.object(
+        iap_scanner.IapScanner, '_iter_resources', autospec=True,
+        side_effect=base_scanner.BaseScanner._iter_resources)
+    def test_retrieve_queries_each_type_once(self, mock_iter_resources):
+        resources = list(self.scanner._retrieve())
+        self.assertEquals(1, len(resources))
+        self.assertEquals(
+            sorted(['project', 'backendservice', 'firewall', 'instance',
+                    'instancegroup', 'instancegroupmanager',
+                    'instancetemplate']),
+            sorted(call[0][1] for call in mock_iter_resources.call_args_list))
+        for call in mock_iter_resources.call_args_list:
+            self.assertNotIn('parent_type_name', call[1])
+
     @mock.patch.object(
         iap_scanner.IapScanner, '_output_results_to_db', autospec=True)
     def test_run_scanner(self, mock_output_results):
@@ -14,6 +14,7 @@
 """Scanner runner script test."""
 
 from datetime import datetime, timedelta
+import json
 import mock
 from sqlalchemy.orm import sessionmaker
 import unittest
@@ -49,6 +50,8 @@ TWO_SCANNERS = {'scanners': [
     {'name': 'iam_policy', 'enabled': False}
 ]}
 
+TWO_PARALLEL_SCANNERS = dict(TWO_SCANNERS, parallel_scanners=2)
+
 class ScannerRunnerTest(scanner_base_db.ScannerBaseDbTestCase):
 
     def setUp(self):
@@ -91,6 +94,52 @@ class ScannerRunnerTest(scanner_base_db.ScannerBaseDbTestCase):
                 self.assertTrue(closing_mock.called)
                 self.assertEquals(1, closing_mock.call_count)
 
+    @mock.patch(
+        'google.cloud.forseti.scanner.scanners.bucket_rules_scanner.buckets_rules_engine', autospec=True)
+    @mock.patch(
+        'google.cloud.forseti.services.base.config.ServiceConfig',
+        autospec=True)
+    def test_run_parallel_scanners(
+        self, mock_service_config, mock_bucket_rules_engine):
+        """Test that concurrent scanners are all run and measured."""
+        mock_service_config.get_global_config.return_value = FAKE_GLOBAL_CONFIGS
+        mock_service_config.get_scanner_config.return_value = (
+            TWO_PARALLEL_SCANNERS)
+        mock_service_config.engine = mock.MagicMock()
+        mock_service_config.model_manager = mock.MagicMock()
+        mock_scoped_session = mock.MagicMock()
+        mock_data_access = mock.MagicMock()
+        mock_service_config.model_manager.get.return_value = (
+            mock_scoped_session, mock_data_access)
+        mock_data_access.scanner_iter.return_value = []
+        with mock.patch.object(scanner, 'init_scanner_index'):
+            with mock.patch.object(scanner, 'mark_scanner_index_complete') as closing_mock:
+                scanner.run('m1', mock.MagicMock(), mock_service_config)
+                _, _, succeeded, failed, scanner_stats = (
+                    closing_mock.call_args[0])
+                expected = set(['BucketsAclScanner', 'CloudSqlAclScanner'])
+                self.assertEquals(expected, set(succeeded + failed))
+                self.assertEquals(expected, set(scanner_stats))
+                for stats in scanner_stats.values():
+                    self.assertIn('wall_time_seconds', stats)
+                    self.assertIn('peak_memory_kb', stats)
+
+    @mock.patch.object(date_time, 'get_utc_now_datetime')
+    def test_mark_scanner_index_complete_with_stats(self, mock_date_time):
+        start = datetime.utcnow()
+        end = start + timedelta(minutes=5)
+        mock_date_time.side_effect = [start, end]
+
+        scanner_index_id = scanner.init_scanner_index(
+            self.session, self.inv_index_id2)
+        stats = {'IamPolicyScanner': {'wall_time_seconds': 1.5,
+                                      'peak_memory_kb': 1024}}
+        scanner.mark_scanner_index_complete(
+            self.session, scanner_index_id, ['IamPolicyScanner'], [], stats)
+        db_row = (self.session.query(scanner_dao.ScannerIndex)
+                  .filter(scanner_dao.ScannerIndex.id == scanner_index_id).one())
+        self.assertEquals({'scanner_stats': stats}, json.loads(db_row.message))
+
     @mock.patch.object(date_time, 'get_utc_now_datetime')
     def test_init_scanner_index(self, mock_date_time):
         utc_now = datetime.utcnow()
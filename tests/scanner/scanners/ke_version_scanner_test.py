@@ -20,6 +20,8 @@ import mock
 from tests import unittest_utils
 from tests.services.util.db import create_test_engine
 from google.cloud.forseti.common.gcp_type import resource as resource_mod
+from google.cloud.forseti.scanner import resource_snapshot
+from google.cloud.forseti.scanner.scanners import base_scanner
 from google.cloud.forseti.scanner.scanners import ke_version_scanner
 from google.cloud.forseti.services.dao import ModelManager
 
@@ -208,6 +210,37 @@ class KeVersionScannerTest(unittest_utils.ForsetiTestCase):
         mock_output_results.assert_called_once_with(mock.ANY,
                                                     expected_violations)
 
+    @mock.patch.object(
+        ke_version_scanner.KeVersionScanner, '_iter_resources',
+        autospec=True, side_effect=base_scanner.BaseScanner._iter_resources)
+    def test_retrieve_server_configs_once(self, mock_iter_resources):
+        ke_clusters = self.scanner._retrieve()
+        self.assertEqual(2, mock_iter_resources.call_count)
+        self.assertEqual(4, len(ke_clusters))
+        server_config = ke_clusters[0].server_config
+        self.assertEqual('1.7.11-gke.1',
+                         server_config['defaultClusterVersion'])
+        for ke_cluster in ke_clusters:
+            self.assertIs(server_config, ke_cluster.server_config)
+
+    @mock.patch.object(
+        ke_version_scanner.KeVersionScanner,
+        '_output_results_to_db', autospec=True)
+    def test_run_scanner_with_resource_snapshot(self, mock_output_results):
+        self.scanner.run()
+        expected_violations = mock_output_results.call_args[0][1]
+
+        snapshot = resource_snapshot.ResourceSnapshot(
+            self.service_config.model_manager, self.model_name)
+        self.scanner.resource_snapshot = snapshot
+        self.scanner.run()
+        mock_output_results.assert_called_with(mock.ANY, expected_violations)
+        self.assertEqual(
+            4, len(snapshot.resources('kubernetes_service_config')))
+        self.assertEqual(
+            4, len(snapshot.resources(
+                'kubernetes_cluster', parent_type_name='project/foo')))
+
 
 if __name__ == '__main__':
     unittest.main()
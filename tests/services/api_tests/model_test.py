@@ -193,6 +193,59 @@ class ExplainerTest(ForsetiTestCase):
                                  ]))
         self.setup.run(test)
 
+    def test_list_resources_paged(self):
+        """Test listing resources page by page."""
+
+        def test(client):
+            """Test implementation with API client."""
+            names = []
+            page_token = ''
+            while True:
+                reply = client.explain.list_resources('', page_token, 4)
+                self.assertTrue(len(reply.full_resource_names) <= 4)
+                names.extend(reply.full_resource_names)
+                page_token = reply.next_page_token
+                if not page_token:
+                    break
+            self.assertEqual(sorted(names), names)
+            self.assertEqual(set(names),
+                             set([
+                                 'organization/org1',
+                                 'project/project2',
+                                 'vm/instance-1',
+                                 'bucket/bucket2',
+                                 'project/project1',
+                                 'bucket/bucket1'
+                                 ]))
+        self.setup.run(test)
+
+    def test_stream_members_and_roles(self):
+        """Test streaming members and roles page by page."""
+
+        def test(client):
+            """Test implementation with API client."""
+            pages = [page.member_names
+                     for page in client.explain.stream_members('', 2)]
+            self.assertEqual([2, 2, 2, 2, 1], [len(page) for page in pages])
+            self.assertEqual(set([
+                'group/a',
+                'group/b',
+                'user/a',
+                'user/b',
+                'user/c',
+                'user/d',
+                'user/e',
+                'group/c',
+                'user/f'
+                ]), set(name for page in pages for name in page))
+
+            role_names = [name
+                          for page in client.explain.stream_roles('role/')
+                          for name in page.role_names]
+            self.assertEqual(['role/a', 'role/b', 'role/c', 'role/d'],
+                             role_names)
+        self.setup.run(test)
+
     def test_get_iam_policy(self):
         """Test get_iam_policy."""
 
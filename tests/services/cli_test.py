@@ -28,6 +28,7 @@ import unittest
 import grpc
 
 from google.cloud.forseti.services import cli
+from google.cloud.forseti.services.explain import explain_pb2
 from tests.unittest_utils import ForsetiTestCase
 
 CLIENT = mock.Mock()
@@ -64,9 +65,12 @@ CLIENT.model.delete_model = mock.Mock(return_value='test')
 CLIENT.model.new_model = mock.Mock(return_value='test')
 
 CLIENT.explain = CLIENT
-CLIENT.explain.list_resources = mock.Mock(return_value='test')
-CLIENT.explain.list_members = mock.Mock(return_value='test')
-CLIENT.explain.list_roles = mock.Mock(return_value='test')
+CLIENT.explain.stream_resources = mock.Mock(return_value=iter([
+    explain_pb2.ListResourcesReply(full_resource_names=['test'])]))
+CLIENT.explain.stream_members = mock.Mock(return_value=iter([
+    explain_pb2.ListGroupMembersReply(member_names=['test'])]))
+CLIENT.explain.stream_roles = mock.Mock(return_value=iter([
+    explain_pb2.ListRolesReply(role_names=['test'])]))
 CLIENT.explain.query_permissions_by_roles = mock.Mock(return_value='test')
 CLIENT.explain.get_iam_policy = mock.Mock(return_value='test')
 CLIENT.explain.check_iam_policy = mock.Mock(return_value='test')
@@ -203,21 +207,21 @@ class ImporterTest(ForsetiTestCase):
          {'endpoint': '192.168.0.1:80'}),
 
         ('explainer list_resources',
-         CLIENT.explain.list_resources,
+         CLIENT.explain.stream_resources,
          [''],
          {},
          '{}',
          {}),
 
         ('explainer list_members',
-         CLIENT.explain.list_members,
+         CLIENT.explain.stream_members,
          [''],
          {},
          '{}',
          {}),
 
         ('explainer list_roles',
-         CLIENT.explain.list_roles,
+         CLIENT.explain.stream_roles,
          [''],
          {},
          '{}',
@@ -430,6 +434,29 @@ class ImporterTest(ForsetiTestCase):
 
 
 class RunExplainerTest(ForsetiTestCase):
+    def test_list_roles_merges_pages(self):
+        ignored = mock.MagicMock()
+        mock_client = mock.MagicMock()
+        mock_client.explain.stream_roles.return_value = iter([
+            explain_pb2.ListRolesReply(role_names=['r1', 'r2']),
+            explain_pb2.ListRolesReply(role_names=['r3'])])
+        mock_config = mock.MagicMock()
+        mock_config.action = 'list_roles'
+        mock_output = mock.MagicMock()
+        cli.run_explainer(mock_client, mock_config, mock_output, ignored)
+        mock_output.write.assert_called_once_with(
+            explain_pb2.ListRolesReply(role_names=['r1', 'r2', 'r3']))
+
+    def test_list_roles_without_pages(self):
+        ignored = mock.MagicMock()
+        mock_client = mock.MagicMock()
+        mock_client.explain.stream_roles.return_value = iter([])
+        mock_config = mock.MagicMock()
+        mock_config.action = 'list_roles'
+        mock_output = mock.MagicMock()
+        cli.run_explainer(mock_client, mock_config, mock_output, ignored)
+        mock_output.write.assert_called_once_with(explain_pb2.ListRolesReply())
+
     def test_list_permissions_no_roles_and_no_role_prefixes(self):
         ignored = mock.MagicMock()
         mock_client = mock.MagicMock()
@@ -0,0 +1,156 @@
+# Copyright 2018 The Forseti Security Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the group in group denormalization of a model.
+
+Builds a synthetic tree of nested groups in a sqlite model, with a few
+extra memberships across branches, and reports the time of the SQL self
+join denormalization and of the in memory one, checking that both produce
+the same rows. Then reports the time of the in memory closure alone on a
+larger tree.
+
+From the top forseti-security dir, run:
+
+PYTHONPATH=. python tests/services/dao_benchmark.py
+"""
+import argparse
+import random
+import time
+
+from google.cloud.forseti.services.dao import group_closure
+from google.cloud.forseti.services.dao import session_creator
+
+
+def make_edges(group_count, fanout, cross_edges):
+    """Create the memberships of the nested groups.
+
+    Args:
+        group_count (int): Number of groups.
+        fanout (int): Number of child groups of each group in the tree.
+        cross_edges (int): Number of extra memberships across the tree.
+
+    Returns:
+        tuple: The group names and the set of (parent, member) name pairs.
+    """
+    names = ['group/g{}'.format(i) for i in xrange(group_count)]
+    edges = set()
+    for i in xrange(1, group_count):
+        edges.add((names[(i - 1) // fanout], names[i]))
+    rand = random.Random(0)
+    while len(edges) < group_count - 1 + cross_edges:
+        parent, member = sorted(rand.sample(xrange(group_count), 2))
+        edges.add((names[parent], names[member]))
+    return names, edges
+
+
+def populate(session, data_access, group_count, fanout, cross_edges):
+    """Create the nested groups.
+
+    Args:
+        session (object): Database session.
+        data_access (object): The model data access object.
+        group_count (int): Number of groups.
+        fanout (int): Number of child groups of each group in the tree.
+        cross_edges (int): Number of extra memberships across the tree.
+    """
+    names, edges = make_edges(group_count, fanout, cross_edges)
+    session.execute(
+        data_access.TBL_MEMBER.__table__.insert(),
+        [{'name': name, 'type': 'group', 'member_name': name.split('/')[1]}
+         for name in names])
+    session.execute(
+        data_access.TBL_MEMBERSHIP.insert(),
+        [{'group_name': parent, 'members_name': member}
+         for parent, member in edges])
+    session.commit()
+
+
+def denormed_rows(session, data_access):
+    """Read the denormalized group in group rows.
+
+    Args:
+        session (object): Database session.
+        data_access (object): The model data access object.
+
+    Returns:
+        set: The (parent, member) rows.
+    """
+    return set((row.parent, row.member) for row in
+               session.query(data_access.TBL_GROUP_IN_GROUP).all())
+
+
+def benchmark(group_count, fanout, cross_edges):
+    """Time both denormalizations of the same groups.
+
+    Args:
+        group_count (int): Number of groups.
+        fanout (int): Number of child groups of each group in the tree.
+        cross_edges (int): Number of extra memberships across the tree.
+    """
+    session_maker, data_access = session_creator('benchmark')
+    session = session_maker()
+    populate(session, data_access, group_count, fanout, cross_edges)
+
+    start = time.time()
+    iterations = data_access.denorm_group_in_group(session)
+    sql_time = time.time() - start
+    sql_rows = denormed_rows(session, data_access)
+    print('SQL:       {:.2f} s, {} iterations, {} rows'.format(
+        sql_time, iterations, len(sql_rows)))
+
+    start = time.time()
+    num_rows = data_access.denorm_group_in_group_in_memory(session)
+    memory_time = time.time() - start
+    memory_rows = denormed_rows(session, data_access)
+    print('In memory: {:.2f} s, {} rows'.format(memory_time, num_rows))
+
+    if sql_rows != memory_rows:
+        print('The denormalized rows differ.')
+
+
+def benchmark_closure(group_count, fanout, cross_edges):
+    """Time the in memory closure alone, without a database.
+
+    Args:
+        group_count (int): Number of groups.
+        fanout (int): Number of child groups of each group in the tree.
+        cross_edges (int): Number of extra memberships across the tree.
+    """
+    _, edges = make_edges(group_count, fanout, cross_edges)
+    start = time.time()
+    num_rows = sum(1 for _ in group_closure(edges))
+    print('Closure of {} groups: {:.2f} s, {} rows'.format(
+        group_count, time.time() - start, num_rows))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--groups', type=int, default=5000,
+                        help='Number of groups.')
+    parser.add_argument('--fanout', type=int, default=3,
+                        help='Number of child groups of each group.')
+    parser.add_argument('--cross_edges', type=int, default=500,
+                        help='Number of extra memberships across the tree.')
+    parser.add_argument('--closure_groups', type=int, default=100000,
+                        help='Number of groups of the closure only run, '
+                             '0 skips it.')
+    flags = parser.parse_args()
+    benchmark(flags.groups, flags.fanout, flags.cross_edges)
+    if flags.closure_groups:
+        benchmark_closure(flags.closure_groups, flags.fanout,
+                          flags.closure_groups // 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,10 @@ from tests.services import test_models
 from tests.services.model_tester import ModelCreator
 from tests.services.model_tester import ModelCreatorClient
 from google.cloud.forseti.common.util import logger
+from google.cloud.forseti.services.dao import create_engine
+from google.cloud.forseti.services.dao import define_model
+from google.cloud.forseti.services.dao import group_closure
+from google.cloud.forseti.services.dao import resource_intervals
 from google.cloud.forseti.services.dao import session_creator
 
 LOGGER = logger.get_logger(__name__)
@@ -453,6 +457,45 @@ class DaoTest(ForsetiTestCase):
         denormed_set,
         'Denormalized should be equivalent to transitive closure')
 
+  def test_denorm_group_in_group_in_memory(self):
+    """Test the in memory group_in_group denormalization."""
+    session_maker, data_access = session_creator('test')
+    session = session_maker()
+    client = ModelCreatorClient(session, data_access)
+    _ = ModelCreator(test_models.GROUP_IN_GROUP_TESTING_1, client)
+
+    data_access.denorm_group_in_group(session)
+    entries = session.query(data_access.TBL_GROUP_IN_GROUP).all()
+    expected = set([(i.parent, i.member) for i in entries])
+
+    num_rows = data_access.denorm_group_in_group_in_memory(session)
+    entries = session.query(data_access.TBL_GROUP_IN_GROUP).all()
+    denormed_set = set([(i.parent, i.member) for i in entries])
+    self.assertEqual(len(expected), num_rows)
+    self.assertEqual(
+        expected,
+        denormed_set,
+        'In memory denormalization should match the SQL denormalization')
+
+  def test_group_closure_with_cycles(self):
+    """Test the group closure of groups which are members of each other."""
+    edges = [
+        ('group/g1', 'group/g2'),
+        ('group/g2', 'group/g3'),
+        ('group/g3', 'group/g1'),
+        ('group/g3', 'group/g4'),
+        ('group/g5', 'group/g5'),
+    ]
+    cycle = ['group/g1', 'group/g2', 'group/g3']
+    expected = set([(parent, member)
+                    for parent in cycle
+                    for member in cycle + ['group/g4']])
+    expected.add(('group/g5', 'group/g5'))
+
+    closure = list(group_closure(edges))
+    self.assertEqual(len(expected), len(closure))
+    self.assertEqual(expected, set(closure))
+
   def test_query_access_by_permission(self):
     """Test query_access_by_permission."""
     session_maker, data_access = session_creator('test')
@@ -768,6 +811,14 @@ class DaoTest(ForsetiTestCase):
       else:
         self.assertFalse(f(session, frn, perm, member))
 
+    results = data_access.check_iam_policies(
+        session, [(frn, perm, member) for frn, perm, member, _ in checks])
+    self.assertEqual([expectation for _, _, _, expectation in checks],
+                     results)
+
+    self.assertRaises(Exception, data_access.check_iam_policies,
+                      session, [('r/res1', 'read', 'user/unknown')])
+
   def test_get_roles_by_permission_names(self):
     session_maker, data_access = session_creator('test')
     session = session_maker()
@@ -1014,6 +1065,73 @@ class DaoTest(ForsetiTestCase):
         set([u'r/res8']),
         'Expecting expansion of res8 to comprise only res8')
 
+  def test_expand_resources_not_numbered(self):
+    """Expand resources added after the tree was numbered."""
+    session_maker, data_access = session_creator('test')
+    session = session_maker()
+    client = ModelCreatorClient(session, data_access)
+    _ = ModelCreator(test_models.RESOURCE_EXPANSION_2, client)
+    self.assertTrue(data_access.resources_numbered(session))
+
+    data_access.add_resource_by_name(session, 'r/res9', 'r/res3', False)
+    self.assertFalse(data_access.resources_numbered(session))
+
+    expansion = data_access.expand_resources_by_type_names(
+        session, ['r/res3']).values()[0]
+    self.assertEqual(
+        set([u'res3', u'res4', u'res5', u'res9']),
+        set([r.name for r in expansion]))
+
+    self.assertEqual(9, data_access.number_resources(session))
+    self.assertTrue(data_access.resources_numbered(session))
+    expansion = data_access.expand_resources_by_type_names(
+        session, ['r/res3']).values()[0]
+    self.assertEqual(
+        set([u'res3', u'res4', u'res5', u'res9']),
+        set([r.name for r in expansion]))
+
+  def test_define_model_adds_interval_columns(self):
+    """Define a model whose resources table predates the intervals."""
+    engine = create_engine('sqlite:///:memory:')
+    engine.execute(
+        'CREATE TABLE test_resources ('
+        'full_name VARCHAR(2048) NOT NULL, '
+        'type_name VARCHAR(512) NOT NULL PRIMARY KEY, '
+        'parent_type_name VARCHAR(512) REFERENCES test_resources(type_name), '
+        'name VARCHAR(256) NOT NULL, type VARCHAR(128) NOT NULL, '
+        'policy_update_counter INTEGER, display_name VARCHAR(256), '
+        'email VARCHAR(256), data TEXT)')
+    engine.execute(
+        "INSERT INTO test_resources (full_name, type_name, name, type) "
+        "VALUES ('r/res1/', 'r/res1', 'res1', 'r')")
+
+    session_maker, data_access = define_model('test', engine, 'seed')
+    session = session_maker()
+    self.assertEqual(
+        ['r/res1'],
+        [r.type_name for r in session.query(data_access.TBL_RESOURCE)])
+    self.assertFalse(data_access.resources_numbered(session))
+
+    self.assertEqual(1, data_access.number_resources(session))
+    self.assertTrue(data_access.resources_numbered(session))
+
+  def test_resource_intervals(self):
+    """Test the pre-order intervals of a resource tree."""
+    parents = [
+        ('r/res1', None),
+        ('r/res2', 'r/res1'),
+        ('r/res3', 'r/res2'),
+        ('r/res4', 'r/res1'),
+        ('r/res5', None),
+    ]
+    self.assertEqual(
+        set([('r/res1', 0, 3),
+             ('r/res2', 1, 2),
+             ('r/res3', 2, 2),
+             ('r/res4', 3, 3),
+             ('r/res5', 4, 4)]),
+        set(resource_intervals(parents)))
+
 
 if __name__ == '__main__':
   unittest.main()
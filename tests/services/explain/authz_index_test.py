@@ -0,0 +1,130 @@
+# Copyright 2018 The Forseti Security Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests the compiled authorization index of the explain service."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+from sqlalchemy.orm.exc import NoResultFound
+
+from tests.services import test_models
+from tests.services.model_tester import ModelCreator
+from tests.services.model_tester import ModelCreatorClient
+from tests.unittest_utils import ForsetiTestCase
+from google.cloud.forseti.services.dao import session_creator
+from google.cloud.forseti.services.explain import authz_index
+from google.cloud.forseti.services.explain import explainer
+
+
+class AuthorizationIndexTest(ForsetiTestCase):
+    """Compare the index answers to the database answers."""
+
+    def setUp(self):
+        """Build the index of the explain test model."""
+        session_maker, self.data_access = session_creator('test')
+        self.session = session_maker()
+        client = ModelCreatorClient(self.session, self.data_access)
+        _ = ModelCreator(test_models.EXPLAIN_GRANTED_1, client)
+
+        self.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.tmp_dir, 'test.authz')
+        authz_index.build(self.session, self.data_access, path)
+        self.index = authz_index.AuthorizationIndex(path)
+
+    def tearDown(self):
+        """Remove the index."""
+        self.index.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_explainer_drops_removed_index(self):
+        """A cached index is served without a model lookup until removed."""
+        config = mock.MagicMock()
+        explainer_api = explainer.Explainer(config)
+        explainer_api.indexes['test'] = authz_index.AuthorizationIndex(
+            self.index.path)
+
+        self.assertIs(explainer_api.indexes['test'],
+                      explainer_api._get_index('test'))
+        self.assertFalse(config.model_manager.model.called)
+
+        os.unlink(self.index.path)
+        config.model_manager.model.side_effect = NoResultFound
+        self.assertIsNone(explainer_api._get_index('test'))
+        self.assertEqual({}, explainer_api.indexes)
+
+    def test_check_iam_policy(self):
+        """Test check_iam_policy matches the database."""
+        for resource in ['r/res1', 'r/res2', 'r/res3', 'r/res4']:
+            for permission in ['read', 'write', 'delete', 'unknown']:
+                for member in ['user/u1', 'user/u2', 'user/u3', 'user/u4',
+                               'group/g3']:
+                    self.assertEqual(
+                        self.data_access.check_iam_policy(
+                            self.session, resource, permission, member),
+                        self.index.check_iam_policy(
+                            resource, permission, member),
+                        (resource, permission, member))
+
+    def test_check_iam_policies(self):
+        """Test check_iam_policies matches check_iam_policy."""
+        checks = [(resource, permission, member)
+                  for member in ['user/u1', 'user/u3', 'user/u4', 'group/g3']
+                  for resource in ['r/res1', 'r/res2', 'r/res3', 'r/res4']
+                  for permission in ['read', 'write', 'delete', 'unknown']]
+        self.assertEqual(
+            [self.index.check_iam_policy(*check) for check in checks],
+            self.index.check_iam_policies(checks))
+        self.assertEqual(
+            self.data_access.check_iam_policies(self.session, checks),
+            self.index.check_iam_policies(checks))
+
+        with self.assertRaises(Exception):
+            self.index.check_iam_policies([('r/unknown', 'read', 'user/u1')])
+
+    def test_check_iam_policy_not_found(self):
+        """Test check_iam_policy raises for unknown members and resources."""
+        with self.assertRaises(Exception):
+            self.index.check_iam_policy('r/res1', 'read', 'user/unknown')
+        with self.assertRaises(Exception):
+            self.index.check_iam_policy('r/unknown', 'read', 'user/u1')
+
+    def test_explain_granted(self):
+        """Test explain_granted matches the database."""
+        expected = self.data_access.explain_granted(
+            self.session, 'user/u4', 'r/res4', None, 'write')
+        bindings, member_graph, resource_names = (
+            self.index.explain_granted('user/u4', 'r/res4', None, 'write'))
+        self.assertEqual(set(expected[0]), set(bindings))
+        self.assertEqual(dict(expected[1]), dict(member_graph))
+        self.assertEqual(expected[2], resource_names)
+
+        with self.assertRaises(Exception):
+            self.index.explain_granted('user/u2', 'r/res4', 'viewer', None)
+
+    def test_query_access_by_member(self):
+        """Test query_access_by_member matches the database."""
+        for permissions in [['read'], ['read', 'write'], []]:
+            expected = self.data_access.query_access_by_member(
+                self.session, 'user/u3', permissions)
+            self.assertEqual(
+                sorted(expected),
+                sorted(self.index.query_access_by_member('user/u3',
+                                                         permissions)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,6 +65,17 @@ EXPORT_ASSETS_ERROR = """
 """
 
 
+def _stream_file_from_gcs(file_path, *args, **kwargs):
+    """Fake stream_file_from_gcs, streams the matching test data file."""
+    if 'resource' in file_path:
+        dump_file = 'mock_cai_resources.dump'
+    elif 'iam_policy' in file_path:
+        dump_file = 'mock_cai_iam_policies.dump'
+    with open(os.path.join(TEST_RESOURCE_DIR_PATH, dump_file), 'r') as f:
+        for line in f:
+            yield line
+
+
 class InventoryCloudAssetTest(ForsetiTestCase):
     """Test CloudAsset data loader."""
 
@@ -83,16 +94,13 @@ class InventoryCloudAssetTest(ForsetiTestCase):
                                                  'gcs_path': 'gs://test-bucket'}
                                                )
 
-        # Ensure test data doesn't get deleted
-        self.mock_unlink = mock.patch.object(
-            os, 'unlink', autospec=True).start()
         self.mock_export_assets = mock.patch.object(
             cloudasset_api.CloudAssetClient,
             'export_assets',
             autospec=True).start()
-        self.mock_copy_file_from_gcs = mock.patch.object(
+        self.mock_stream_file_from_gcs = mock.patch.object(
             file_loader,
-            'copy_file_from_gcs',
+            'stream_file_from_gcs',
             autospec=True).start()
 
     def tearDown(self):
@@ -163,17 +171,7 @@ class InventoryCloudAssetTest(ForsetiTestCase):
         # Ignore call to export_assets for this test.
         self.mock_export_assets.return_value = {'done': True}
 
-        # Mock copy_file_from_gcs to return correct test data file
-        def _copy_file_from_gcs(file_path, *args, **kwargs):
-            """Fake copy_file_from_gcs."""
-            if 'resource' in file_path:
-                return os.path.join(TEST_RESOURCE_DIR_PATH,
-                                    'mock_cai_resources.dump')
-            elif 'iam_policy' in file_path:
-                return os.path.join(TEST_RESOURCE_DIR_PATH,
-                                    'mock_cai_iam_policies.dump')
-
-        self.mock_copy_file_from_gcs.side_effect = _copy_file_from_gcs
+        self.mock_stream_file_from_gcs.side_effect = _stream_file_from_gcs
 
         results = cloudasset.load_cloudasset_data(self.session,
                                                   self.inventory_config)
@@ -182,6 +180,17 @@ class InventoryCloudAssetTest(ForsetiTestCase):
         self.assertEqual(expected_results, results)
         self.validate_data_in_table()
 
+    def test_load_cloudasset_data_parse_processes(self):
+        """Validate CAI dumps parsed in worker processes are imported."""
+        self.mock_export_assets.return_value = {'done': True}
+        self.mock_stream_file_from_gcs.side_effect = _stream_file_from_gcs
+        self.inventory_config.cai_parse_processes = 2
+
+        results = cloudasset.load_cloudasset_data(self.session,
+                                                  self.inventory_config)
+        self.assertEqual(68, results)
+        self.validate_data_in_table()
+
     def test_load_cloudasset_data_cai_apierror(self):
         """Validate load_cloud_asset handles an API error from CAI."""
         response = httplib2.Response(
@@ -195,7 +204,7 @@ class InventoryCloudAssetTest(ForsetiTestCase):
         results = cloudasset.load_cloudasset_data(self.session,
                                                   self.inventory_config)
         self.assertIsNone(results)
-        self.assertFalse(self.mock_copy_file_from_gcs.called)
+        self.assertFalse(self.mock_stream_file_from_gcs.called)
         self.validate_no_data_in_table()
 
     def test_load_cloudasset_data_cai_timeout(self):
@@ -205,7 +214,7 @@ class InventoryCloudAssetTest(ForsetiTestCase):
         results = cloudasset.load_cloudasset_data(self.session,
                                                   self.inventory_config)
         self.assertIsNone(results)
-        self.assertFalse(self.mock_copy_file_from_gcs.called)
+        self.assertFalse(self.mock_stream_file_from_gcs.called)
         self.validate_no_data_in_table()
 
     def test_load_cloudasset_data_cai_error_response(self):
@@ -214,7 +223,7 @@ class InventoryCloudAssetTest(ForsetiTestCase):
         results = cloudasset.load_cloudasset_data(self.session,
                                                   self.inventory_config)
         self.assertIsNone(results)
-        self.assertFalse(self.mock_copy_file_from_gcs.called)
+        self.assertFalse(self.mock_stream_file_from_gcs.called)
         self.validate_no_data_in_table()
 
     def test_load_cloudasset_data_download_error(self):
@@ -226,7 +235,7 @@ class InventoryCloudAssetTest(ForsetiTestCase):
             {'status': '403', 'content-type': 'application/json'})
         content = PERMISSION_DENIED
         error_403 = errors.HttpError(response, content)
-        self.mock_copy_file_from_gcs.side_effect = error_403
+        self.mock_stream_file_from_gcs.side_effect = error_403
 
         results = cloudasset.load_cloudasset_data(self.session,
                                                   self.inventory_config)
@@ -0,0 +1,183 @@
+# Copyright 2018 The Forseti Security Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the parallel crawler against a fake high latency GCP API.
+
+Every call on the API client is delayed by a fixed latency to simulate the
+network round trip. The policy_fetch benchmark crawls the mock environment with
+and without concurrent per resource policy fetches. The threads benchmark
+crawls into a sqlite inventory storage and reports the crawl throughput for an
+increasing number of crawler threads.
+
+From the top forseti-security dir, run:
+
+PYTHONPATH=. python tests/services/inventory/crawler_benchmark.py
+PYTHONPATH=. python tests/services/inventory/crawler_benchmark.py threads
+"""
+import argparse
+import contextlib
+import os
+import time
+
+from tests.services.inventory import gcp_api_mocks
+from tests.services.util.db import create_test_engine_with_file
+from google.cloud.forseti.services import db
+from google.cloud.forseti.services.inventory.base import gcp
+from google.cloud.forseti.services.inventory.base import resources
+from google.cloud.forseti.services.inventory.base.progress import Progresser
+from google.cloud.forseti.services.inventory.base.storage import Memory as MemoryStorage
+from google.cloud.forseti.services.inventory import crawler
+from google.cloud.forseti.services.inventory import storage as inventory_storage
+
+
+class NullProgresser(Progresser):
+    """Progresser only counting the crawled resources."""
+
+    def __init__(self):
+        super(NullProgresser, self).__init__()
+        self.objects = 0
+
+    def on_new_object(self, resource):
+        self.objects += 1
+
+    def on_warning(self, warning):
+        pass
+
+    def on_error(self, error):
+        pass
+
+    def get_summary(self):
+        pass
+
+
+class LatencyApiClient(object):
+    """Wraps an API client and delays every call by a fixed latency."""
+
+    def __init__(self, client, latency):
+        self._client = client
+        self._latency = latency
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def _delayed(*args, **kwargs):
+            time.sleep(self._latency)
+            return attr(*args, **kwargs)
+        return _delayed
+
+
+@contextlib.contextmanager
+def sqlite_storage():
+    """Create an inventory storage in a temporary sqlite database.
+
+    Yields:
+        Storage: The opened inventory storage, to be committed by the caller.
+    """
+    engine, dbfile = create_test_engine_with_file()
+    try:
+        inventory_storage.initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+        with scoped_sessionmaker() as session:
+            with inventory_storage.Storage(session) as storage:
+                yield storage
+    finally:
+        os.unlink(dbfile)
+
+
+def crawl(storage, latency, threads, policy_fetch_threads):
+    """Crawl the mock environment and return the wall clock time.
+
+    Args:
+        storage (Storage): The storage to crawl into.
+        latency (float): Seconds added to every API call.
+        threads (int): Number of crawler threads.
+        policy_fetch_threads (int): Number of policy fetch threads.
+
+    Returns:
+        tuple: (wall clock seconds, resources crawled)
+    """
+    progresser = NullProgresser()
+    with gcp_api_mocks.mock_gcp():
+        client = LatencyApiClient(gcp.ApiClientImpl({}), latency)
+        root = resources.from_root_id(client, gcp_api_mocks.ORGANIZATION_ID)
+        config = crawler.ParallelCrawlerConfig(
+            storage, progresser, client, threads=threads,
+            policy_fetch_threads=policy_fetch_threads)
+        start = time.time()
+        crawler.ParallelCrawler(config).run(root)
+        storage.commit()
+        return time.time() - start, progresser.objects
+
+
+def benchmark_policy_fetch(flags):
+    """Compare serial and concurrent policy fetches.
+
+    Args:
+        flags (object): The parsed command line flags.
+    """
+    with MemoryStorage() as storage:
+        serial, count = crawl(storage, flags.latency, flags.threads, 0)
+    with MemoryStorage() as storage:
+        fanout, _ = crawl(storage, flags.latency, flags.threads,
+                          flags.policy_fetch_threads)
+    print('{} resources, {}s API latency, {} crawler threads'.format(
+        count, flags.latency, flags.threads))
+    print('serial policy fetches:     {:.2f}s'.format(serial))
+    print('concurrent policy fetches: {:.2f}s ({} threads)'.format(
+        fanout, flags.policy_fetch_threads))
+    print('speedup: {:.2f}x'.format(serial / fanout))
+
+
+def benchmark_threads(flags):
+    """Report the crawl throughput into sqlite against the thread count.
+
+    Args:
+        flags (object): The parsed command line flags.
+    """
+    print('{}s API latency, {} policy fetch threads'.format(
+        flags.latency, flags.policy_fetch_threads))
+    for threads in [int(t) for t in flags.thread_counts.split(',')]:
+        with sqlite_storage() as storage:
+            elapsed, count = crawl(storage, flags.latency, threads,
+                                   flags.policy_fetch_threads)
+        print('{:>3} threads: {} resources in {:.2f}s, {:.1f} '
+              'resources/s'.format(threads, count, elapsed, count / elapsed))
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('benchmark', nargs='?', default='policy_fetch',
+                        choices=['policy_fetch', 'threads'])
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Seconds of latency added to every API call.')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='Number of crawler threads.')
+    parser.add_argument('--thread_counts', default='1,2,4,8,16,32',
+                        help='Crawler thread counts for the threads '
+                             'benchmark.')
+    parser.add_argument('--policy_fetch_threads', type=int, default=16,
+                        help='Number of policy fetch threads.')
+    flags = parser.parse_args()
+
+    # All timings include the 2 second worker shutdown wait of the crawler.
+    if flags.benchmark == 'threads':
+        benchmark_threads(flags)
+    else:
+        benchmark_policy_fetch(flags)
+
+
+if __name__ == '__main__':
+    main()
@@ -250,6 +250,110 @@ class CrawlerTest(ForsetiTestCase):
 
         self.assertEqual(expected_counts, result_counts)
 
+    def test_crawling_with_policy_fetch_threads(self):
+        """Crawl with concurrent policy fetches, verify same results."""
+
+        config = InventoryConfig(
+            'projects/1041',
+            '',
+            {},
+            '',
+            {},
+            {'threads': 2, 'policy_fetch_threads': 4})
+
+        with MemoryStorage() as storage:
+            progresser = NullProgresser()
+            with gcp_api_mocks.mock_gcp():
+                run_crawler(storage,
+                            progresser,
+                            config,
+                            parallel=True)
+
+            self.assertEqual(0,
+                             progresser.errors,
+                             'No errors should have occurred')
+
+            result_counts = self._get_resource_counts_from_storage(storage)
+
+        expected_counts = {
+            'backendservice': {'resource': 1},
+            'compute_project': {'resource': 1},
+            'disk': {'resource': 3},
+            'firewall': {'resource': 3},
+            'forwardingrule': {'resource': 1},
+            'instance': {'resource': 3},
+            'instancegroup': {'resource': 2},
+            'instancegroupmanager': {'resource': 2},
+            'instancetemplate': {'resource': 2},
+            'kubernetes_cluster': {'resource': 1, 'service_config': 1},
+            'lien': {'resource': 1},
+            'network': {'resource': 1},
+            'project': {'billing_info': 1, 'enabled_apis': 1, 'iam_policy': 1,
+                        'resource': 1},
+            'serviceaccount': {'iam_policy': 1, 'resource': 1},
+            'serviceaccount_key': {'resource': 1},
+            'sink': {'resource': 2},
+            'snapshot': {'resource': 2},
+            'subnetwork': {'resource': 12},
+        }
+
+        self.assertEqual(expected_counts, result_counts)
+
+    def test_crawling_with_batched_policies(self):
+        """Crawl with per resource policies fetched in batch requests."""
+        result_counts = []
+        for crawler_configs in [{'threads': 2},
+                                {'threads': 2, 'policy_batch_size': 10}]:
+            config = InventoryConfig(
+                'projects/1041', '', {}, '', {}, crawler_configs)
+
+            with MemoryStorage() as storage:
+                progresser = NullProgresser()
+                with gcp_api_mocks.mock_gcp():
+                    run_crawler(storage,
+                                progresser,
+                                config,
+                                parallel=True)
+
+                self.assertEqual(0,
+                                 progresser.errors,
+                                 'No errors should have occurred')
+                result_counts.append(
+                    self._get_resource_counts_from_storage(storage))
+
+        self.assertEqual(result_counts[0], result_counts[1])
+
+    def test_crawling_skips_children_of_failed_writes(self):
+        """Resources whose write failed are reported and not descended."""
+
+        class FailingFolderStorage(MemoryStorage):
+            """Memory storage failing to write folders."""
+
+            def write(self, resource):
+                if resource.type() == 'folder':
+                    raise Exception('Failed to write folder')
+                super(FailingFolderStorage, self).write(resource)
+
+        config = InventoryConfig(
+            gcp_api_mocks.ORGANIZATION_ID,
+            '',
+            {},
+            '',
+            {})
+
+        with FailingFolderStorage() as storage:
+            progresser = NullProgresser()
+            with gcp_api_mocks.mock_gcp():
+                run_crawler(storage,
+                            progresser,
+                            config,
+                            parallel=True)
+
+            self.assertGreater(progresser.errors, 0)
+            for item in storage.mem.values():
+                self.assertNotEqual('folder', item.type())
+                self.assertNotEqual('folder', item.parent().type())
+
     def test_crawling_no_org_access(self):
         """Crawl with no access to organization, only child projects."""
 
@@ -333,26 +437,24 @@ class CloudAssetCrawlerTest(CrawlerTest):
                                                  'gcs_path': 'gs://test-bucket'}
                                                )
 
-        # Ensure test data doesn't get deleted
-        self.mock_unlink = mock.patch.object(
-            os, 'unlink', autospec=True).start()
-        self.mock_copy_file_from_gcs = mock.patch.object(
+        self.mock_stream_file_from_gcs = mock.patch.object(
             file_loader,
-            'copy_file_from_gcs',
+            'stream_file_from_gcs',
             autospec=True).start()
         self.maxDiff = None
 
-        # Mock copy_file_from_gcs to return correct test data file
-        def _copy_file_from_gcs(file_path, *args, **kwargs):
-            """Fake copy_file_from_gcs."""
+        # Mock stream_file_from_gcs to stream the correct test data file
+        def _stream_file_from_gcs(file_path, *args, **kwargs):
+            """Fake stream_file_from_gcs."""
             if 'resource' in file_path:
-                return os.path.join(TEST_RESOURCE_DIR_PATH,
-                                    'mock_cai_resources.dump')
+                dump_file = 'mock_cai_resources.dump'
             elif 'iam_policy' in file_path:
-                return os.path.join(TEST_RESOURCE_DIR_PATH,
-                                    'mock_cai_iam_policies.dump')
+                dump_file = 'mock_cai_iam_policies.dump'
+            with open(os.path.join(TEST_RESOURCE_DIR_PATH, dump_file)) as f:
+                for line in f:
+                    yield line
 
-        self.mock_copy_file_from_gcs.side_effect = _copy_file_from_gcs
+        self.mock_stream_file_from_gcs.side_effect = _stream_file_from_gcs
 
     def tearDown(self):
         """tearDown."""
@@ -418,5 +520,26 @@ class CloudAssetCrawlerTest(CrawlerTest):
 
         self.assertEqual(expected_counts, result_counts)
 
+    def test_cai_crawl_with_memory_index(self):
+        """Crawl with the CAI memory index, compare to database lookups."""
+        result_counts = []
+        for memory_index_mb in [0, 10]:
+            self.inventory_config.cai_memory_index_mb = memory_index_mb
+            with MemoryStorage(session=self.session) as storage:
+                progresser = NullProgresser()
+                with gcp_api_mocks.mock_gcp():
+                    run_crawler(storage,
+                                progresser,
+                                self.inventory_config,
+                                parallel=True)
+
+                self.assertEqual(0,
+                                 progresser.errors,
+                                 'No errors should have occurred')
+                result_counts.append(
+                    self._get_resource_counts_from_storage(storage))
+
+        self.assertEqual(result_counts[0], result_counts[1])
+
 if __name__ == '__main__':
     unittest.main()
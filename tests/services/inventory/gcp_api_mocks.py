@@ -140,12 +140,18 @@ def _mock_bigquery():
     def _mock_bq_get_dataset_access(projectid, datasetid):
         return results.BQ_GET_DATASET_ACCESS[projectid][datasetid]
 
+    def _mock_bq_get_dataset_accesses(projectid, datasetids, batch_size=None):
+        del batch_size
+        return {datasetid: results.BQ_GET_DATASET_ACCESS[projectid][datasetid]
+                for datasetid in datasetids}
+
     bq_patcher = mock.patch(
         MODULE_PATH + 'bigquery.BigQueryClient', spec=True)
     mock_bq = bq_patcher.start().return_value
     mock_bq.get_datasets_for_projectid.side_effect = (
         _mock_bq_get_datasets_for_projectid)
     mock_bq.get_dataset_access.side_effect = _mock_bq_get_dataset_access
+    mock_bq.get_dataset_accesses.side_effect = _mock_bq_get_dataset_accesses
 
     return bq_patcher
 
@@ -393,6 +399,11 @@ def _mock_gcs():
     def _mock_gcs_get_bucket_iam(bucketid):
         return results.GCS_GET_BUCKET_IAM[bucketid]
 
+    def _mock_gcs_get_bucket_iams(bucketids, batch_size=None):
+        del batch_size
+        return {bucketid: results.GCS_GET_BUCKET_IAM[bucketid]
+                for bucketid in bucketids}
+
     def _mock_gcs_get_object_iam(bucket_name, object_name):
         if (bucket_name in results.GCS_GET_OBJECT_IAM and
                 object_name in results.GCS_GET_OBJECT_IAM[bucket_name]):
@@ -405,6 +416,7 @@ def _mock_gcs():
     mock_gcs.get_buckets.side_effect = _mock_gcs_get_buckets
     mock_gcs.get_objects.side_effect = _mock_gcs_get_objects
     mock_gcs.get_bucket_iam_policy.side_effect = _mock_gcs_get_bucket_iam
+    mock_gcs.get_bucket_iam_policies.side_effect = _mock_gcs_get_bucket_iams
     mock_gcs.get_object_iam_policy.side_effect = _mock_gcs_get_object_iam
 
     return gcs_patcher
@@ -433,6 +445,11 @@ def _mock_iam():
     def _mock_iam_get_service_account_iam_policy(name):
         return results.IAM_GET_SERVICEACCOUNT_IAM_POLICY[name]
 
+    def _mock_iam_get_service_account_iam_policies(names, batch_size=None):
+        del batch_size
+        return {name: results.IAM_GET_SERVICEACCOUNT_IAM_POLICY[name]
+                for name in names}
+
     def _mock_iam_get_service_account_keys(name, key_type):
         del key_type
         if name in results.IAM_GET_SERVICEACCOUNT_KEYS:
@@ -448,6 +465,8 @@ def _mock_iam():
     mock_iam.get_curated_roles.side_effect = _mock_iam_get_curated_roles
     mock_iam.get_service_account_iam_policy.side_effect = (
         _mock_iam_get_service_account_iam_policy)
+    mock_iam.get_service_account_iam_policies.side_effect = (
+        _mock_iam_get_service_account_iam_policies)
     mock_iam.get_service_account_keys.side_effect = (
         _mock_iam_get_service_account_keys)
 
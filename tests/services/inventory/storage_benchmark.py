@@ -0,0 +1,110 @@
+# Copyright 2018 The Forseti Security Authors. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the inventory storage write cost as the inventory grows.
+
+Writes synthetic resources into a sqlite inventory and reports the average
+cost of Storage.write for each slice of resources. With the in memory
+resource id index the cost stays flat, with --db_lookup every write looks
+for duplicates in the database instead, as it did before the index.
+
+From the top forseti-security dir, run:
+
+PYTHONPATH=. python tests/services/inventory/storage_benchmark.py
+"""
+import argparse
+import os
+import time
+
+import mock
+
+from tests.services.util.db import create_test_engine_with_file
+from google.cloud.forseti.services import db
+from google.cloud.forseti.services.inventory.base.resources import Resource
+from google.cloud.forseti.services.inventory import storage as inventory_storage
+
+
+class FakeResource(Resource):
+    """Resource with a fixed type and key."""
+
+    def __init__(self, res_type, key, parent=None):
+        super(FakeResource, self).__init__({'name': key})
+        self._res_type = res_type
+        self._key = key
+        self._parent = parent
+
+    def type(self):
+        return self._res_type
+
+    def key(self):
+        return self._key
+
+    def parent(self):
+        return self._parent
+
+
+def benchmark(resource_count, slice_size, db_lookup):
+    """Write resources and print the average write cost per slice.
+
+    Args:
+        resource_count (int): Number of resources to write.
+        slice_size (int): Number of resources per reported slice.
+        db_lookup (bool): Look for duplicates in the database.
+    """
+    engine, dbfile = create_test_engine_with_file()
+    try:
+        inventory_storage.initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+        with scoped_sessionmaker() as session:
+            with inventory_storage.Storage(session) as storage:
+                if db_lookup:
+                    # Bypass the index, flush so the query sees every row.
+                    def _get_resource_id(resource):
+                        storage.buffer.flush()
+                        return storage._query_resource_id(resource)  # pylint: disable=protected-access
+                    mock.patch.object(storage, '_get_resource_id',
+                                      side_effect=_get_resource_id).start()
+
+                project = FakeResource('project', 'project-1')
+                storage.write(project)
+                start = time.time()
+                for i in xrange(1, resource_count + 1):
+                    storage.write(
+                        FakeResource('instance', 'instance-{}'.format(i),
+                                     project))
+                    if not i % slice_size:
+                        elapsed = time.time() - start
+                        print('{:>9} rows: {:.1f} us/write'.format(
+                            i, 1e6 * elapsed / slice_size))
+                        start = time.time()
+                storage.commit()
+                mock.patch.stopall()
+    finally:
+        os.unlink(dbfile)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resources', type=int, default=200000,
+                        help='Number of resources to write.')
+    parser.add_argument('--slice', type=int, default=20000,
+                        help='Number of resources per reported slice.')
+    parser.add_argument('--db_lookup', action='store_true',
+                        help='Look for duplicates in the database.')
+    flags = parser.parse_args()
+    benchmark(flags.resources, flags.slice, flags.db_lookup)
+
+
+if __name__ == '__main__':
+    main()
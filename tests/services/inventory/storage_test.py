@@ -18,6 +18,7 @@ from datetime import datetime
 import os
 from StringIO import StringIO
 import unittest
+import mock
 from sqlalchemy.orm import sessionmaker
 
 from tests.services.util.db import create_test_engine
@@ -27,9 +28,16 @@ from tests.unittest_utils import ForsetiTestCase
 from google.cloud.forseti.services import db
 from google.cloud.forseti.services.inventory.base.resources import Resource
 from google.cloud.forseti.services.inventory.storage import CaiDataAccess
+from google.cloud.forseti.services.inventory.storage import CaiMemoryIndex
 from google.cloud.forseti.services.inventory.storage import ContentTypes
+from google.cloud.forseti.services.inventory.storage import DataAccess
+from google.cloud.forseti.services.inventory.storage import IdBlockAllocator
 from google.cloud.forseti.services.inventory.storage import initialize
+from google.cloud.forseti.services.inventory.storage import Inventory
+from google.cloud.forseti.services.inventory.storage import InventoryData
+from google.cloud.forseti.services.inventory.storage import InventoryDataWriter
 from google.cloud.forseti.services.inventory.storage import InventoryIndex
+from google.cloud.forseti.services.inventory.storage import ResourceIdIndex
 from google.cloud.forseti.services.inventory.storage import Storage
 
 
@@ -162,6 +170,218 @@ class StorageTest(ForsetiTestCase):
                                  'Unexpected number of resources in inventory')
 
 
+    def test_duplicate_resource_updates_existing_row(self):
+        """Writing a resource twice keeps a single row per category."""
+        engine = create_test_engine()
+
+        initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+
+        res_org = ResourceMock('1', {'id': 'test'}, 'organization', 'resource')
+        res_proj = ResourceMock('2', {'id': 'test'}, 'project', 'resource',
+                                res_org)
+        res_proj_dup = ResourceMock('2', {'id': 'updated'}, 'project',
+                                    'resource', res_org)
+
+        with scoped_sessionmaker() as session:
+            with Storage(session) as storage:
+                for resource in [res_org, res_proj, res_proj_dup]:
+                    storage.write(resource)
+                storage.commit()
+
+                projects = self.reduced_inventory(storage, ['project'])
+                self.assertEqual(1, len(projects))
+                self.assertEqual({'id': 'updated'},
+                                 projects[0].get_resource_data())
+                self.assertEqual(res_proj.inventory_key(),
+                                 res_proj_dup.inventory_key())
+
+    def test_iter_all_yields_parents_first(self):
+        """All categories are yielded by id, each row after its parent."""
+        engine = create_test_engine()
+
+        initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+
+        res_org = ResourceMock('1', {'id': 'test'}, 'organization', 'resource')
+        res_proj = ResourceMock('2', {'id': 'test'}, 'project', 'resource',
+                                res_org)
+        res_proj.get_iam_policy = lambda client=None: {'bindings': []}
+        res_buc = ResourceMock('3', {'id': 'test'}, 'bucket', 'resource',
+                               res_proj)
+
+        with scoped_sessionmaker() as session:
+            with Storage(session) as storage:
+                for resource in [res_org, res_proj, res_buc]:
+                    storage.write(resource)
+                storage.commit()
+
+                rows = list(storage.iter_all())
+                self.assertEqual(
+                    ['resource', 'resource', 'iam_policy', 'resource'],
+                    [row.get_category() for row in rows])
+                self.assertEqual(sorted(row.id for row in rows),
+                                 [row.id for row in rows])
+                seen_ids = set()
+                for row in rows:
+                    if row.get_parent_id():
+                        self.assertIn(row.get_parent_id(), seen_ids)
+                    seen_ids.add(row.id)
+
+                self.assertEqual(
+                    ['project'],
+                    [row.get_resource_type()
+                     for row in storage.iter_all(['project'])
+                     if row.get_category() == 'resource'])
+
+    def test_incremental_references_unchanged_data(self):
+        """Unchanged data is referenced, changes are found and kept."""
+        engine = create_test_engine()
+
+        initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+
+        def write_inventory(session, project_data):
+            res_org = ResourceMock('1', {'id': 'org'}, 'organization',
+                                   'resource')
+            res_proj = ResourceMock('2', project_data, 'project', 'resource',
+                                    res_org)
+            with Storage(session, incremental=True) as storage:
+                for resource in [res_org, res_proj]:
+                    storage.write(resource)
+                storage.commit()
+                return storage.inventory_index.id
+
+        with scoped_sessionmaker() as session:
+            first_id = write_inventory(session, {'id': 'test'})
+            second_id = write_inventory(session, {'id': 'updated'})
+
+            with Storage(session, second_id, readonly=True) as storage:
+                rows = dict((row.resource_type, row) for row in storage.iter())
+                self.assertTrue(rows['organization'].data_ref_id)
+                self.assertIsNone(rows['project'].data_ref_id)
+                self.assertEqual({'id': 'org'},
+                                 rows['organization'].get_resource_data())
+
+                changed = list(storage.iter(changed_since=first_id))
+                self.assertEqual(['project'],
+                                 [row.resource_type for row in changed])
+
+            DataAccess.delete(session, first_id)
+
+            with Storage(session, second_id, readonly=True) as storage:
+                rows = dict((row.resource_type, row) for row in storage.iter())
+                self.assertIsNone(rows['organization'].data_ref_id)
+                self.assertEqual({'id': 'org'},
+                                 rows['organization'].get_resource_data())
+
+    def test_deduplicated_data(self):
+        """Identical data is stored once and removed with its last user."""
+        engine = create_test_engine()
+
+        initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+
+        def write_inventory(session):
+            res_org = ResourceMock('1', {'id': 'test'}, 'organization',
+                                   'resource')
+            res_proj = ResourceMock('2', {'id': 'test'}, 'project', 'resource',
+                                    res_org)
+            with Storage(session, deduplicate_data=True,
+                         data_compression='zlib') as storage:
+                for resource in [res_org, res_proj]:
+                    storage.write(resource)
+                storage.commit()
+                return storage.inventory_index.id
+
+        with scoped_sessionmaker() as session:
+            first_id = write_inventory(session)
+            second_id = write_inventory(session)
+            self.assertEqual(1, session.query(InventoryData).count())
+
+            DataAccess.delete(session, first_id)
+            with Storage(session, second_id, readonly=True) as storage:
+                rows = list(storage.iter())
+                self.assertEqual(2, len(rows))
+                for row in rows:
+                    self.assertIsNone(row.resource_data)
+                    self.assertEqual({'id': 'test'}, row.get_resource_data())
+
+            DataAccess.delete(session, second_id)
+            self.assertEqual(0, session.query(InventoryData).count())
+
+    def test_delete_only_checks_data_of_deleted_inventory(self):
+        """Deleting an inventory leaves the data it did not use alone."""
+        engine = create_test_engine()
+
+        initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+
+        with scoped_sessionmaker() as session:
+            session.add(InventoryData(data_hash='other', data='{}'))
+            res_org = ResourceMock('1', {'id': 'test'}, 'organization',
+                                   'resource')
+            with Storage(session, deduplicate_data=True) as storage:
+                storage.write(res_org)
+                storage.commit()
+                inventory_id = storage.inventory_index.id
+            self.assertEqual(2, session.query(InventoryData).count())
+
+            DataAccess.delete(session, inventory_id)
+            self.assertEqual(
+                ['other'],
+                [data_hash for data_hash, in
+                 session.query(InventoryData.data_hash)])
+
+    def test_data_held_elsewhere_is_deferred(self):
+        """Inventory queries do not load referenced or deduplicated data."""
+        statement = str(sessionmaker()().query(Inventory))
+        self.assertNotIn('data_row', statement)
+        self.assertNotIn('gcp_inventory_data', statement)
+
+    def test_data_writer_forgets_known_hashes(self):
+        """Data added again after the known hashes were reset is not
+        inserted twice."""
+        engine = create_test_engine()
+
+        initialize(engine)
+        scoped_sessionmaker = db.create_scoped_sessionmaker(engine)
+
+        with scoped_sessionmaker() as session:
+            writer = InventoryDataWriter(session, max_known_hashes=2)
+            for data_hash in ['h1', 'h2', 'h3', 'h1', 'h2', 'h4']:
+                writer.add_data(data_hash, '{"hash": "%s"}' % data_hash)
+            writer.flush()
+            self.assertEqual(
+                ['h1', 'h2', 'h3', 'h4'],
+                sorted(data_hash for data_hash, in
+                       session.query(InventoryData.data_hash)))
+
+
+class ResourceIdIndexTest(ForsetiTestCase):
+    """Test the compact resource id index."""
+
+    def test_add_and_lookup(self):
+        """Added keys are found after the index grows."""
+        index = ResourceIdIndex(capacity=4)
+        for i in range(100):
+            index.add('project', str(i), 1000 + i)
+
+        self.assertEqual(100, len(index))
+        for i in range(100):
+            self.assertIn(1000 + i, list(index.candidates('project', str(i))))
+        self.assertEqual([], list(index.candidates('project', '100')))
+
+    def test_hash_collisions_return_all_candidates(self):
+        """Keys sharing a hash are all returned for verification."""
+        index = ResourceIdIndex()
+        with mock.patch.object(ResourceIdIndex, '_hash', return_value=42):
+            index.add('project', 'a', 1)
+            index.add('bucket', 'b', 2)
+            self.assertEqual([1, 2],
+                             list(index.candidates('folder', 'c')))
+
+
 class InventoryIndexTest(ForsetiTestCase):
     """Test inventory storage."""
 
@@ -216,6 +436,44 @@ class InventoryIndexTest(ForsetiTestCase):
         self.assertEquals(expected, inv_summary)
 
 
+class IdBlockAllocatorTest(ForsetiTestCase):
+    """Test the client side id allocation."""
+
+    def setUp(self):
+        """Setup method."""
+        ForsetiTestCase.setUp(self)
+        self.engine, self.dbfile = create_test_engine_with_file()
+        _session_maker = sessionmaker()
+        self.session = _session_maker(bind=self.engine)
+        initialize(self.engine)
+
+    def tearDown(self):
+        """Tear down method."""
+        os.unlink(self.dbfile)
+        ForsetiTestCase.tearDown(self)
+
+    def test_allocators_share_sequence(self):
+        """Concurrent allocators never hand out the same id."""
+        allocator1 = IdBlockAllocator(self.session, Inventory.__table__,
+                                      block_size=3)
+        allocator2 = IdBlockAllocator(self.session, Inventory.__table__,
+                                      block_size=3)
+        ids = []
+        for _ in range(5):
+            ids.append(allocator1.next_id())
+            ids.append(allocator2.next_id())
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7, 8, 10, 11], sorted(ids))
+
+    def test_sequence_starts_after_existing_rows(self):
+        """The first allocated id follows the ids already in the table."""
+        self.session.add(Inventory(id=41, inventory_index_id=1))
+        self.session.commit()
+
+        allocator = IdBlockAllocator(self.session, Inventory.__table__)
+        self.assertEqual(42, allocator.next_id())
+        self.assertEqual(43, allocator.next_id())
+
+
 class CaiTemporaryStoreTest(ForsetiTestCase):
     """Test the CaiTemporaryStore table and DAO."""
 
@@ -307,6 +565,41 @@ class CaiTemporaryStoreTest(ForsetiTestCase):
         }
         self.assertDictEqual(expected_iam_policy, results)
 
+    def test_memory_index(self):
+        """Validate the memory index returns the same data as the table."""
+        self._add_resources()
+        self._add_iam_policies()
+        index = CaiMemoryIndex.load(self.session, 1024 * 1024)
+
+        self.assertEqual(len(CAI_RESOURCE_DATA.split('\n')) +
+                         len(CAI_IAM_POLICY_DATA.split('\n')), len(index))
+        lookups = [
+            (ContentTypes.resource, 'google.storage.Bucket',
+             '//cloudresourcemanager.googleapis.com/projects/44444'),
+            (ContentTypes.resource, 'google.cloud.resourcemanager.Folder',
+             '//cloudresourcemanager.googleapis.com/organizations/1234567890'),
+            (ContentTypes.resource, 'google.cloud.resourcemanager.Folder',
+             '//cloudresourcemanager.googleapis.com/folders/33333')]
+        for lookup in lookups:
+            self.assertEqual(
+                list(CaiDataAccess.iter_cai_assets(*lookup,
+                                                   session=self.session)),
+                list(index.iter_cai_assets(*lookup)))
+
+        fetch = (ContentTypes.iam_policy,
+                 'google.cloud.resourcemanager.Organization',
+                 '//cloudresourcemanager.googleapis.com/organizations/'
+                 '1234567890')
+        self.assertEqual(
+            CaiDataAccess.fetch_cai_asset(*fetch, session=self.session),
+            index.fetch_cai_asset(*fetch))
+        self.assertEqual({}, index.fetch_cai_asset(
+            ContentTypes.iam_policy, 'google.storage.Bucket', 'missing'))
+
+    def test_memory_index_over_cap(self):
+        """Validate the memory index is not loaded over the memory cap."""
+        self._add_resources()
+        self.assertIsNone(CaiMemoryIndex.load(self.session, 1024))
 
 
 CAI_RESOURCE_DATA = """{"name":"//cloudresourcemanager.googleapis.com/organizations/1234567890","asset_type":"google.cloud.resourcemanager.Organization","resource":{"version":"v1beta1","discovery_document_uri":"https://cloudresourcemanager.googleapis.com/$discovery/rest","discovery_name":"Organization","data":{"creationTime":"2016-09-02T18:55:58.783Z","displayName":"test.forseti","lastModifiedTime":"2017-02-14T05:43:45.012Z","lifecycleState":"ACTIVE","name":"organizations/1234567890","organizationId":"1234567890","owner":{"directoryCustomerId":"C00h00n00"}}}}
@@ -126,6 +126,147 @@ class ImporterTest(ForsetiTestCase):
              },
             model_description)
 
+    @mock.patch.object(importer, 'BULK_IMPORT_MIN_ROWS', 0)
+    @mock.patch.object(importer, 'BULK_INSERT_ROWS', 50)
+    def test_inventory_importer_bulk(self):
+        """Test the importer writing the model in bulk."""
+
+        db_connect = 'sqlite:///{}'.format(
+            get_db_file_copy('forseti-test.db'))
+
+        self.service_config = ServiceConfig(db_connect)
+
+        self.source = 'INVENTORY'
+        self.model_manager = self.service_config.model_manager
+        self.model_name = self.model_manager.create(name=self.source)
+
+        scoped_session, data_access = self.model_manager.get(self.model_name)
+
+        with scoped_session as session:
+            importer_cls = importer.by_source(self.source)
+            import_runner = importer_cls(
+                session,
+                session,
+                self.model_manager.model(self.model_name,
+                                         expunge=False,
+                                         session=session),
+                data_access,
+                self.service_config,
+                inventory_index_id=FAKE_DATETIME_TIMESTAMP)
+            import_runner.run()
+            self.assertIsInstance(import_runner.writer,
+                                  importer.BulkModelWriter)
+
+        expected_abc_user_accesses = [
+            ('roles/appengine.codeViewer', ['project/project3']),
+            ('roles/appengine.appViewer', ['project/project3'])
+        ]
+        abc_user_accesses = data_access.query_access_by_member(
+            session, 'user/abc_user@forseti.test', [])
+        self.assertEqual(expected_abc_user_accesses, abc_user_accesses)
+
+        model = self.model_manager.model(self.model_name)
+        self.assertIn(model.state,
+                      ['SUCCESS', 'PARTIAL_SUCCESS'],
+                      'Model state should be success or partial success: %s' %
+                      model.message)
+
+    @mock.patch.object(importer, 'PARALLEL_IMPORT_ROWS', 3)
+    def test_inventory_importer_parallel(self):
+        """Test the importer converting leaf resources in worker processes."""
+
+        db_connect = 'sqlite:///{}'.format(
+            get_db_file_copy('forseti-test.db'))
+
+        self.service_config = ServiceConfig(db_connect)
+
+        self.source = 'INVENTORY'
+        self.model_manager = self.service_config.model_manager
+        self.model_name = self.model_manager.create(name=self.source)
+
+        scoped_session, data_access = self.model_manager.get(self.model_name)
+
+        with scoped_session as session:
+            importer_cls = importer.by_source(self.source)
+            import_runner = importer_cls(
+                session,
+                session,
+                self.model_manager.model(self.model_name,
+                                         expunge=False,
+                                         session=session),
+                data_access,
+                self.service_config,
+                inventory_index_id=FAKE_DATETIME_TIMESTAMP,
+                import_processes=2)
+            import_runner.run()
+
+            instances = list(data_access.scanner_iter(session, 'instance'))
+            self.assertTrue(instances)
+            for instance in instances:
+                self.assertTrue(instance.full_name.endswith(
+                    '/{}/'.format(instance.type_name)))
+                self.assertEqual(instance.parent.type_name,
+                                 instance.parent_type_name)
+
+        model = self.model_manager.model(self.model_name)
+        self.assertIn(model.state,
+                      ['SUCCESS', 'PARTIAL_SUCCESS'],
+                      'Model state should be success or partial success: %s' %
+                      model.message)
+
+    def test_resource_cache(self):
+        """Test the resource cache rebuilds the full names of resources."""
+        cache = importer.ResourceCache()
+        cache.add(1, None, 'organization/1', 'organization/1/')
+        cache.add(2, 1, 'project/p1', 'organization/1/project/p1/')
+        cache.add(5, 2, 'cloudsqlinstance/p1:db',
+                  'organization/1/project/p1/cloudsqlinstance/db/')
+        cache.add(3, 2, 'disk/d1', 'organization/1/project/p1/disk/d1/')
+
+        self.assertEqual(4, len(cache))
+        self.assertIn(3, cache)
+        self.assertNotIn(4, cache)
+        parent, full_name = cache[3]
+        self.assertEqual('disk/d1', parent.type_name)
+        self.assertEqual('organization/1/project/p1/disk/d1/', full_name)
+        parent, full_name = cache[5]
+        self.assertEqual('cloudsqlinstance/p1:db', parent.type_name)
+        self.assertEqual('organization/1/project/p1/cloudsqlinstance/db/',
+                         full_name)
+        self.assertIsNone(cache.segments[1])
+        with self.assertRaises(KeyError):
+            _ = cache[4]
+        with self.assertRaises(Exception):
+            cache.add(2, 1, 'project/p1', 'organization/1/project/p1/')
+
+    def test_bindings_wait_for_their_role(self):
+        """Bindings of a role not imported yet are stored with the role."""
+        inventory_importer = InventoryImporter(
+            mock.Mock(), mock.Mock(), mock.Mock(), mock.Mock(), None, 1)
+        writer = mock.Mock()
+        writer.add_member.side_effect = lambda **columns: columns['name']
+        inventory_importer.writer = writer
+
+        inventory_importer._store_iam_policy(
+            'project/p1', [('roles/viewer', ('user:a@x.com',)),
+                           ('roles/missing', ('user:b@x.com',))])
+        self.assertFalse(writer.add_binding.called)
+
+        inventory_importer.role_cache['roles/viewer'] = 'roles/viewer'
+        inventory_importer._store_pending_bindings('roles/viewer')
+        writer.add_binding.assert_called_once_with(
+            resource_type_name='project/p1',
+            role_name='roles/viewer',
+            members=['user/a@x.com'])
+
+        # The member of the binding is reused by gsuite.
+        inventory_importer._add_gsuite_member('user/a@x.com')
+        self.assertEqual(1, writer.add_member.call_count)
+
+        inventory_importer._drop_pending_bindings()
+        inventory_importer.model.add_warning.assert_called_once_with(
+            'Role reference in iam policy not found: roles/missing')
+
     def test_model_action_wrapper_pre_and_post_action_called(self):
         session = mock.Mock()
         session.flush = mock.Mock()
@@ -19,6 +19,7 @@ from tests.unittest_utils import ForsetiTestCase
 from tests.services.util.db import create_test_engine_with_file
 from google.cloud.forseti.common.util.threadpool import ThreadPool
 from google.cloud.forseti.services.dao import ModelManager
+from google.cloud.forseti.services.explain import authz_index
 
 
 class ModelManagerTest(ForsetiTestCase):
@@ -63,6 +64,66 @@ class ModelManagerTest(ForsetiTestCase):
         self.assertEqual(0, len(self.model_manager.models()),
                          'Expecting no models to exist after deletion')
 
+    def test_model_cache(self):
+        """Known models are served from the cache until deleted."""
+        handle = self.model_manager.create(name='test_model')
+        self.model_manager.get(handle)
+        self.assertEqual({'models': 1, 'hits': 1, 'misses': 0},
+                         self.model_manager.cache_stats())
+
+        other_manager = ModelManager(self.engine)
+        other_manager.get(handle)
+        other_manager.get(handle)
+        self.assertEqual({'models': 1, 'hits': 1, 'misses': 1},
+                         other_manager.cache_stats())
+
+        self.model_manager.delete(handle)
+        self.assertEqual(0, self.model_manager.cache_stats()['models'])
+        with self.assertRaises(KeyError):
+            self.model_manager.get(handle)
+
+    def test_model_cache_stats_concurrent(self):
+        """Cache hits from concurrent threads are all counted."""
+        handle = self.model_manager.create(name='test_model')
+        num_threads = 4
+        thread_pool = ThreadPool(num_threads)
+
+        def test_func():
+            """Get the model repeatedly."""
+            for _ in range(500):
+                self.model_manager.get(handle)
+            return True
+        for _ in range(num_threads):
+            thread_pool.add_func(test_func)
+        thread_pool.join()
+
+        self.assertEqual({'models': 1, 'hits': 2000, 'misses': 0},
+                         self.model_manager.cache_stats())
+
+    def test_delete_removes_index(self):
+        """Deleting a model removes its authorization index file."""
+        handle = self.model_manager.create(name='test_model')
+        path = authz_index.index_path(handle)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as index_file:
+            index_file.write('index')
+
+        self.model_manager.delete(handle)
+        self.assertFalse(os.path.exists(path))
+
+    def test_warm_up(self):
+        """Only complete models are defined on warm up."""
+        handles = [self.model_manager.create(name=str(i)) for i in range(3)]
+        with self.model_manager.modelmaker() as session:
+            model = self.model_manager.model(handles[0], expunge=False,
+                                             session=session)
+            model.set_done()
+
+        other_manager = ModelManager(self.engine)
+        self.assertEqual(1, other_manager.warm_up())
+        self.assertEqual(set([handles[0]]), set(other_manager.sessionmakers))
+
     @unittest.skip("Concurrent access leads to memory corruption.")
     def test_concurrent_access(self):
         """Start with no models, create multiple, delete them again, concurrent.
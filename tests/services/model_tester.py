@@ -60,6 +60,7 @@ class ModelCreatorClient(object):
     def commit(self):
         self.session.commit()
         self.data_access.denorm_group_in_group(self.session)
+        self.data_access.number_resources(self.session)
         self.session.commit()
 
 